@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_asgi_application()
+
+# Sandbox-Zygote (forkserver ohne Django) schon beim Start hochfahren, nicht erst bei der ersten Ausführung
+from modules.util.security_exe import start_sandbox_zygote  # noqa: E402
+
+start_sandbox_zygote()
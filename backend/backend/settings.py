@@ -217,6 +217,103 @@ FRONTEND_URL = 'http://localhost:5173'
 # Passwort Reset/Aktivierungslink Timeout (in Sekunden)
 PASSWORD_RESET_TIMEOUT = 3600  # 1 Stunde
 
+# Sandbox-Worker-Pool für die Code-Ausführung (modules/util/sandbox_pool.py)
+SANDBOX_POOL = {
+    'size': None,  # None = Anzahl der CPU-Kerne
+    'max_jobs_per_worker': 100,  # Worker nach N Jobs recyceln
+    'max_rss_mb': 256,  # Worker recyceln, wenn der RSS diesen Wert überschreitet
+    # Worker aus einem schlanken Zygote-Prozess ohne Django forken (modules/util/sandbox_zygote.py).
+    # 'fork' forkt direkt aus dem Django-Prozess, 'spawn' startet jeweils einen neuen Interpreter
+    'start_method': 'forkserver',
+}
+
+# Cache für Ergebnisse identischer Einreichungen (modules/util/result_cache.py)
+EXECUTION_RESULT_CACHE = {
+    'max_entries': 2000,  # LRU-Verdrängung ab dieser Anzahl Einträge
+    'ttl': 3600,  # Gültigkeit in Sekunden (None = unbegrenzt)
+}
+
+# Registry der vorkompilierten Testdateien (modules/util/test_registry.py)
+TASK_TEST_REGISTRY = {
+    'refresh_interval': 2.0,  # Sekunden zwischen zwei Prüfungen auf geänderte Testdateien
+}
+
+# Standard-CPU-Zeitbudget in Sekunden pro Ausführung (pro Schwierigkeit bzw. Aufgabe über Task.cpu_time_limit überschreibbar)
+EXECUTION_CPU_LIMIT = 5
+
+# Standardlimits pro Schwierigkeit der Aufgabe ('Einfach', 'Mittel', 'Schwer'); fehlende Werte fallen auf die
+# globalen Limits zurück, einzelne Aufgaben können sie über ihre eigenen Felder (Task.time_limit, ...) überschreiben
+EXECUTION_DIFFICULTY_LIMITS = {
+    'Einfach': {'cpu_time': 1, 'wall_time': 3, 'memory_mb': 128, 'stdout_bytes': 16 * 1024},
+    'Mittel': {},
+    'Schwer': {'cpu_time': 10, 'wall_time': 20, 'memory_mb': 512},
+}
+
+# Speicherlimit in MB pro Ausführung (RLIMIT_AS, zusätzlich zum Adressraum des Sandbox-Workers)
+EXECUTION_MEMORY_LIMIT_MB = 256
+
+# Maximal behaltene Bytes der Ausgaben pro Ausführung, darüber hinaus wird mit Markierung gekürzt
+EXECUTION_OUTPUT_LIMITS = {
+    'stdout_bytes': 64 * 1024,
+    'stderr_bytes': 16 * 1024,
+}
+
+# Begrenzung gleichzeitiger Ausführungen pro Prozess (modules/util/admission.py)
+EXECUTION_ADMISSION = {
+    'slots': None,  # None = Anzahl der CPU-Kerne
+    'per_user': 2,  # Maximale laufende oder wartende Ausführungen pro Benutzer
+    'max_queue': None,  # Maximale Warteschlange (None = 4 * slots), danach 503
+    'queue_timeout': 5.0,  # Maximale Wartezeit in Sekunden auf einen freien Slot, danach 503
+    'retry_after': 2,  # Retry-After-Header in Sekunden bei Ablehnung
+}
+
+# Token für Prometheus-Scraper am Metrik-Endpunkt /api/modules/execute/metrics/ (Header X-Metrics-Token).
+# Ohne Token haben nur Staff-Benutzer Zugriff.
+EXECUTOR_METRICS_TOKEN = None
+
+# Protokoll der Einreichungen (modules/submissions.py), wird gebündelt im Hintergrund geschrieben
+SUBMISSION_LOG = {
+    'enabled': True,
+    'batch_size': 100,  # Maximale Einreichungen pro Schreibvorgang (bulk_create)
+    'flush_interval': 1.0,  # Maximale Verzögerung in Sekunden bis zum Schreiben
+    'max_queue': 10000,  # Darüber hinaus werden Einreichungen verworfen statt die Anfrage zu blockieren
+    'recent_failed_entries': 10000,  # Zuletzt fehlgeschlagene Tests pro Benutzer und Aufgabe im Speicher (failed_first)
+}
+
+# Aufteilung langsamer Testdateien auf mehrere Sandbox-Worker (modules/util/test_sharding.py)
+TEST_SHARDING = {
+    'enabled': True,
+    'max_shards': 4,  # Maximale Anzahl gleichzeitig belegter Worker pro Ausführung
+    'min_total_seconds': 0.5,  # Erst ab dieser gemessenen Gesamtlaufzeit der Tests aufteilen
+}
+
+# Asynchrone Ausführungs-Jobs unter /api/modules/execute/jobs/ (abgearbeitet von manage.py run_executors)
+EXECUTION_JOBS = {
+    'per_user': 5,  # Maximale eingereihte oder laufende Jobs pro Benutzer, darüber 429
+    'retry_after': 10,  # Retry-After-Header in Sekunden bei Ablehnung
+}
+
+# Profil-Modus der Ausführung (Anfragefeld "profile"), modules/util/sandbox_profiler.py
+EXECUTION_PROFILE = {
+    'enabled': True,
+    'top_n': 10,  # Anzahl gemeldeter Funktionen mit der meisten CPU-Zeit
+    'interval': 0.005,  # Abstand der Stichproben in Sekunden CPU-Zeit
+    'max_samples': 10000,  # Danach endet das Profiling
+    'budget_fraction': 0.5,  # Höchstens dieser Anteil des CPU-Budgets wird profiliert und zusätzlich gewährt
+}
+
+# Interaktive Sitzungen (REPL-Modus) unter /api/modules/execute/session/ (modules/util/sandbox_sessions.py).
+# Sitzungen liegen im Speicher des Web-Prozesses: nur mit einem Prozess oder Sticky Routing pro Benutzer
+# betreiben, sonst landen Folgezellen in einer neuen Sitzung. Die Limits gelten je Prozess.
+EXECUTION_SESSIONS = {
+    'enabled': True,
+    'max_sessions': 16,  # Maximale Anzahl gleichzeitiger Sitzungen (je ein Worker-Prozess)
+    'per_user': 1,  # Maximale Anzahl Sitzungen pro Benutzer
+    'max_cells': 200,  # Sitzung nach N Zellen beenden
+    'idle_ttl': 300,  # Sitzung nach N Sekunden ohne Zelle beenden
+    'max_rss_mb': 256,  # Sitzung beenden, wenn der Worker mehr Speicher (RSS) belegt
+}
+
 # Jazzmin Settings
 JAZZMIN_SETTINGS = {
     # Titel der Seite
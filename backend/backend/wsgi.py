@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# Sandbox-Zygote (forkserver ohne Django) schon beim Start hochfahren, nicht erst bei der ersten Ausführung
+from modules.util.security_exe import start_sandbox_zygote  # noqa: E402
+
+start_sandbox_zygote()
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class ModulesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'modules'
+
+    def ready(self):
+        from django.conf import settings
+        from .util.security_exe import configure_sandbox_pool
+        from .execution import test_registry
+
+        # Sandbox-Worker-Pool konfigurieren (Worker starten erst bei der ersten Ausführung)
+        configure_sandbox_pool(**getattr(settings, 'SANDBOX_POOL', {}))
+
+        # Testdateien einmalig vorkompilieren (Dateisystem, kein Datenbankzugriff)
+        test_registry.preload()
@@ -0,0 +1,510 @@
+"""
+Gemeinsame Ausführungslogik für Aufgaben-Code.
+
+Wird sowohl vom synchronen Execute-Endpunkt als auch von den asynchronen
+Ausführungs-Workern (manage.py run_executors) verwendet.
+"""
+import ast
+import os
+import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.utils import timezone
+from .models import Task, UserTaskProgress
+from .util.security_exe import SecurityExecutor, EXECUTOR_VERSION, create_session_manager, get_sandbox_pool
+from .util.result_cache import ExecutionResultCache
+from .util.test_registry import TaskTestRegistry
+from .util.executor_metrics import metrics, PhaseTimings
+from .util.admission import AdmissionController
+from .util.single_flight import SingleFlight
+from .util.required_names import find_missing_names
+from .util.resource_limits import cpu_limit_exceeded
+from .util.test_sharding import TestDurationStats, plan_shards, merge_shard_results
+from .submissions import record_submission, previous_failed_tests
+
+# Timeout in Sekunden für die Ausführung von Aufgaben-Code (Wall-Clock, nur Notbremse)
+EXECUTION_TIMEOUT = 10
+
+# Standard-CPU-Zeitbudget in Sekunden, falls weder die Aufgabe (Task.cpu_time_limit) noch ihre
+# Schwierigkeit (EXECUTION_DIFFICULTY_LIMITS) eines festlegt
+EXECUTION_CPU_LIMIT = getattr(settings, 'EXECUTION_CPU_LIMIT', 5)
+
+# Speicherlimit in MB pro Ausführung (zusätzlicher Adressraum des Sandbox-Workers)
+EXECUTION_MEMORY_LIMIT_MB = getattr(settings, 'EXECUTION_MEMORY_LIMIT_MB', 256)
+
+# Maximal behaltene Bytes von stdout/stderr pro Ausführung (der Rest wird mit Markierung verworfen)
+EXECUTION_OUTPUT_LIMITS = {
+    'stdout_bytes': 64 * 1024,
+    'stderr_bytes': 16 * 1024,
+    **getattr(settings, 'EXECUTION_OUTPUT_LIMITS', {}),
+}
+
+# Standardlimits pro Schwierigkeit (Task.difficulty), fehlende Werte fallen auf die globalen Limits zurück.
+# Schlüssel: 'cpu_time', 'wall_time' (Sekunden), 'memory_mb', 'stdout_bytes'
+EXECUTION_DIFFICULTY_LIMITS = getattr(settings, 'EXECUTION_DIFFICULTY_LIMITS', {
+    Task.Difficulty.EASY: {'cpu_time': 1, 'wall_time': 3, 'memory_mb': 128, 'stdout_bytes': 16 * 1024},
+    Task.Difficulty.MEDIUM: {},
+    Task.Difficulty.HARD: {'cpu_time': 10, 'wall_time': 20, 'memory_mb': 512},
+})
+
+# Prozessweiter Cache für Ergebnisse identischer Einreichungen
+result_cache = ExecutionResultCache(**getattr(settings, 'EXECUTION_RESULT_CACHE', {}))
+
+# Vorkompilierte Testdateien (wird in ModulesConfig.ready() vorgeladen)
+test_registry = TaskTestRegistry(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'task_tests'),
+    **getattr(settings, 'TASK_TEST_REGISTRY', {})
+)
+# Geänderte Testdateien machen die zugehörigen Cache-Einträge ungültig
+test_registry.add_change_listener(result_cache.discard_test_digest)
+
+# Begrenzung gleichzeitiger Ausführungen über die Endpunkte (global und pro Benutzer)
+admission = AdmissionController(**getattr(settings, 'EXECUTION_ADMISSION', {}))
+
+# Gleichzeitige identische Anfragen (Doppelklick, Retry) teilen sich eine Ausführung
+execution_flights = SingleFlight()
+
+# Aufteilung langsamer Testdateien auf mehrere Sandbox-Worker (Shards), balanciert nach den
+# gemessenen Laufzeiten der einzelnen Tests
+TEST_SHARDING = {
+    'enabled': True,
+    'max_shards': 4,
+    'min_total_seconds': 0.5,
+    **getattr(settings, 'TEST_SHARDING', {}),
+}
+test_durations = TestDurationStats()
+# Threads, die die weiteren Shards einer Ausführung an den Worker-Pool übergeben
+_shard_threads = ThreadPoolExecutor(thread_name_prefix='test-shard')
+
+# Profil-Modus: Laufzeit und Speicher pro Test sowie die Funktionen des Benutzercodes mit der
+# meisten CPU-Zeit (Stichproben). Profiliert wird höchstens budget_fraction des CPU-Budgets,
+# CPU- und Zeitlimit werden im Profil-Modus um diesen Anteil erhöht
+EXECUTION_PROFILE = {
+    'enabled': True,
+    'top_n': 10,
+    'interval': 0.005,
+    'max_samples': 10000,
+    'budget_fraction': 0.5,
+    **getattr(settings, 'EXECUTION_PROFILE', {}),
+}
+
+# Asynchrone Ausführungs-Jobs (/api/modules/execute/jobs/): maximal per_user eingereihte oder
+# laufende Jobs pro Benutzer, darüber wird mit 429 und Retry-After abgelehnt
+EXECUTION_JOBS = {
+    'per_user': 5,
+    'retry_after': 10,
+    **getattr(settings, 'EXECUTION_JOBS', {}),
+}
+
+# Interaktive Sitzungen (REPL-Modus): ein warmer Sandbox-Worker pro Benutzer und Aufgabe,
+# der nur die jeweils neue Zelle ausführt. Der Sitzungs-Manager existiert pro Web-Prozess:
+# bei mehreren Prozessen nur mit Sticky Routing nutzbar (siehe ExecutePythonSessionView)
+EXECUTION_SESSIONS = {
+    'enabled': True,
+    'max_sessions': 16,
+    'per_user': 1,
+    'max_cells': 200,
+    'idle_ttl': 300,
+    'max_rss_mb': 256,
+    **getattr(settings, 'EXECUTION_SESSIONS', {}),
+}
+sessions = create_session_manager(**{
+    option: value for option, value in EXECUTION_SESSIONS.items() if option != 'enabled'
+})
+
+
+def resolve_test_file_path(task):
+    """
+    Ermittelt den absoluten Pfad zur Testdatei einer Aufgabe.
+
+    Raises:
+        FileNotFoundError: Wenn die Testdatei an keinem der abgeleiteten Pfade existiert
+    """
+    # Simplified path construction - adjust if your structure differs
+    base_path = os.path.join(settings.BASE_DIR, 'modules')
+    test_file_full_path = os.path.abspath(os.path.join(base_path, task.test_file_path))
+
+    if not os.path.isfile(test_file_full_path):
+        # Try relative to the models.py file's directory structure as fallback
+        models_dir = os.path.dirname(Task._meta.app_config.path) # Get 'modules' app path
+        test_file_full_path = os.path.abspath(os.path.join(models_dir, task.test_file_path))
+        if not os.path.isfile(test_file_full_path):
+            raise FileNotFoundError(f"Test file not found at derived paths for: {task.test_file_path}")
+
+    return test_file_full_path
+
+
+def get_task_test_entry(task):
+    """
+    Liefert die vorkompilierte Testdatei einer Aufgabe aus der Registry.
+    Der Pfad wird nur beim ersten Zugriff (oder nach Änderung von test_file_path) aufgelöst.
+
+    Raises:
+        FileNotFoundError: Wenn die Testdatei nicht existiert
+    """
+    return test_registry.get_for_task(
+        task.id, task.test_file_path, lambda: resolve_test_file_path(task)
+    )
+
+
+def mark_task_completed(user, task):
+    """Markiert eine Aufgabe für den Benutzer als erledigt."""
+    progress, created = UserTaskProgress.objects.update_or_create(
+        user=user,
+        task=task,
+        defaults={
+            'completed': True,
+            'completed_at': timezone.now()
+        }
+    )
+    if created:
+        print(f"[Progress Tracker] Marked Task {task.id} as completed for User {user.id}.")
+    else:
+        print(f"[Progress Tracker] Updated Task {task.id} status to completed for User {user.id}.")
+
+
+def get_execution_limits(task):
+    """
+    Liefert die Ausführungslimits einer Aufgabe. Je Limit gilt das Feld der Aufgabe, sonst der
+    Standard für ihre Schwierigkeit (EXECUTION_DIFFICULTY_LIMITS), sonst der globale Wert.
+
+    Returns:
+        dict: 'cpu_time' und 'wall_time' in Sekunden, 'memory_mb', 'stdout_bytes' und 'stderr_bytes'
+    """
+    defaults = EXECUTION_DIFFICULTY_LIMITS.get(task.difficulty, {})
+    cpu_time = task.cpu_time_limit or defaults.get('cpu_time') or EXECUTION_CPU_LIMIT
+    wall_time = task.time_limit or defaults.get('wall_time') or max(EXECUTION_TIMEOUT, cpu_time * 2)
+    return {
+        'cpu_time': cpu_time,
+        # Die Wall-Clock-Zeit ist nur Notbremse: sie greift erst deutlich nach dem CPU-Budget, damit
+        # gute Lösungen auf einem ausgelasteten Host nicht fälschlich abbrechen
+        'wall_time': max(wall_time, cpu_time * 1.5),
+        'memory_mb': task.memory_limit_mb or defaults.get('memory_mb') or EXECUTION_MEMORY_LIMIT_MB,
+        'stdout_bytes': task.output_limit_bytes or defaults.get('stdout_bytes') or EXECUTION_OUTPUT_LIMITS['stdout_bytes'],
+        'stderr_bytes': EXECUTION_OUTPUT_LIMITS['stderr_bytes'],
+    }
+
+
+def get_cpu_limit(task):
+    """Liefert das CPU-Zeitbudget einer Aufgabe in Sekunden."""
+    return get_execution_limits(task)['cpu_time']
+
+
+def _create_executor(task, test_entry, test_options=None):
+    """SecurityExecutor mit den Limits der Aufgabe (siehe get_execution_limits)."""
+    limits = get_execution_limits(task)
+    return SecurityExecutor(
+        timeout=limits['wall_time'],
+        cpu_limit=limits['cpu_time'],
+        memory_limit_mb=limits['memory_mb'],
+        max_stdout_bytes=limits['stdout_bytes'],
+        max_stderr_bytes=limits['stderr_bytes'],
+        # Dateiaufgaben arbeiten auf einem Dateisystem im Speicher statt auf der Festplatte
+        virtual_fs=test_entry.uses_files,
+        test_options=test_options,
+    )
+
+
+def _replay_events(execution_result, on_event):
+    """Erzeugt die Streaming-Ereignisse eines (gecachten) Ergebnisses nachträglich."""
+    if execution_result["stdout"]:
+        on_event({'type': 'stdout', 'data': execution_result["stdout"]})
+    test_results = execution_result.get("test_results") or {}
+    for test in test_results.get("tests", []):
+        on_event({'type': 'test', **test})
+
+
+def _missing_names_response(missing_names):
+    """Antwort, wenn der Code von den Tests benötigte Definitionen nicht enthält."""
+    message = "Folgende Definitionen fehlen in deinem Code (die Tests benötigen sie): " + ", ".join(missing_names)
+    return {
+        'error': message,
+        'stdout': '',
+        'stderr': message,
+        'test_results': None,
+        'execution_error': None,
+        'missing_names': missing_names,
+        'usage': None,
+    }
+
+
+def resolve_test_options(user, task, failfast=False, test_names=None, failed_first=False, profile=False):
+    """
+    Baut die Optionen für die Testausführung (siehe SecurityExecutor).
+
+    Args:
+        failfast (bool): Nach dem ersten fehlgeschlagenen Test abbrechen
+        test_names (list): Optional nur diese Tests ausführen ("Klasse.methode" oder "methode")
+        failed_first (bool): Die bei der letzten Einreichung fehlgeschlagenen Tests zuerst ausführen
+        profile (bool): Profil-Modus (siehe EXECUTION_PROFILE)
+
+    Returns:
+        dict: Nur die gesetzten Optionen (leer = alle Tests in der Reihenfolge der Testdatei)
+    """
+    test_options = {}
+    if failfast:
+        test_options['failfast'] = True
+    if test_names:
+        test_options['test_names'] = sorted(set(test_names))
+    if failed_first:
+        failed_tests = previous_failed_tests(user, task)
+        if failed_tests:
+            test_options['failed_first'] = failed_tests
+    if profile and EXECUTION_PROFILE['enabled']:
+        test_options['profile'] = {
+            option: value for option, value in EXECUTION_PROFILE.items() if option != 'enabled'
+        }
+    return test_options
+
+
+def _plan_test_shards(test_entry, test_options, on_event):
+    """
+    Teilt die Tests einer Aufgabe auf, wenn sie nach den bisherigen Messungen lange laufen.
+    Nicht beim Streaming (die Ausgaben des Benutzercodes kämen mehrfach), nicht bei einer
+    expliziten Testauswahl und nicht im Profil-Modus (ein Profil über alle Tests).
+
+    Jeder weitere Shard belegt einen zusätzlichen Admission-Slot, damit eine Ausführung nicht mehr
+    Sandbox-Worker bekommt, als die Admission-Kontrolle zulässt. Sind keine Slots frei, wird mit
+    weniger Shards oder seriell ausgeführt.
+
+    Returns:
+        tuple: (shards, durations, extra_slots) - shards ist None, wenn seriell ausgeführt wird;
+            extra_slots muss nach der Ausführung mit admission.release_slots freigegeben werden
+    """
+    if (not TEST_SHARDING['enabled'] or on_event is not None or test_options.get('test_names')
+            or test_options.get('profile')):
+        return None, None, 0
+    durations = test_durations.durations(test_entry.digest)
+    if not durations:
+        return None, None, 0
+    # Mehr Shards als Worker im Pool würden nur nacheinander laufen
+    max_shards = min(TEST_SHARDING['max_shards'], get_sandbox_pool().size)
+    shards = plan_shards(durations, max_shards, TEST_SHARDING['min_total_seconds'])
+    if not shards:
+        return None, None, 0
+    extra_slots = admission.try_acquire_slots(len(shards) - 1)
+    if extra_slots < len(shards) - 1:
+        shards = plan_shards(durations, extra_slots + 1, TEST_SHARDING['min_total_seconds']) if extra_slots else None
+        unused = extra_slots - (len(shards) - 1 if shards else 0)
+        admission.release_slots(unused)
+        extra_slots -= unused
+        if not shards:
+            return None, None, 0
+    return shards, durations, extra_slots
+
+
+def _execute_sharded(task, code, test_entry, tree, test_options, shards, test_order, timings):
+    """
+    Führt die Shards gleichzeitig in eigenen Sandbox-Workern aus (Benutzercode jeweils mit
+    einer Teilmenge der Tests) und führt die Ergebnisse zusammen.
+
+    Das CPU-Budget der Aufgabe wird gleichmäßig auf die Shards verteilt, damit eine Einreichung
+    insgesamt nicht mehr CPU-Zeit bekommt als seriell. Reicht der Anteil eines Shards nicht (die
+    gemessenen Laufzeiten sind nur Schätzungen), wird einmal seriell mit dem vollen Budget wiederholt.
+    """
+    def run_shard(names, shard_timings):
+        executor = _create_executor(task, test_entry, {**test_options, 'test_names': names})
+        if executor.cpu_limit:
+            executor.cpu_limit = executor.cpu_limit / len(shards)
+        # compile_restricted_exec verändert den AST - jeder Shard braucht seine eigene Kopie
+        shard_tree = copy.deepcopy(tree) if tree is not None else None
+        return executor.execute_secure(code, test_entry=test_entry, tree=shard_tree, timings=shard_timings)
+
+    # Der erste Shard läuft im aufrufenden Thread und liefert die Phasen-Zeiten der Anfrage
+    futures = [_shard_threads.submit(run_shard, names, PhaseTimings()) for names in shards[1:]]
+    results = [run_shard(shards[0], timings)] + [future.result() for future in futures]
+    metrics.increment('sharded_executions')
+    if any(cpu_limit_exceeded(result['usage']) for result in results if result.get('usage')):
+        metrics.increment('shard_serial_retries')
+        return _create_executor(task, test_entry, test_options).execute_secure(
+            code, test_entry=test_entry, tree=tree, timings=timings
+        )
+    merged = merge_shard_results(results, test_order)
+    if merged.get('usage') and merged['usage'].get('cpu_limit'):
+        # Summierte CPU-Zeit aller Shards gegenüber dem Budget der Aufgabe
+        merged['usage']['cpu_limit'] = get_execution_limits(task)['cpu_time']
+    return merged
+
+
+def execute_task_code(user, task, code, test_entry, on_event=None, timings=None, test_options=None):
+    """
+    Führt den Code eines Benutzers gegen die Tests einer Aufgabe aus,
+    aktualisiert bei Erfolg den Aufgabenfortschritt und protokolliert die Einreichung.
+
+    Args:
+        user (User): Der ausführende Benutzer
+        task (Task): Die Aufgabe
+        code (str): Der Code des Benutzers
+        test_entry (TestFileEntry): Vorkompilierte Testdatei (siehe get_task_test_entry)
+        on_event (callable): Optionaler Empfänger für Zwischenereignisse (Ausgaben und einzelne
+            Testergebnisse), z.B. für den Streaming-Endpunkt
+        timings (PhaseTimings): Optional, erfasst die Dauer der Ausführungsphasen (z.B. für den
+            Server-Timing-Header). Die Phasen landen in jedem Fall in den prozessweiten Metriken.
+        test_options (dict): Optional failfast, Testauswahl oder Reihenfolge (siehe resolve_test_options).
+            Teilläufe markieren die Aufgabe nicht als erledigt.
+
+    Returns:
+        dict: Antwortdaten (stdout, stderr, test_results, ...) wie vom Execute-Endpunkt geliefert
+    """
+    timings = timings or PhaseTimings()
+    response_data = _run_task_code(user, task, code, test_entry, on_event, timings, test_options or {})
+    # Wird gebündelt im Hintergrund geschrieben, die Antwort wartet nicht darauf
+    record_submission(user, task, code, response_data, timings)
+    return response_data
+
+
+def _run_task_code(user, task, code, test_entry, on_event, timings, test_options):
+    # Der Code wird nur einmal geparst: der AST dient als Cache-Schlüssel und wird
+    # anschließend direkt geprüft und restricted kompiliert
+    try:
+        with timings.phase('parse'):
+            tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        tree = None  # Der Executor liefert die passende Fehlermeldung
+
+    # Fehlen Funktionen oder Klassen, die die Tests nachschlagen, ist kein Sandbox-Lauf nötig
+    if tree is not None and test_entry.required_names:
+        with timings.phase('required_names_check'):
+            missing_names = find_missing_names(tree, test_entry.required_names)
+        if missing_names:
+            metrics.increment('missing_names_rejections')
+            return _missing_names_response(missing_names)
+
+    limits = get_execution_limits(task)
+
+    # Identischer Code (bis auf Formatierung) gegen dieselbe Testdatei: kein Sandbox-Lauf nötig.
+    # Die Limits und die Testoptionen sind Teil des Schlüssels, da sie das Ergebnis bestimmen
+    with timings.phase('cache_lookup'):
+        cache_version = f"{EXECUTOR_VERSION}:{json.dumps([limits, test_options], sort_keys=True)}"
+        # Profile hängen von der Auslastung ab und werden nicht zwischengespeichert
+        cacheable = tree is not None and not test_options.get('profile')
+        cache_key = result_cache.make_key(tree, test_entry.digest, cache_version) if cacheable else None
+        execution_result = result_cache.get(cache_key) if cache_key else None
+    cached = execution_result is not None
+    metrics.increment('cache_hits' if cached else 'cache_misses')
+
+    try:
+        if cached and on_event is not None:
+            _replay_events(execution_result, on_event)
+        elif not cached:
+            streamed_output = []
+            forward_event = None
+            if on_event is not None:
+                # Gestreamte Ausgaben mitschreiben, damit das Endergebnis (und der Cache) vollständig bleibt
+                def forward_event(event):
+                    if event['type'] == 'stdout':
+                        streamed_output.append(event['data'])
+                    on_event(event)
+
+            shards, durations, extra_slots = _plan_test_shards(test_entry, test_options, on_event)
+            if shards:
+                try:
+                    execution_result = _execute_sharded(
+                        task, code, test_entry, tree, test_options, shards, list(durations), timings
+                    )
+                finally:
+                    admission.release_slots(extra_slots)
+            else:
+                security_executor = _create_executor(task, test_entry, test_options)
+                # Benutzercode und Tests der Aufgabe laufen gemeinsam in der Sandbox,
+                # zurück kommt nur eine kompakte, serialisierbare Testzusammenfassung
+                execution_result = security_executor.execute_secure(
+                    code, test_entry=test_entry, tree=tree, on_event=forward_event, timings=timings
+                )
+            # Laufzeiten der einzelnen Tests für die Aufteilung späterer Ausführungen
+            test_durations.record(test_entry.digest, execution_result.get("test_results"))
+            if streamed_output:
+                execution_result["stdout"] = "".join(streamed_output) + execution_result["stdout"]
+            # Nur vollständige Läufe cachen - Timeouts oder ausgelastete Worker sind nicht reproduzierbar
+            if cache_key and execution_result["success"]:
+                result_cache.set(cache_key, execution_result)
+    except Exception as e:
+        # Allgemeiner Fehler - wird nur in stderr angezeigt, keine Duplizierung
+        return {
+            'stdout': '',
+            'stderr': f"Fehler bei der Code-Ausführung: {e}",
+            'execution_error': None,  # Kein execution_error, um Duplikate zu vermeiden
+            'test_results': None,
+        }
+
+    if not execution_result["success"]:
+        # Keine doppelte Fehlermeldung - error und stderr werden zusammengefasst
+        return {
+            'error': execution_result["error"],
+            'stdout': execution_result["stdout"],
+            'stderr': execution_result["stderr"],
+            'test_results': None,
+            'execution_error': None,  # Kein execution_error, um Duplikate zu vermeiden
+            'usage': execution_result.get("usage"),
+        }
+
+    test_results = execution_result["test_results"]
+    profile = test_results.pop("profile", None) if test_results else None
+
+    # Task als erledigt markieren bei Erfolg (auch bei Cache-Treffern), nicht aber nach Teilläufen
+    if test_results and test_results["success"] and not test_results.get("partial"):
+        with timings.phase('progress_db_write'):
+            mark_task_completed(user, task)
+
+    # Zeige die Benutzerausgabe immer an, wenn vorhanden
+    return {
+        'stdout': execution_result["stdout"] if execution_result["stdout"].strip() else "",
+        'stderr': execution_result["stderr"],  # Enthält alle Fehlermeldungen
+        'execution_error': None,  # Kein execution_error, um Duplikate zu vermeiden
+        'test_results': test_results,
+        'usage': execution_result.get("usage"),
+        'cached': cached,
+        # Nur im Profil-Modus: Funktionen mit der meisten CPU-Zeit und Speicher-Spitze
+        'profile': profile,
+    }
+
+
+def execute_session_cell(user, task, code, test_entry, timings=None):
+    """
+    Führt eine Zelle in der interaktiven Sitzung des Benutzers zur Aufgabe aus (REPL-Modus).
+    Die Sitzung wird bei Bedarf angelegt; Variablen, Funktionen und Importe vorheriger Zellen
+    bleiben erhalten. Es laufen keine Tests, und die Zelle wird nicht als Einreichung protokolliert.
+    Sitzungen gibt es nur im aktuellen Prozess; Folgezellen müssen denselben Prozess erreichen.
+
+    Args:
+        user (User): Der ausführende Benutzer
+        task (Task): Die Aufgabe (bestimmt Limits und Dateisystem-Modus der Sitzung)
+        code (str): Der Code der Zelle
+        test_entry (TestFileEntry): Vorkompilierte Testdatei der Aufgabe (siehe get_task_test_entry)
+        timings (PhaseTimings): Optional, erfasst die Dauer der Ausführungsphasen
+
+    Returns:
+        dict: Antwortdaten (stdout, stderr, error, variables, usage, session)
+
+    Raises:
+        SessionLimitReached: Wenn keine neue Sitzung angelegt werden kann
+    """
+    timings = timings or PhaseTimings()
+    try:
+        with timings.phase('parse'):
+            tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        tree = None  # Der Executor liefert die passende Fehlermeldung
+
+    execution_result = _create_executor(task, test_entry).execute_in_session(
+        sessions, (user.pk, task.pk), code, tree, timings=timings
+    )
+    return {
+        'error': execution_result["error"],
+        'stdout': execution_result["stdout"],
+        'stderr': execution_result["stderr"],
+        'variables': execution_result["variables"],
+        'usage': execution_result.get("usage"),
+        'session': execution_result["session"],
+    }
+
+
+def close_session(user, task_id):
+    """
+    Beendet die interaktive Sitzung des Benutzers zu einer Aufgabe (Zustand zurücksetzen).
+
+    Returns:
+        bool: False, wenn es keine Sitzung gab
+    """
+    return sessions.close((user.pk, task_id))
@@ -0,0 +1,323 @@
+import os
+import ast
+import json
+import math
+import time
+import resource
+import platform
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from ...models import Module, Task
+from ...execution import (
+    test_registry, admission, EXECUTION_TIMEOUT, EXECUTION_CPU_LIMIT, EXECUTION_MEMORY_LIMIT_MB
+)
+from ...util.security_exe import SecurityExecutor, EXECUTOR_VERSION
+from ...util.executor_metrics import metrics
+from ...submissions import submission_writer
+from ...views import ExecutePythonCodeView
+
+# Anfang einer Referenzlösung im auskommentierten __main__-Block einer Testdatei
+_CODE_PREFIXES = ('def ', 'class ', 'import ', 'from ', '@', 'async def ')
+
+BENCHMARK_USERNAME = '__executor_benchmark__'
+BENCHMARK_MODULE_TITLE = '__Executor Benchmark__'
+
+
+def extract_reference_solution(path):
+    """
+    Liest die Referenzlösung aus dem `if __name__ == '__main__':`-Block einer Testdatei.
+    Die Testdateien enthalten dort eine auskommentierte Dummy-Implementierung.
+
+    Returns:
+        str: Quellcode der Referenzlösung oder None, wenn keine gefunden wurde
+    """
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    main_index = next(
+        (i for i, line in enumerate(lines) if line.startswith('if __name__') and '__main__' in line), None
+    )
+    if main_index is None:
+        return None
+
+    solution_lines = []
+    for line in lines[main_index + 1:]:
+        stripped = line.strip()
+        if not stripped.startswith('#'):
+            if solution_lines and stripped:
+                break
+            continue
+        # "#" und genau ein Leerzeichen entfernen, die Einrückung dahinter bleibt erhalten
+        content = stripped[1:]
+        if content.startswith(' '):
+            content = content[1:]
+        if not solution_lines and not content.startswith(_CODE_PREFIXES):
+            continue  # Erklärender Kommentar vor der Lösung
+        solution_lines.append(content)
+
+    # Abschließende Prosa-Zeilen so lange entfernen, bis der Code parst
+    while solution_lines:
+        source = "\n".join(solution_lines).strip() + "\n"
+        try:
+            ast.parse(source)
+            return source
+        except SyntaxError:
+            solution_lines.pop()
+    return None
+
+
+def _percentile(sorted_values, percent):
+    """Perzentil nach dem Nearest-Rank-Verfahren."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _peak_rss_mb():
+    # ru_maxrss: Linux Kilobytes, macOS Bytes
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(max_rss / (1024 * 1024) if platform.system() == 'Darwin' else max_rss / 1024, 2)
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Misst Latenz und Durchsatz der Code-Ausführung mit den Referenzlösungen aus modules/task_tests/ '
+        '(direkt über SecurityExecutor.execute_secure und über den Execute-Endpunkt). '
+        'Für das Ziel "view" werden ein Benchmark-Benutzer und -Modul angelegt und danach wieder gelöscht.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', default='1,4,8', help='Kommagetrennte Parallelitätsstufen (Standard: 1,4,8)')
+        parser.add_argument('--iterations', type=int, default=3, help='Durchläufe pro Referenzlösung und Stufe (Standard: 3)')
+        parser.add_argument('--target', choices=['executor', 'view', 'both'], default='both', help='Was gemessen wird (Standard: both)')
+        parser.add_argument('--filter', default='', help='Nur Testdateien, deren Pfad diesen Text enthält')
+        parser.add_argument('--allow-cache', action='store_true', help='Ergebnis-Cache im Endpunkt nicht umgehen')
+        parser.add_argument('--output', default='executor_benchmark.json', help='Zieldatei für die Ergebnisse (JSON)')
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['concurrency'].split(',') if level.strip()]
+        except ValueError:
+            raise CommandError('--concurrency erwartet eine kommagetrennte Liste von Zahlen, z.B. 1,4,8')
+
+        solutions = self._collect_solutions(options['filter'])
+        if not solutions:
+            raise CommandError('Keine Referenzlösungen gefunden.')
+        self.stdout.write(f'{len(solutions)} Referenzlösungen gefunden.')
+
+        targets = ['executor', 'view'] if options['target'] == 'both' else [options['target']]
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'git_commit': _git_commit(),
+            'executor_version': EXECUTOR_VERSION,
+            'config': {
+                'concurrency': levels,
+                'iterations': options['iterations'],
+                'cpu_count': os.cpu_count(),
+                'timeout': EXECUTION_TIMEOUT,
+                'cpu_limit': EXECUTION_CPU_LIMIT,
+                'memory_limit_mb': EXECUTION_MEMORY_LIMIT_MB,
+            },
+            'solutions': [{'test_file': s['relative_path']} for s in solutions],
+            'results': [],
+        }
+
+        # Aufwärmen: Worker-Pool starten und Testdateien laden, damit der erste Messpunkt nicht verfälscht wird
+        self._run_executor(solutions[0], 0)
+
+        # Alle Anfragen kommen vom selben Benchmark-Benutzer - das Benutzerlimit der
+        # Zulassungskontrolle darf die Parallelität nicht künstlich begrenzen
+        per_user_limit = admission.per_user
+        admission.per_user = max(per_user_limit, max(levels))
+
+        for target in targets:
+            fixtures = self._create_view_fixtures(solutions) if target == 'view' else None
+            try:
+                for level in levels:
+                    result = self._run_level(target, level, solutions, options, fixtures)
+                    report['results'].append(result)
+                    self._print_result(result)
+            finally:
+                if fixtures is not None:
+                    self._delete_view_fixtures(fixtures)
+        admission.per_user = per_user_limit
+
+        # Welche Referenzlösungen bestehen ihre Tests in der Sandbox?
+        for entry, solution in zip(report['solutions'], solutions):
+            entry['passed'] = solution.get('passed')
+
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Ergebnisse gespeichert in {options["output"]}'))
+
+    def _collect_solutions(self, path_filter):
+        test_registry.preload()
+        solutions = []
+        for directory, _, filenames in sorted(os.walk(test_registry.root_dir)):
+            for filename in sorted(filenames):
+                if not (filename.startswith('test_') and filename.endswith('.py')):
+                    continue
+                path = os.path.abspath(os.path.join(directory, filename))
+                relative_path = os.path.relpath(path, os.path.dirname(test_registry.root_dir))
+                if path_filter and path_filter not in relative_path:
+                    continue
+                code = extract_reference_solution(path)
+                if code is None:
+                    self.stdout.write(self.style.WARNING(f'Keine Referenzlösung in {relative_path}'))
+                    continue
+                solutions.append({'relative_path': relative_path, 'path': path, 'code': code})
+        return solutions
+
+    def _unique_code(self, solution, run_id):
+        # Eine zusätzliche Zuweisung ändert den AST und damit den Cache-Schlüssel
+        return solution['code'] + f"\nbenchmark_run_id = {run_id}\n"
+
+    def _run_executor(self, solution, run_id):
+        entry = test_registry.get_for_task(
+            f"benchmark:{solution['relative_path']}", solution['relative_path'], lambda: solution['path']
+        )
+        executor = SecurityExecutor(
+            timeout=EXECUTION_TIMEOUT, cpu_limit=EXECUTION_CPU_LIMIT, memory_limit_mb=EXECUTION_MEMORY_LIMIT_MB,
+            virtual_fs=entry.uses_files,
+        )
+        result = executor.execute_secure(self._unique_code(solution, run_id), test_entry=entry)
+        test_results = result.get('test_results')
+        return {
+            'ok': result['success'],
+            'error': result.get('error'),
+            'passed': bool(test_results and test_results['success']),
+            'peak_memory_mb': (result.get('usage') or {}).get('peak_memory_mb'),
+        }
+
+    def _run_view(self, solution, run_id, fixtures, allow_cache):
+        factory = APIRequestFactory()
+        code = solution['code'] if allow_cache else self._unique_code(solution, run_id)
+        request = factory.post(
+            '/api/modules/execute/',
+            {'task_id': fixtures['tasks'][solution['relative_path']], 'code': code},
+            format='json',
+        )
+        force_authenticate(request, user=fixtures['user'])
+        response = ExecutePythonCodeView.as_view()(request)
+        data = json.loads(response.content)
+        test_results = data.get('test_results')
+        return {
+            'ok': response.status_code == 200 and not data.get('error'),
+            'error': data.get('error') or (data.get('stderr') if response.status_code != 200 else None),
+            'passed': bool(test_results and test_results['success']),
+            'peak_memory_mb': (data.get('usage') or {}).get('peak_memory_mb'),
+        }
+
+    def _run_level(self, target, level, solutions, options, fixtures):
+        jobs = [
+            (solution, index * len(solutions) + position)
+            for index in range(options['iterations'])
+            for position, solution in enumerate(solutions)
+        ]
+        latencies = []
+        outcomes = []
+        lock = threading.Lock()
+
+        def run(job):
+            solution, run_id = job
+            started_at = time.perf_counter()
+            try:
+                if target == 'executor':
+                    outcome = self._run_executor(solution, run_id)
+                else:
+                    outcome = self._run_view(solution, run_id, fixtures, options['allow_cache'])
+            except Exception as e:
+                outcome = {'ok': False, 'passed': False, 'peak_memory_mb': None, 'error': f"{type(e).__name__}: {e}"}
+            finally:
+                if target == 'view':
+                    connection.close()
+            elapsed = time.perf_counter() - started_at
+            solution['passed'] = outcome['passed']
+            with lock:
+                latencies.append(elapsed)
+                outcomes.append(outcome)
+
+        counters_before, _ = metrics.snapshot()
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=level) as pool:
+            list(pool.map(run, jobs))
+        wall_time = time.perf_counter() - started_at
+        counters_after, _ = metrics.snapshot()
+
+        def counter_delta(name):
+            return counters_after.get(name, 0) - counters_before.get(name, 0)
+
+        latencies.sort()
+        sandbox_peaks = [o['peak_memory_mb'] for o in outcomes if o['peak_memory_mb'] is not None]
+        return {
+            'target': target,
+            'concurrency': level,
+            'requests': len(jobs),
+            'wall_time_s': round(wall_time, 4),
+            'throughput_rps': round(len(jobs) / wall_time, 2) if wall_time else None,
+            'latency_ms': {
+                'p50': round(_percentile(latencies, 50) * 1000, 2),
+                'p95': round(_percentile(latencies, 95) * 1000, 2),
+                'p99': round(_percentile(latencies, 99) * 1000, 2),
+                'mean': round(sum(latencies) / len(latencies) * 1000, 2),
+                'max': round(latencies[-1] * 1000, 2),
+            },
+            'passed': sum(1 for o in outcomes if o['passed']),
+            'errors': sum(1 for o in outcomes if not o['ok']),
+            'timeouts': counter_delta('timeouts'),
+            'cpu_limit_exceeded': counter_delta('cpu_limit_exceeded'),
+            'memory_limit_exceeded': counter_delta('memory_limit_exceeded'),
+            'pool_busy': counter_delta('pool_busy'),
+            'admission_rejections': counter_delta('admission_rejections'),
+            'cache_hits': counter_delta('cache_hits'),
+            'error_samples': sorted({o['error'] for o in outcomes if o.get('error')})[:10],
+            'peak_sandbox_memory_mb': max(sandbox_peaks) if sandbox_peaks else None,
+            'peak_process_rss_mb': _peak_rss_mb(),
+        }
+
+    def _print_result(self, result):
+        latency = result['latency_ms']
+        self.stdout.write(
+            f"[{result['target']:8}] c={result['concurrency']:<3} {result['requests']} Läufe, "
+            f"{result['throughput_rps']} req/s, p50={latency['p50']}ms p95={latency['p95']}ms "
+            f"p99={latency['p99']}ms, bestanden={result['passed']}, Fehler={result['errors']}, "
+            f"Timeouts={result['timeouts']}"
+        )
+
+    def _create_view_fixtures(self, solutions):
+        """Legt Benchmark-Benutzer, -Modul und je Referenzlösung eine Aufgabe an."""
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(username=BENCHMARK_USERNAME, defaults={'is_active': False})
+        module, _ = Module.objects.get_or_create(title=BENCHMARK_MODULE_TITLE)
+        tasks = {}
+        for solution in solutions:
+            task, _ = Task.objects.get_or_create(
+                module=module,
+                title=solution['relative_path'],
+                defaults={'description': 'Benchmark', 'test_file_path': solution['relative_path']},
+            )
+            tasks[solution['relative_path']] = task.id
+        return {'user': user, 'module': module, 'tasks': tasks}
+
+    def _delete_view_fixtures(self, fixtures):
+        # Erst noch ausstehende Einreichungen schreiben, sonst verweisen sie auf gelöschte Aufgaben
+        submission_writer.flush()
+        # Löscht per Kaskade auch Aufgaben, Fortschrittseinträge und Einreichungen des Benchmarks
+        fixtures['module'].delete()
+        fixtures['user'].delete()
@@ -0,0 +1,103 @@
+import time
+import logging
+import threading
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from ...models import ExecutionJob
+from ...execution import get_task_test_entry, execute_task_code
+
+# Logger einrichten
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Arbeitet asynchrone Ausführungs-Jobs (ExecutionJob) aus der Datenbank ab. Benötigt keinen externen Broker.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Anzahl paralleler Ausführungs-Threads (Standard: 2)')
+        parser.add_argument('--poll-interval', type=float, default=0.5, help='Wartezeit in Sekunden, wenn keine Jobs anstehen (Standard: 0.5)')
+        parser.add_argument('--stale-after', type=int, default=300, help='Jobs, die länger als N Sekunden "running" sind, werden neu eingereiht (Standard: 300)')
+        parser.add_argument('--once', action='store_true', help='Nur die aktuell anstehenden Jobs abarbeiten und dann beenden')
+
+    def handle(self, *args, **options):
+        requeued = self._requeue_stale_jobs(options['stale_after'])
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'{requeued} hängengebliebene Jobs neu eingereiht.'))
+
+        self.stop_event = threading.Event()
+        threads = [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(options['poll_interval'], options['once']),
+                name=f'executor-{i}',
+                daemon=True,
+            )
+            for i in range(options['workers'])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(self.style.SUCCESS(f'{len(threads)} Ausführungs-Worker gestartet.'))
+
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(1)
+        except KeyboardInterrupt:
+            self.stdout.write('Beende Ausführungs-Worker...')
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+
+    def _requeue_stale_jobs(self, stale_after):
+        """Setzt Jobs zurück, deren Worker abgestürzt ist, bevor sie abgeschlossen wurden."""
+        threshold = timezone.now() - timedelta(seconds=stale_after)
+        return ExecutionJob.objects.filter(
+            status=ExecutionJob.Status.RUNNING,
+            started_at__lt=threshold
+        ).update(status=ExecutionJob.Status.QUEUED, started_at=None)
+
+    def _claim_next_job(self):
+        """
+        Reserviert den ältesten wartenden Job. Der Statuswechsel erfolgt über ein bedingtes
+        UPDATE, damit mehrere Worker (auch prozessübergreifend) einen Job nie doppelt ausführen.
+        """
+        while True:
+            job_id = ExecutionJob.objects.filter(
+                status=ExecutionJob.Status.QUEUED
+            ).order_by('created_at').values_list('id', flat=True).first()
+            if job_id is None:
+                return None
+            claimed = ExecutionJob.objects.filter(
+                pk=job_id, status=ExecutionJob.Status.QUEUED
+            ).update(status=ExecutionJob.Status.RUNNING, started_at=timezone.now())
+            if claimed:
+                return ExecutionJob.objects.select_related('user', 'task').get(pk=job_id)
+            # Ein anderer Worker war schneller - nächsten Job versuchen
+
+    def _worker_loop(self, poll_interval, once):
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                job = self._claim_next_job()
+                if job is None:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+                self._run_job(job)
+        finally:
+            connection.close()
+
+    def _run_job(self, job):
+        try:
+            test_entry = get_task_test_entry(job.task)
+            job.result = execute_task_code(job.user, job.task, job.code, test_entry)
+            job.status = ExecutionJob.Status.DONE
+        except Exception as e:
+            logger.error(f"Fehler beim Ausführen von Job {job.pk}: {e}", exc_info=True)
+            job.result = {'error': str(e)}
+            job.status = ExecutionJob.Status.FAILED
+        job.finished_at = timezone.now()
+        job.save(update_fields=['result', 'status', 'finished_at'])
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('modules', '0004_executionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='cpu_time_limit',
+            field=models.FloatField(blank=True, help_text='CPU time budget in seconds for one execution of this task. Empty = global default (EXECUTION_CPU_LIMIT).', null=True),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('modules', '0005_task_cpu_time_limit'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code_hash', models.CharField(max_length=64, unique=True)),
+                ('compressed_code', models.BinaryField()),
+                ('size', models.PositiveIntegerField(help_text='Uncompressed size of the code in bytes')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Submission Code',
+                'verbose_name_plural': 'Submission Codes',
+            },
+        ),
+        migrations.CreateModel(
+            name='Submission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('passed', models.BooleanField(default=False, help_text='True if all tests of the task passed')),
+                ('summary', models.JSONField(default=dict, help_text='Compact result summary (test counts, error, usage)')),
+                ('timings', models.JSONField(default=dict, help_text='Execution phase durations in seconds')),
+                ('cached', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to='modules.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to=settings.AUTH_USER_MODEL)),
+                ('code', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='submissions', to='modules.submissioncode')),
+            ],
+            options={
+                'verbose_name': 'Submission',
+                'verbose_name_plural': 'Submissions',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['user', '-id'], name='modules_sub_user_id_6deae8_idx'), models.Index(fields=['task', '-id'], name='modules_sub_task_id_c73b3c_idx')],
+            },
+        ),
+    ]
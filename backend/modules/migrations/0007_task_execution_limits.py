@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('modules', '0006_submission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='memory_limit_mb',
+            field=models.PositiveIntegerField(blank=True, help_text='Memory limit in MB for one execution of this task. Empty = default for the difficulty.', null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='output_limit_bytes',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum bytes of stdout kept for one execution of this task. Empty = default for the difficulty.', null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='time_limit',
+            field=models.FloatField(blank=True, help_text='Wall-clock time limit in seconds for one execution of this task. Empty = default for the difficulty.', null=True),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='cpu_time_limit',
+            field=models.FloatField(blank=True, help_text='CPU time budget in seconds for one execution of this task. Empty = default for the difficulty.', null=True),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+import zlib
+import hashlib
 from django.contrib.auth.models import User
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Exists, OuterRef # Import needed for efficient check
@@ -155,6 +157,27 @@ class Task(models.Model):
         default=0,
         help_text=_("Optional field to define the order of tasks within a module.")
     )
+    # Ausführungslimits - leer = Standard für die Schwierigkeit (EXECUTION_DIFFICULTY_LIMITS, siehe get_execution_limits)
+    cpu_time_limit = models.FloatField(
+        null=True,
+        blank=True,
+        help_text=_("CPU time budget in seconds for one execution of this task. Empty = default for the difficulty.")
+    )
+    time_limit = models.FloatField(
+        null=True,
+        blank=True,
+        help_text=_("Wall-clock time limit in seconds for one execution of this task. Empty = default for the difficulty.")
+    )
+    memory_limit_mb = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text=_("Memory limit in MB for one execution of this task. Empty = default for the difficulty.")
+    )
+    output_limit_bytes = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text=_("Maximum bytes of stdout kept for one execution of this task. Empty = default for the difficulty.")
+    )
 
     def __str__(self):
         return f"{self.module.title} - Task: {self.title}"
@@ -184,3 +207,98 @@ class UserTaskProgress(models.Model):
         # Ensure a user can only have one progress entry per task
         unique_together = ('user', 'task')
         ordering = ['user', 'task']
+
+
+class ExecutionJob(models.Model):
+    """
+    Asynchroner Ausführungsauftrag für Aufgaben-Code.
+    Die Tabelle dient als lokale Job-Queue, die von `manage.py run_executors` abgearbeitet wird.
+    """
+    class Status(models.TextChoices):
+        QUEUED = 'queued', _('Queued')
+        RUNNING = 'running', _('Running')
+        DONE = 'done', _('Done')
+        FAILED = 'failed', _('Failed')
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='execution_jobs')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='execution_jobs')
+    code = models.TextField()
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        db_index=True,
+    )
+    result = models.JSONField(null=True, blank=True, help_text=_("Response data of the execution once finished"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Job {self.pk} - {self.user.username} - {self.task.title} ({self.status})"
+
+    class Meta:
+        verbose_name = _("Execution Job")
+        verbose_name_plural = _("Execution Jobs")
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+
+class SubmissionCode(models.Model):
+    """
+    Eingereichter Code, dedupliziert über den SHA-256-Hash und zlib-komprimiert gespeichert.
+    Wiederholte Ausführungen desselben Codes verweisen auf denselben Eintrag.
+    """
+    code_hash = models.CharField(max_length=64, unique=True)
+    compressed_code = models.BinaryField()
+    size = models.PositiveIntegerField(help_text=_("Uncompressed size of the code in bytes"))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @property
+    def code(self):
+        return zlib.decompress(bytes(self.compressed_code)).decode('utf-8')
+
+    @staticmethod
+    def hash_code(code):
+        return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def compress_code(code):
+        return zlib.compress(code.encode('utf-8'), 9)
+
+    def __str__(self):
+        return f"{self.code_hash[:12]} ({self.size} bytes)"
+
+    class Meta:
+        verbose_name = _("Submission Code")
+        verbose_name_plural = _("Submission Codes")
+
+
+class Submission(models.Model):
+    """
+    Protokoll einer Code-Ausführung (Einreichung) mit Ergebniszusammenfassung und Phasen-Zeiten.
+    Wird gebündelt im Hintergrund geschrieben (siehe submissions.py).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='submissions')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='submissions')
+    code = models.ForeignKey(SubmissionCode, on_delete=models.PROTECT, related_name='submissions')
+    passed = models.BooleanField(default=False, help_text=_("True if all tests of the task passed"))
+    summary = models.JSONField(default=dict, help_text=_("Compact result summary (test counts, error, usage)"))
+    timings = models.JSONField(default=dict, help_text=_("Execution phase durations in seconds"))
+    cached = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Submission {self.pk} - {self.user.username} - {self.task.title}"
+
+    class Meta:
+        verbose_name = _("Submission")
+        verbose_name_plural = _("Submissions")
+        ordering = ['-id']
+        # Keyset-Paginierung pro Benutzer bzw. pro Aufgabe (neueste zuerst)
+        indexes = [
+            models.Index(fields=['user', '-id']),
+            models.Index(fields=['task', '-id']),
+        ]
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Module, Content, SupplementaryContent, Task, UserTaskProgress
+from .models import Module, Content, SupplementaryContent, Task, UserTaskProgress, ExecutionJob, Submission
 
 # Basic Serializers (for content structure)
 
@@ -89,4 +89,32 @@ class UserSpecificModuleSerializer(serializers.ModelSerializer):
         return obj.is_public # Fallback für anonyme oder fehlenden Request
 
     # get_user_progress_percent wurde entfernt. Die Berechnung erfolgt nun 
-    # entweder im Frontend oder muss performant in der View vorbereitet werden. 
\ No newline at end of file
+    # entweder im Frontend oder muss performant in der View vorbereitet werden.
+
+
+class ExecutionJobSerializer(serializers.ModelSerializer):
+    """ Status und Ergebnis eines asynchronen Ausführungs-Jobs. """
+    task_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = ExecutionJob
+        fields = ['id', 'task_id', 'status', 'result', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
+
+
+class SubmissionSerializer(serializers.ModelSerializer):
+    """ Eintrag aus dem Einreichungsprotokoll. Der Code wird nur mit `include_code` im Kontext geliefert. """
+    task_id = serializers.IntegerField(read_only=True)
+    user_id = serializers.IntegerField(read_only=True)
+    code_hash = serializers.CharField(source='code.code_hash', read_only=True)
+    code = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Submission
+        fields = ['id', 'task_id', 'user_id', 'code_hash', 'code', 'passed', 'summary', 'timings', 'cached', 'created_at']
+        read_only_fields = fields
+
+    def get_code(self, obj):
+        if not self.context.get('include_code'):
+            return None
+        return obj.code.code
@@ -0,0 +1,172 @@
+"""
+Protokollierung von Einreichungen (Submission).
+
+Jede Ausführung über execute_task_code wird hier eingereiht und von einem Hintergrund-Thread
+gebündelt in die Datenbank geschrieben. Der Code selbst wird pro Hash nur einmal
+(zlib-komprimiert) als SubmissionCode gespeichert.
+"""
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.db import transaction, close_old_connections
+from django.utils import timezone
+from .models import Submission, SubmissionCode
+from .util.batch_writer import BatchWriter
+from .util.executor_metrics import metrics
+
+SUBMISSION_LOG = {
+    'enabled': True,
+    'batch_size': 100,
+    'flush_interval': 1.0,
+    'max_queue': 10000,
+    'recent_failed_entries': 10000,
+    **getattr(settings, 'SUBMISSION_LOG', {}),
+}
+
+# Maximale Länge gespeicherter Fehlermeldungen in der Zusammenfassung
+MAX_SUMMARY_ERROR_CHARS = 2000
+
+
+def summarize_result(response_data):
+    """
+    Verdichtet die Antwort von execute_task_code auf die Felder, die für Auswertungen
+    gebraucht werden (ohne stdout und vollständige Tracebacks).
+
+    Returns:
+        tuple: (passed, summary)
+    """
+    test_results = response_data.get('test_results') or {}
+    passed = bool(test_results.get('success'))
+    summary = {
+        'tests_run': test_results.get('runs', 0),
+        'failures': [name for name, _ in test_results.get('failures', [])],
+        'errors': [name for name, _ in test_results.get('errors', [])],
+        # "Klasse.methode" der fehlgeschlagenen Tests (für failed_first, siehe previous_failed_tests)
+        'failed_tests': [
+            test['name'] for test in test_results.get('tests', []) if test['status'] in ('failed', 'error')
+        ],
+        'partial': bool(test_results.get('partial')),
+        'usage': response_data.get('usage'),
+    }
+    error = response_data.get('error') or (response_data.get('stderr') if not test_results else None)
+    if error:
+        summary['error'] = error[:MAX_SUMMARY_ERROR_CHARS]
+    return passed, summary
+
+
+# Fehlgeschlagene Tests der letzten Einreichung pro (Benutzer, Aufgabe) in diesem Prozess (LRU).
+# Das Protokoll wird bis zu flush_interval Sekunden verzögert geschrieben - ohne diesen Speicher
+# sähe eine direkt folgende Ausführung mit failed_first noch die vorletzte Einreichung
+_recent_failed_tests = OrderedDict()
+_recent_failed_lock = threading.Lock()
+
+
+def _remember_failed_tests(user_id, task_id, failed_tests):
+    with _recent_failed_lock:
+        _recent_failed_tests[(user_id, task_id)] = failed_tests
+        _recent_failed_tests.move_to_end((user_id, task_id))
+        if len(_recent_failed_tests) > SUBMISSION_LOG['recent_failed_entries']:
+            _recent_failed_tests.popitem(last=False)
+
+
+def previous_failed_tests(user, task):
+    """
+    Liefert die bei der letzten Einreichung des Benutzers zur Aufgabe fehlgeschlagenen Tests.
+    Einreichungen in diesem Prozess gelten sofort, sonst die letzte geschriebene aus dem Protokoll
+    (Einreichungen über andere Prozesse erscheinen dort erst nach dem nächsten Schreibvorgang).
+
+    Returns:
+        list: Namen im Format "Klasse.methode" (leer, wenn es keine Einreichung gibt)
+    """
+    with _recent_failed_lock:
+        failed_tests = _recent_failed_tests.get((user.pk, task.pk))
+    if failed_tests is not None:
+        return list(failed_tests)
+    summary = (
+        Submission.objects.filter(user=user, task=task, summary__has_key='failed_tests')
+        .values_list('summary', flat=True).first()
+    )
+    return summary['failed_tests'] if summary else []
+
+
+def _write_submissions(batch):
+    """Schreibt einen Batch von Einreichungen (Code dedupliziert über den Hash)."""
+    close_old_connections()
+    try:
+        codes = {entry['code_hash']: entry['code'] for entry in batch}
+        with transaction.atomic():
+            code_ids = dict(
+                SubmissionCode.objects.filter(code_hash__in=codes).values_list('code_hash', 'id')
+            )
+            missing = [code_hash for code_hash in codes if code_hash not in code_ids]
+            if missing:
+                SubmissionCode.objects.bulk_create(
+                    [
+                        SubmissionCode(
+                            code_hash=code_hash,
+                            compressed_code=SubmissionCode.compress_code(codes[code_hash]),
+                            size=len(codes[code_hash].encode('utf-8')),
+                        )
+                        for code_hash in missing
+                    ],
+                    ignore_conflicts=True,
+                )
+                # Bei ignore_conflicts liefern nicht alle Datenbanken die IDs zurück
+                code_ids.update(
+                    SubmissionCode.objects.filter(code_hash__in=missing).values_list('code_hash', 'id')
+                )
+            Submission.objects.bulk_create([
+                Submission(
+                    user_id=entry['user_id'],
+                    task_id=entry['task_id'],
+                    code_id=code_ids[entry['code_hash']],
+                    passed=entry['passed'],
+                    summary=entry['summary'],
+                    timings=entry['timings'],
+                    cached=entry['cached'],
+                    created_at=entry['created_at'],
+                )
+                for entry in batch
+            ])
+        metrics.increment('submissions_written', len(batch))
+    finally:
+        close_old_connections()
+
+
+submission_writer = BatchWriter(
+    _write_submissions,
+    batch_size=SUBMISSION_LOG['batch_size'],
+    flush_interval=SUBMISSION_LOG['flush_interval'],
+    max_queue=SUBMISSION_LOG['max_queue'],
+    name='submission-writer',
+)
+
+
+def record_submission(user, task, code, response_data, timings=None):
+    """
+    Reiht eine Einreichung zum Schreiben ein (kehrt sofort zurück).
+
+    Args:
+        user (User): Der ausführende Benutzer
+        task (Task): Die Aufgabe
+        code (str): Der eingereichte Code
+        response_data (dict): Antwort von execute_task_code
+        timings (PhaseTimings): Optional, die erfassten Phasen-Zeiten
+    """
+    passed, summary = summarize_result(response_data)
+    _remember_failed_tests(user.pk, task.pk, summary['failed_tests'])
+    if not SUBMISSION_LOG['enabled']:
+        return
+    accepted = submission_writer.submit({
+        'user_id': user.pk,
+        'task_id': task.pk,
+        'code_hash': SubmissionCode.hash_code(code),
+        'code': code,
+        'passed': passed,
+        'summary': summary,
+        'timings': {name: round(seconds, 6) for name, seconds in (timings.phases if timings else {}).items()},
+        'cached': bool(response_data.get('cached')),
+        'created_at': timezone.now(),
+    })
+    if not accepted:
+        metrics.increment('submissions_dropped')
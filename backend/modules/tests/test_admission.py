@@ -0,0 +1,99 @@
+import threading
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from ..util.admission import AdmissionController, AdmissionRejected
+from ..views import execute_python_code
+from .utils import create_task
+
+
+class AdmissionControllerTests(SimpleTestCase):
+    """Globale Slots, Benutzerlimit und begrenzte Warteschlange."""
+
+    def _rejection(self, controller, user_key):
+        with self.assertRaises(AdmissionRejected) as context:
+            controller.acquire(user_key)
+        return context.exception
+
+    def test_slots_are_released(self):
+        controller = AdmissionController(slots=1, per_user=1, queue_timeout=0.05)
+        with controller.admit(1):
+            self.assertEqual(controller.stats(), {'active': 1, 'waiting': 0, 'slots': 1})
+        self.assertEqual(controller.stats()['active'], 0)
+        controller.acquire(1)
+        controller.release(1)
+
+    def test_user_limit(self):
+        controller = AdmissionController(slots=4, per_user=1, retry_after=7)
+        controller.acquire(1)
+        rejection = self._rejection(controller, 1)
+        self.assertEqual((rejection.reason, rejection.retry_after), ('user_limit', 7))
+        controller.acquire(2)
+
+    def test_queue_full(self):
+        controller = AdmissionController(slots=1, max_queue=0)
+        controller.acquire(1)
+        self.assertEqual(self._rejection(controller, 2).reason, 'queue_full')
+
+    def test_queue_timeout_frees_the_user(self):
+        controller = AdmissionController(slots=1, per_user=1, queue_timeout=0.05)
+        controller.acquire(1)
+        self.assertEqual(self._rejection(controller, 2).reason, 'queue_timeout')
+        controller.release(1)
+        controller.acquire(2)
+        self.assertEqual(controller.stats(), {'active': 1, 'waiting': 0, 'slots': 1})
+
+    def test_extra_slots_only_when_free(self):
+        controller = AdmissionController(slots=3)
+        controller.acquire(1)
+        self.assertEqual(controller.try_acquire_slots(5), 2)
+        self.assertEqual(controller.try_acquire_slots(1), 0)
+        controller.release_slots(2)
+        self.assertEqual(controller.stats()['active'], 1)
+
+    def test_waiting_request_gets_released_slot(self):
+        controller = AdmissionController(slots=1, queue_timeout=5)
+        controller.acquire(1)
+        waited = []
+        thread = threading.Thread(target=lambda: waited.append(controller.acquire(2)))
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        controller.release(1)
+        thread.join(5)
+        self.assertEqual(len(waited), 1)
+        self.assertEqual(controller.stats()['active'], 1)
+
+
+class AdmissionRejectedResponseTests(TestCase):
+    """Abgelehnte Ausführungen werden mit 503 und Retry-After beantwortet."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('lernende', password='geheim')
+        self.task = create_task()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.controller = AdmissionController(slots=1, per_user=1, retry_after=3)
+        patcher = mock.patch.object(execute_python_code, 'admission', self.controller)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_user_limit_is_rejected(self):
+        self.controller.acquire(self.user.pk)
+        self.addCleanup(self.controller.release, self.user.pk)
+        with mock.patch.object(execute_python_code, 'execute_task_code') as execute:
+            response = self.client.post('/api/modules/execute/', {'code': 'x = 1', 'task_id': self.task.pk},
+                                        format='json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '3')
+        self.assertEqual(response.json()['reason'], 'user_limit')
+        execute.assert_not_called()
+
+    def test_full_server_is_rejected(self):
+        controller = AdmissionController(slots=1, max_queue=0)
+        controller.acquire('andere')
+        with mock.patch.object(execute_python_code, 'admission', controller):
+            response = self.client.post('/api/modules/execute/', {'code': 'x = 1', 'task_id': self.task.pk},
+                                        format='json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['reason'], 'queue_full')
@@ -0,0 +1,78 @@
+import io
+import os
+import json
+import shutil
+import tempfile
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from ..management.commands.benchmark_executor import extract_reference_solution, _percentile
+from .utils import use_test_sandbox_pool
+
+TEST_FILE = '''
+import unittest
+
+
+class AddTest(unittest.TestCase):
+
+    def test_add(self):
+        self.assertEqual(add(2, 3), 5)
+
+
+if __name__ == '__main__':
+    # Dummy-Implementierung zum direkten Testen
+    # def add(a, b):
+    #     return a + b
+    #
+    # Hinweis: das ist nur ein Beispiel
+    unittest.main()
+'''
+
+
+class ReferenceSolutionTests(SimpleTestCase):
+    """Referenzlösungen aus dem auskommentierten __main__-Block der Testdateien."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _write(self, source):
+        path = os.path.join(self.directory, 'test_add.py')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        return path
+
+    def test_solution_without_prose(self):
+        self.assertEqual(extract_reference_solution(self._write(TEST_FILE)), 'def add(a, b):\n    return a + b\n')
+
+    def test_file_without_main_block(self):
+        self.assertIsNone(extract_reference_solution(self._write('import unittest\n')))
+
+    def test_corpus_solution_parses(self):
+        path = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                            'task_tests', 'module_python_oop', 'test_dog_class.py')
+        self.assertTrue(extract_reference_solution(path).startswith('class Dog:'))
+
+    def test_percentile(self):
+        values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+        self.assertEqual(_percentile(values, 50), 5)
+        self.assertEqual(_percentile(values, 95), 10)
+        self.assertIsNone(_percentile([], 50))
+
+
+class BenchmarkCommandTests(SimpleTestCase):
+    """Ein kurzer Lauf gegen den Executor schreibt den Bericht."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+        handle, self.output = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        self.addCleanup(os.remove, self.output)
+
+    def test_executor_run(self):
+        call_command('benchmark_executor', target='executor', filter='test_addition', concurrency='1,2',
+                     iterations=1, output=self.output, stdout=io.StringIO())
+        with open(self.output, encoding='utf-8') as f:
+            report = json.load(f)
+        self.assertEqual([result['concurrency'] for result in report['results']], [1, 2])
+        self.assertEqual(report['results'][0]['errors'], 0, report['results'][0]['error_samples'])
+        self.assertTrue(report['solutions'][0]['passed'])
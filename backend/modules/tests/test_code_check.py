@@ -0,0 +1,84 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from ..util import security_exe
+from ..util.security_exe import SecurityExecutor
+from .utils import create_task
+
+FILE_CODE = '''
+import json
+
+
+def save(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+'''
+
+
+class DiagnoseTests(SimpleTestCase):
+    """Befunde mit Position für den Editor, ohne Ausführung."""
+
+    def setUp(self):
+        self.executor = SecurityExecutor()
+
+    def test_valid_code_has_no_diagnostics(self):
+        self.assertEqual(self.executor.diagnose('x = 1\n'), [])
+
+    def test_syntax_error_position(self):
+        diagnostic, = self.executor.diagnose('def f(:\n')
+        self.assertEqual(diagnostic['kind'], 'syntax')
+        self.assertEqual((diagnostic['line'], diagnostic['column']), (1, 7))
+
+    def test_all_violations_sorted_by_position(self):
+        diagnostics = self.executor.diagnose("x = 1\nimport os\n_y = open('a')\n")
+        self.assertEqual([(d['kind'], d['line']) for d in diagnostics],
+                         [('security', 2), ('restricted', 3), ('security', 3)])
+        self.assertEqual(diagnostics[0]['column'], 1)
+        self.assertEqual(diagnostics[0]['end_column'], 10)
+        self.assertIn('os', diagnostics[0]['message'])
+
+    def test_null_bytes(self):
+        diagnostic, = self.executor.diagnose('a\0b')
+        self.assertEqual(diagnostic['kind'], 'syntax')
+        self.assertIsNone(diagnostic['line'])
+
+
+class CheckPythonCodeViewTests(TestCase):
+    """Der Prüf-Endpunkt führt keinen Code aus."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('lernende', password='geheim'))
+
+    def test_check_without_execution(self):
+        with mock.patch.object(security_exe.SecurityExecutor, 'execute_secure') as execute:
+            response = self.client.post('/api/modules/execute/check/', {'code': 'import os\n'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()['ok'])
+        self.assertEqual(response.json()['diagnostics'][0]['kind'], 'security')
+        execute.assert_not_called()
+
+    def test_valid_and_invalid_requests(self):
+        response = self.client.post('/api/modules/execute/check/', {'code': 'x = 1\n'}, format='json')
+        self.assertEqual(response.json(), {'ok': True, 'diagnostics': []})
+        response = self.client.post('/api/modules/execute/check/', {'code': 1}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(APIClient().post('/api/modules/execute/check/', {'code': 'x'}, format='json').status_code, 401)
+
+    def test_file_task_allows_file_access(self):
+        file_task = create_task(title='JSON speichern',
+                                test_file_path='task_tests/module_python_files/test_save_json.py')
+        response = self.client.post('/api/modules/execute/check/', {'code': FILE_CODE, 'task_id': file_task.pk},
+                                    format='json')
+        self.assertEqual(response.json(), {'ok': True, 'diagnostics': []})
+        response = self.client.post('/api/modules/execute/check/', {'code': FILE_CODE, 'task_id': create_task().pk},
+                                    format='json')
+        self.assertFalse(response.json()['ok'])
+        response = self.client.post('/api/modules/execute/check/', {'code': FILE_CODE}, format='json')
+        self.assertFalse(response.json()['ok'])
+
+    def test_unknown_task(self):
+        response = self.client.post('/api/modules/execute/check/', {'code': 'x = 1\n', 'task_id': 999999},
+                                    format='json')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,58 @@
+import ast
+from unittest import mock
+from django.test import SimpleTestCase
+from ..util.security_exe import SecurityExecutor
+from .utils import use_test_sandbox_pool
+
+
+class CompileCheckedTests(SimpleTestCase):
+    """Sicherheitsanalyse und restricted Kompilierung auf einem einzigen AST."""
+
+    def setUp(self):
+        self.executor = SecurityExecutor()
+
+    def test_given_tree_is_not_parsed_again(self):
+        tree = ast.parse('x = 1 + 2\n')
+        with mock.patch('ast.parse', wraps=ast.parse) as parse:
+            byte_code, message = self.executor.compile_checked('x = 1 + 2\n', tree)
+        self.assertEqual(parse.call_count, 0)
+        self.assertIsNotNone(byte_code)
+        self.assertEqual(message, 'Code-Analyse bestanden')
+
+    def test_syntax_error_is_reported_unwrapped(self):
+        byte_code, message = self.executor.compile_checked('def f(:\n')
+        self.assertIsNone(byte_code)
+        self.assertIn('line 1', message)
+
+    def test_forbidden_constructs_are_rejected(self):
+        for code, expected in (
+            ('import os\n', 'Verbotenes Modul: os'),
+            ('from subprocess import run\n', 'Verbotenes Modul: subprocess'),
+            ('x = eval("1")\n', 'eval'),
+            ('x = ().__class__\n', '__class__'),
+        ):
+            with self.subTest(code=code):
+                byte_code, message = self.executor.compile_checked(code)
+                self.assertIsNone(byte_code)
+                self.assertIn(expected, message)
+
+    def test_restricted_python_errors_are_reported(self):
+        byte_code, message = self.executor.compile_checked('_secret = 1\n')
+        self.assertIsNone(byte_code)
+        self.assertIn('"_secret" is an invalid variable name', message)
+
+
+class SingleParseExecutionTests(SimpleTestCase):
+    """execute_secure verwendet den vom Aufrufer geparsten AST."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+
+    def test_execute_with_tree(self):
+        code = 'x = 6 * 7\nprint(x)\n'
+        with mock.patch('ast.parse', wraps=ast.parse) as parse:
+            result = SecurityExecutor(timeout=5).execute_secure(code, tree=ast.parse(code))
+        self.assertEqual(parse.call_count, 1)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['stdout'], '42\n')
+        self.assertEqual(result['locals']['x'], 42)
@@ -0,0 +1,108 @@
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from ..models import ExecutionJob
+from ..views import execute_python_code
+from ..management.commands.run_executors import Command
+from .utils import create_task
+
+
+class ExecutionJobApiTests(TestCase):
+    """Einreichen und Abfragen asynchroner Ausführungs-Jobs."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('lernende', password='geheim')
+        self.task = create_task()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_submit_queues_job(self):
+        response = self.client.post('/api/modules/execute/jobs/', {'code': 'x = 1', 'task_id': self.task.pk}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'queued')
+        job = ExecutionJob.objects.get(pk=response.json()['id'])
+        self.assertEqual((job.user, job.task, job.code), (self.user, self.task, 'x = 1'))
+
+    def test_submit_validates_request(self):
+        response = self.client.post('/api/modules/execute/jobs/', {'task_id': self.task.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/modules/execute/jobs/', {'code': 'x = 1', 'task_id': 9999}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_open_jobs_per_user_are_limited(self):
+        ExecutionJob.objects.create(user=self.user, task=self.task, code='x = 1', status=ExecutionJob.Status.RUNNING)
+        ExecutionJob.objects.create(user=self.user, task=self.task, code='x = 2', status=ExecutionJob.Status.DONE)
+        with mock.patch.dict(execute_python_code.EXECUTION_JOBS, per_user=2, retry_after=7):
+            response = self.client.post('/api/modules/execute/jobs/', {'code': 'x = 3', 'task_id': self.task.pk},
+                                        format='json')
+            self.assertEqual(response.status_code, 202)
+            response = self.client.post('/api/modules/execute/jobs/', {'code': 'x = 4', 'task_id': self.task.pk},
+                                        format='json')
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '7')
+            self.assertEqual(response.json()['reason'], 'user_limit')
+            self.assertEqual(ExecutionJob.objects.filter(user=self.user).count(), 3)
+
+            other = APIClient()
+            other.force_authenticate(User.objects.create_user('andere', password='geheim'))
+            response = other.post('/api/modules/execute/jobs/', {'code': 'x = 1', 'task_id': self.task.pk},
+                                  format='json')
+            self.assertEqual(response.status_code, 202)
+
+    def test_status_only_for_own_jobs(self):
+        job = ExecutionJob.objects.create(user=self.user, task=self.task, code='x = 1')
+        response = self.client.get(f'/api/modules/execute/jobs/{job.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['task_id'], self.task.pk)
+
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user('andere', password='geheim'))
+        self.assertEqual(other.get(f'/api/modules/execute/jobs/{job.pk}/').status_code, 404)
+        self.assertEqual(APIClient().get(f'/api/modules/execute/jobs/{job.pk}/').status_code, 401)
+
+
+class RunExecutorsTests(TestCase):
+    """Abarbeiten der Job-Queue durch manage.py run_executors."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('lernende', password='geheim')
+        self.task = create_task()
+        self.command = Command()
+
+    def test_jobs_are_claimed_oldest_first_and_once(self):
+        first = ExecutionJob.objects.create(user=self.user, task=self.task, code='x = 1')
+        second = ExecutionJob.objects.create(user=self.user, task=self.task, code='x = 2')
+        self.assertEqual(self.command._claim_next_job().pk, first.pk)
+        self.assertEqual(self.command._claim_next_job().pk, second.pk)
+        self.assertIsNone(self.command._claim_next_job())
+        first.refresh_from_db()
+        self.assertEqual(first.status, ExecutionJob.Status.RUNNING)
+        self.assertIsNotNone(first.started_at)
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = ExecutionJob.objects.create(user=self.user, task=self.task, code='x = 1', status=ExecutionJob.Status.RUNNING,
+                                          started_at=timezone.now() - timedelta(minutes=10))
+        self.assertEqual(self.command._requeue_stale_jobs(300), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExecutionJob.Status.QUEUED)
+
+    def test_finished_job_stores_result(self):
+        job = ExecutionJob.objects.create(user=self.user, task=self.task, code='x = 1')
+        with mock.patch('modules.management.commands.run_executors.execute_task_code', return_value={'stdout': 'ok'}):
+            self.command._run_job(self.command._claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExecutionJob.Status.DONE)
+        self.assertEqual(job.result, {'stdout': 'ok'})
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failed_job_stores_error(self):
+        job = ExecutionJob.objects.create(user=self.user, task=self.task, code='x = 1')
+        with mock.patch('modules.management.commands.run_executors.execute_task_code', side_effect=RuntimeError('kaputt')), \
+                self.assertLogs('modules.management.commands.run_executors', 'ERROR'):
+            self.command._run_job(self.command._claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExecutionJob.Status.FAILED)
+        self.assertEqual(job.result, {'error': 'kaputt'})
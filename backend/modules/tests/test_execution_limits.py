@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase
+from .. import execution
+from ..execution import get_execution_limits, _create_executor
+from ..models import Task
+
+
+def _task(difficulty=Task.Difficulty.MEDIUM, **limits):
+    fields = {'cpu_time_limit': None, 'time_limit': None, 'memory_limit_mb': None, 'output_limit_bytes': None}
+    return SimpleNamespace(difficulty=difficulty, **{**fields, **limits})
+
+
+class ExecutionLimitsTests(SimpleTestCase):
+    """Limits je Aufgabe: Feld der Aufgabe, sonst Standard der Schwierigkeit, sonst globaler Wert."""
+
+    def test_global_defaults(self):
+        self.assertEqual(get_execution_limits(_task()), {
+            'cpu_time': execution.EXECUTION_CPU_LIMIT,
+            'wall_time': max(execution.EXECUTION_TIMEOUT, execution.EXECUTION_CPU_LIMIT * 2),
+            'memory_mb': execution.EXECUTION_MEMORY_LIMIT_MB,
+            'stdout_bytes': execution.EXECUTION_OUTPUT_LIMITS['stdout_bytes'],
+            'stderr_bytes': execution.EXECUTION_OUTPUT_LIMITS['stderr_bytes'],
+        })
+
+    def test_difficulty_defaults(self):
+        limits = get_execution_limits(_task(Task.Difficulty.EASY))
+        self.assertEqual((limits['cpu_time'], limits['wall_time'], limits['memory_mb'], limits['stdout_bytes']),
+                         (1, 3, 128, 16 * 1024))
+
+    def test_task_fields_win(self):
+        limits = get_execution_limits(_task(Task.Difficulty.HARD, cpu_time_limit=2, time_limit=4,
+                                            memory_limit_mb=64, output_limit_bytes=100))
+        self.assertEqual((limits['cpu_time'], limits['wall_time'], limits['memory_mb'], limits['stdout_bytes']),
+                         (2, 4, 64, 100))
+
+    def test_wall_time_stays_above_cpu_budget(self):
+        self.assertEqual(get_execution_limits(_task(cpu_time_limit=4, time_limit=2))['wall_time'], 6)
+
+    def test_overridden_difficulty_limits(self):
+        with mock.patch.object(execution, 'EXECUTION_DIFFICULTY_LIMITS', {Task.Difficulty.MEDIUM: {'cpu_time': 3}}):
+            self.assertEqual(get_execution_limits(_task())['cpu_time'], 3)
+
+    def test_executor_uses_limits(self):
+        executor = _create_executor(_task(Task.Difficulty.EASY), SimpleNamespace(uses_files=False))
+        self.assertEqual((executor.timeout, executor.cpu_limit, executor.memory_limit_mb), (3, 1, 128))
@@ -0,0 +1,62 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from ..util.executor_metrics import ExecutorMetrics, PhaseTimings
+
+
+class ExecutorMetricsTests(SimpleTestCase):
+    """Zähler, Phasen-Histogramme und Prometheus-Ausgabe."""
+
+    def setUp(self):
+        self.metrics = ExecutorMetrics(buckets=(0.1, 1.0))
+
+    def test_counters_and_histograms(self):
+        self.metrics.increment('timeouts')
+        self.metrics.increment('timeouts', 2)
+        self.metrics.observe('user_exec', 0.05)
+        self.metrics.observe('user_exec', 0.5)
+        counters, histograms = self.metrics.snapshot()
+        self.assertEqual(counters, {'timeouts': 3})
+        # Kumulative Buckets wie bei Prometheus
+        self.assertEqual(histograms['user_exec'], {'buckets': [1, 2], 'count': 2, 'sum': 0.55})
+
+    def test_prometheus_format(self):
+        self.metrics.increment('cache_hits')
+        self.metrics.observe('parse', 2.0)
+        text = self.metrics.render_prometheus({'admission_active': 1})
+        self.assertIn('# TYPE executor_admission_active gauge\nexecutor_admission_active 1\n', text)
+        self.assertIn('executor_cache_hits_total 1\n', text)
+        self.assertIn('executor_phase_seconds_bucket{phase="parse",le="1.0"} 0\n', text)
+        self.assertIn('executor_phase_seconds_bucket{phase="parse",le="+Inf"} 1\n', text)
+        self.assertIn('executor_phase_seconds_count{phase="parse"} 1\n', text)
+
+    def test_phase_timings(self):
+        timings = PhaseTimings(self.metrics)
+        timings.record('parse', 0.002)
+        timings.record('parse', 0.001)
+        with timings.phase('total'):
+            pass
+        self.assertAlmostEqual(timings.phases['parse'], 0.003)
+        self.assertTrue(timings.server_timing().startswith('parse;dur=3.00, total;dur='))
+        self.assertEqual(self.metrics.snapshot()[1]['parse']['count'], 2)
+
+
+class ExecutorMetricsViewTests(TestCase):
+    """Zugriff auf den Metrik-Endpunkt für Staff oder mit Token."""
+
+    url = '/api/modules/execute/metrics/'
+
+    def test_staff_only(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('lernende', password='geheim'))
+        self.assertEqual(client.get(self.url).status_code, 403)
+        client.force_authenticate(User.objects.create_user('admin', password='geheim', is_staff=True))
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn('executor_sessions_active', response.content.decode())
+
+    @override_settings(EXECUTOR_METRICS_TOKEN='scraper-token')
+    def test_token(self):
+        self.assertEqual(APIClient().get(self.url, HTTP_X_METRICS_TOKEN='falsch').status_code, 401)
+        self.assertEqual(APIClient().get(self.url, HTTP_X_METRICS_TOKEN='scraper-token').status_code, 200)
@@ -0,0 +1,68 @@
+from django.test import SimpleTestCase
+from ..util.output_capture import OutputBudget, BoundedOutput
+from ..util.security_exe import SecurityExecutor
+from .utils import use_test_sandbox_pool
+
+
+class OutputBudgetTests(SimpleTestCase):
+    """Byte-Budget und Kürzungsmarkierung der Ausgabepuffer."""
+
+    def test_output_within_budget_is_kept(self):
+        output = BoundedOutput(OutputBudget(10))
+        output.write('hallo')
+        self.assertEqual(output.getvalue(), 'hallo')
+        self.assertFalse(output.budget.truncated)
+
+    def test_output_is_cut_with_single_marker(self):
+        budget = OutputBudget(8)
+        output = BoundedOutput(budget)
+        output.write('0123456789')
+        output.write('noch mehr')
+        self.assertEqual(output.getvalue(), '01234567' + budget.marker())
+        self.assertEqual(budget.stats('stdout'), {
+            'stdout_bytes': 19, 'stdout_truncated': True, 'stdout_limit_bytes': 8,
+        })
+
+    def test_marker_once_for_shared_budget(self):
+        budget = OutputBudget(4)
+        user_output, test_output = BoundedOutput(budget), BoundedOutput(budget)
+        user_output.write('abcdef')
+        test_output.write('ghi')
+        self.assertEqual(user_output.getvalue(), 'abcd' + budget.marker())
+        self.assertEqual(test_output.getvalue(), '')
+
+    def test_utf8_characters_are_not_split(self):
+        output = BoundedOutput(OutputBudget(3))
+        output.write('ääb')
+        self.assertTrue(output.getvalue().startswith('ä\n'))
+
+    def test_sink_receives_output(self):
+        received = []
+        output = BoundedOutput(OutputBudget(), sink=received.append)
+        output.write('zeile\n')
+        self.assertEqual(received, ['zeile\n'])
+        self.assertEqual(output.getvalue(), '')
+
+
+class AbortedOutputTests(SimpleTestCase):
+    """Bei einem Abbruch in der Sandbox bleiben die bis dahin erfassten Ausgaben erhalten."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+
+    def test_output_kept_when_cpu_limit_is_exceeded(self):
+        executor = SecurityExecutor(timeout=10, cpu_limit=0.5, max_stdout_bytes=1000)
+        result = executor.execute_secure("x = 'endlos'\nwhile True:\n    print(x)\n")
+        self.assertFalse(result['success'])
+        self.assertIn('CPU-Zeitlimit', result['error'])
+        self.assertTrue(result['stdout'].startswith('endlos\nendlos\n'))
+        self.assertIn('Ausgabe gekürzt', result['stdout'])
+        self.assertTrue(result['usage']['stdout_truncated'])
+
+    def test_output_kept_on_timeout(self):
+        executor = SecurityExecutor(timeout=0.5)
+        result = executor.execute_secure("print('start')\nwhile True:\n    pass\n")
+        self.assertFalse(result['success'])
+        self.assertIn('Zeitüberschreitung', result['error'])
+        self.assertEqual(result['stdout'], 'start\n')
+        self.assertTrue(result['usage']['timed_out'])
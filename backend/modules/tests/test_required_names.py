@@ -0,0 +1,80 @@
+import ast
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from .. import submissions
+from ..util import security_exe
+from ..util.required_names import discover_required_names, defined_names, find_missing_names
+from .utils import create_task
+
+LOOKUP_TESTS = '''
+import sys
+import unittest
+
+
+class LookupTest(unittest.TestCase):
+
+    def test_lookups(self):
+        self.assertTrue(callable(globals().get('add')))
+        self.assertTrue('Counter' in globals())
+        self.assertTrue(hasattr(sys.modules.get('__main__'), 'greet'))
+        self.assertEqual(multiply(2, 3), 6)
+        result = len([1])
+'''
+
+
+class DiscoverRequiredNamesTests(SimpleTestCase):
+    """Statisch ermittelte Namen, die die Tests vom Benutzercode erwarten."""
+
+    def test_lookups_and_free_names(self):
+        self.assertEqual(discover_required_names(ast.parse(LOOKUP_TESTS)), ('Counter', 'add', 'greet', 'multiply'))
+
+    def test_names_defined_in_test_file_are_not_required(self):
+        tree = ast.parse('def helper():\n    return 1\n\nvalue = helper()\n')
+        self.assertEqual(discover_required_names(tree), ())
+
+
+class DefinedNamesTests(SimpleTestCase):
+    """Namen auf Modulebene des Benutzercodes."""
+
+    def test_module_level_definitions(self):
+        code = (
+            'import math as m\n'
+            'class Dog:\n    sound = 1\n'
+            'if True:\n    def bark():\n        inner = 1\n'
+            'for item in []:\n    pass\n'
+            'def setup():\n    global config\n    config = 1\n'
+        )
+        self.assertEqual(defined_names(ast.parse(code)), {'m', 'Dog', 'bark', 'item', 'setup', 'config'})
+
+    def test_star_import_cannot_be_resolved(self):
+        self.assertIsNone(defined_names(ast.parse('from math import *\n')))
+        self.assertEqual(find_missing_names(ast.parse('from math import *\n'), ('add',)), [])
+
+    def test_missing_names_keep_required_order(self):
+        self.assertEqual(find_missing_names(ast.parse('def add(a, b):\n    return a + b\n'), ('add', 'greet', 'multiply')),
+                         ['greet', 'multiply'])
+
+
+class MissingNamesExecutionTests(TestCase):
+    """Fehlende Definitionen werden ohne Sandbox-Lauf gemeldet."""
+
+    def setUp(self):
+        self.task = create_task()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('lernende', password='geheim'))
+        patcher = mock.patch.object(submissions.submission_writer, 'submit', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_missing_class_is_reported(self):
+        with mock.patch.object(security_exe.SecurityExecutor, 'execute_secure') as execute:
+            response = self.client.post('/api/modules/execute/', {'code': 'class Cat:\n    pass\n', 'task_id': self.task.pk},
+                                        format='json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['missing_names'], ['Dog'])
+        self.assertIn('Dog', data['error'])
+        self.assertIsNone(data['test_results'])
+        execute.assert_not_called()
@@ -0,0 +1,98 @@
+import signal
+from django.test import SimpleTestCase
+from ..util.resource_limits import CpuLimitExceeded, limit_cpu_time, cpu_limit_exceeded
+from ..util.security_exe import SecurityExecutor
+from .utils import use_test_sandbox_pool, write_test_file
+
+LOOPING_TESTS = '''
+import time
+import unittest
+
+
+class LoopTest(unittest.TestCase):
+''' + ''.join(f'''
+    def test_loop_{index}(self):
+        spin()
+''' for index in range(6)) + '''
+    def test_sleep(self):
+        time.sleep(float(SLEEP))
+'''
+
+SPIN_CODE = "SLEEP = 0\ndef spin():\n    while True:\n        pass\n"
+SLEEP_CODE = "SLEEP = 3\ndef spin():\n    return None\n"
+
+
+class CpuTimeLimitTests(SimpleTestCase):
+    """CPU-Zeitbudget über ITIMER_VIRTUAL, RLIMIT_CPU nur als Notbremse."""
+
+    def test_busy_loop_stops_at_budget(self):
+        with self.assertRaises(CpuLimitExceeded):
+            with limit_cpu_time(0.5) as usage:
+                while True:
+                    pass
+        # Nicht erst an der nächsten vollen Sekunde von RLIMIT_CPU
+        self.assertGreaterEqual(usage['cpu_time'], 0.45)
+        self.assertLess(usage['cpu_time'], 0.8)
+        # Auch wenn process_time() knapp unter dem Budget liegt, zählt der Abbruch
+        self.assertTrue(usage['cpu_limit_exceeded'])
+        self.assertTrue(cpu_limit_exceeded(usage))
+
+    def test_abort_counts_even_below_measured_budget(self):
+        self.assertTrue(cpu_limit_exceeded({'cpu_time': 0.499, 'cpu_limit': 0.5, 'cpu_limit_exceeded': True}))
+        self.assertFalse(cpu_limit_exceeded({'cpu_time': 0.499, 'cpu_limit': 0.5}))
+
+    def test_timer_and_handler_are_restored(self):
+        handler = signal.getsignal(signal.SIGVTALRM)
+        with limit_cpu_time(5) as usage:
+            sum(range(1000))
+        self.assertEqual(signal.getitimer(signal.ITIMER_VIRTUAL), (0.0, 0.0))
+        self.assertIs(signal.getsignal(signal.SIGVTALRM), handler)
+        self.assertFalse(cpu_limit_exceeded(usage))
+
+    def test_without_budget_only_measures(self):
+        with limit_cpu_time(None) as usage:
+            sum(range(1000))
+        self.assertIsNotNone(usage['cpu_time'])
+        self.assertFalse(cpu_limit_exceeded(usage))
+
+
+class LimitsDuringTestsTests(SimpleTestCase):
+    """Ein Abbruch in einem Test beendet den ganzen Testlauf (unittest fängt auch BaseExceptions)."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+        self.test_entry = write_test_file(self, LOOPING_TESTS)
+
+    def test_cpu_budget_covers_all_tests(self):
+        result = SecurityExecutor(timeout=10, cpu_limit=0.5).execute_secure(SPIN_CODE, test_entry=self.test_entry)
+        self.assertFalse(result['success'])
+        self.assertIn('CPU-Zeitlimit', result['error'])
+        # Nicht ein Budget pro Test
+        self.assertLess(result['usage']['cpu_time'], 1.0)
+
+    def test_wall_time_in_test_is_a_timeout(self):
+        result = SecurityExecutor(timeout=1).execute_secure(SLEEP_CODE, test_entry=self.test_entry)
+        self.assertFalse(result['success'])
+        self.assertIn('Zeitüberschreitung', result['error'])
+        self.assertTrue(result['usage']['timed_out'])
+
+
+class MemoryLimitTests(SimpleTestCase):
+    """Speicherlimit pro Ausführung und gemeldeter Spitzen-RSS."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+
+    def test_allocation_above_limit_fails(self):
+        result = SecurityExecutor(timeout=5, memory_limit_mb=64).execute_secure("data = 'a' * (256 * 1024 * 1024)\n")
+        self.assertFalse(result['success'])
+        self.assertIn('Speicherlimit überschritten', result['error'])
+        self.assertIn('64 MB', result['error'])
+        self.assertTrue(result['usage']['memory_exceeded'])
+
+    def test_peak_memory_is_reported(self):
+        result = SecurityExecutor(timeout=5, memory_limit_mb=256).execute_secure("data = 'a' * (32 * 1024 * 1024)\n")
+        self.assertTrue(result['success'])
+        self.assertFalse(result['usage']['memory_exceeded'])
+        self.assertGreaterEqual(result['usage']['peak_memory_mb'], 32)
+        self.assertEqual(result['usage']['memory_limit_mb'], 256)
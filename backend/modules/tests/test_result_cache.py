@@ -0,0 +1,97 @@
+import ast
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from .. import execution
+from ..submissions import submission_writer
+from ..util.result_cache import ExecutionResultCache
+from .utils import create_task, use_test_sandbox_pool, write_test_file
+
+TASK_TESTS = '''
+import unittest
+
+
+class AddTest(unittest.TestCase):
+
+    def test_add(self):
+        self.assertEqual(add(2, 3), 5)
+'''
+
+
+class ExecutionResultCacheTests(SimpleTestCase):
+    """Schlüssel, LRU-Verdrängung, TTL und Invalidierung des Ergebnis-Caches."""
+
+    def setUp(self):
+        self.cache = ExecutionResultCache(max_entries=2, ttl=60)
+
+    def _key(self, code, digest='digest', version='1'):
+        return self.cache.make_key(ast.parse(code), digest, version)
+
+    def test_key_ignores_formatting_and_comments(self):
+        self.assertEqual(self._key('x=1'), self._key('# Kommentar\n\nx = 1  # noch einer\n'))
+        self.assertNotEqual(self._key('x = 1'), self._key('x = 2'))
+        self.assertNotEqual(self._key('x = 1'), self._key('x = 1', digest='other'))
+        self.assertNotEqual(self._key('x = 1'), self._key('x = 1', version='2'))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set('a', {'value': 1})
+        self.cache.set('b', {'value': 2})
+        self.cache.get('a')
+        self.cache.set('c', {'value': 3})
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), {'value': 1})
+        self.assertEqual(len(self.cache), 2)
+
+    def test_entries_expire_after_ttl(self):
+        with mock.patch('modules.util.result_cache.time.monotonic', return_value=100.0):
+            self.cache.set('a', {'value': 1})
+        with mock.patch('modules.util.result_cache.time.monotonic', return_value=159.0):
+            self.assertIsNotNone(self.cache.get('a'))
+        with mock.patch('modules.util.result_cache.time.monotonic', return_value=161.0):
+            self.assertIsNone(self.cache.get('a'))
+
+    def test_changed_test_file_discards_entries(self):
+        old_key, new_key = self._key('x = 1', digest='old'), self._key('x = 1', digest='new')
+        self.cache.set(old_key, {'value': 1})
+        self.cache.set(new_key, {'value': 2})
+        self.cache.discard_test_digest('old')
+        self.assertIsNone(self.cache.get(old_key))
+        self.assertIsNotNone(self.cache.get(new_key))
+
+    def test_entries_are_copied(self):
+        value = {'tests': [1]}
+        self.cache.set('a', value)
+        value['tests'].append(2)
+        self.cache.get('a')['tests'].append(3)
+        self.assertEqual(self.cache.get('a'), {'tests': [1]})
+
+
+class CachedExecutionTests(TestCase):
+    """Identischer Code gegen dieselbe Testdatei läuft nur einmal in der Sandbox."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+        self.user = User.objects.create_user('lernende', password='geheim')
+        self.task = create_task()
+        self.test_entry = write_test_file(self, TASK_TESTS)
+        for patcher in (mock.patch.object(execution, 'result_cache', ExecutionResultCache()),
+                        mock.patch.object(submission_writer, 'submit', return_value=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _execute(self, code):
+        return execution.execute_task_code(self.user, self.task, code, self.test_entry)
+
+    def test_reformatted_code_is_served_from_cache(self):
+        first = self._execute('def add(a, b):\n    return a + b\n')
+        second = self._execute('# Lösung\ndef add(a,b):\n\n    return a+b\n')
+        self.assertFalse(first['cached'])
+        self.assertTrue(second['cached'])
+        self.assertEqual(second['test_results'], first['test_results'])
+        # Auch ein Cache-Treffer markiert die Aufgabe als erledigt
+        self.assertTrue(self.user.task_progress.get(task=self.task).completed)
+
+    def test_failed_executions_are_not_cached(self):
+        response = self._execute('add = 1 / 0\n')
+        self.assertIn('division by zero', response['error'])
+        self.assertEqual(len(execution.result_cache), 0)
@@ -0,0 +1,39 @@
+from django.test import SimpleTestCase
+from ..util.security_exe import SecurityExecutor, SAFE_GLOBALS_TEMPLATE, RESTRICTED_BUILTINS
+from .utils import use_test_sandbox_pool
+
+
+class SafeGlobalsTemplateTests(SimpleTestCase):
+    """Die geteilte Vorlage bleibt unverändert, jede Ausführung bekommt eigene Kopien."""
+
+    def test_template_is_read_only(self):
+        with self.assertRaises(TypeError):
+            SAFE_GLOBALS_TEMPLATE['len'] = None
+        with self.assertRaises(TypeError):
+            RESTRICTED_BUILTINS['open'] = open
+
+    def test_copies_do_not_share_state(self):
+        executor = SecurityExecutor()
+        first = executor.create_safe_globals({'extra': 1})
+        first['printed'] = 'geändert'
+        first['__builtins__']['len'] = None
+        second = executor.create_safe_globals()
+        self.assertEqual(second['printed'], '')
+        self.assertIs(second['__builtins__']['len'], len)
+        self.assertNotIn('extra', second)
+        self.assertIs(SAFE_GLOBALS_TEMPLATE['__builtins__']['len'], len)
+
+
+class WorkerIsolationTests(SimpleTestCase):
+    """Aufeinanderfolgende Ausführungen im selben Sandbox-Worker sehen sich nicht."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+
+    def test_names_do_not_leak_into_next_execution(self):
+        executor = SecurityExecutor(timeout=5)
+        first = executor.execute_secure("secret = 42\nprint(secret)\n")
+        self.assertEqual(first['stdout'], '42\n')
+        second = executor.execute_secure("print(secret)\n")
+        self.assertFalse(second['success'])
+        self.assertIn("'secret' is not defined", second['error'])
@@ -0,0 +1,111 @@
+import os
+import time
+from unittest import mock
+from django.test import SimpleTestCase
+from ..util import sandbox_pool
+from ..util.sandbox_pool import SandboxWorkerPool
+from ..util.security_exe import SecurityExecutor
+from .utils import use_test_sandbox_pool
+
+
+def _echo(job, emit=None):
+    if job.get('event'):
+        emit(job['event'])
+    if job.get('sleep'):
+        time.sleep(job['sleep'])
+    if job.get('crash'):
+        os._exit(1)
+    return {'value': job.get('value'), 'pid': os.getpid()}
+
+
+def _recycle_on_flag(result):
+    return result['value'] == 'recycle'
+
+
+class SandboxWorkerPoolTests(SimpleTestCase):
+    """Vorgestartete Worker: Wiederverwendung, Recycling und Ersatz nach Timeout oder Absturz."""
+
+    def setUp(self):
+        self.pool = SandboxWorkerPool(
+            runner=_echo, size=1, max_jobs_per_worker=3, start_method='fork', should_recycle=_recycle_on_flag
+        )
+        self.addCleanup(self.pool.shutdown)
+
+    def test_worker_is_reused_between_jobs(self):
+        status, first = self.pool.execute({'value': 1}, timeout=5)
+        _, second = self.pool.execute({'value': 2}, timeout=5)
+        self.assertEqual(status, 'ok')
+        self.assertEqual(second['value'], 2)
+        self.assertEqual(first['pid'], second['pid'])
+        self.assertNotEqual(first['pid'], os.getpid())
+
+    def test_worker_is_recycled_after_max_jobs(self):
+        pids = [self.pool.execute({'value': i}, timeout=5)[1]['pid'] for i in range(4)]
+        self.assertEqual(len(set(pids[:3])), 1)
+        self.assertNotEqual(pids[3], pids[0])
+
+    def test_should_recycle_replaces_worker(self):
+        _, first = self.pool.execute({'value': 'recycle'}, timeout=5)
+        _, second = self.pool.execute({'value': 1}, timeout=5)
+        self.assertNotEqual(first['pid'], second['pid'])
+
+    def test_timeout_replaces_worker(self):
+        phases = {}
+        status, result = self.pool.execute({'sleep': 5}, timeout=0.2, phases=phases)
+        self.assertEqual((status, result), ('timeout', None))
+        self.assertEqual(self.pool.execute({'value': 1}, timeout=5)[0], 'ok')
+
+    def test_crash_replaces_worker(self):
+        self.assertEqual(self.pool.execute({'crash': True}, timeout=5), ('crashed', None))
+        self.assertEqual(self.pool.execute({'value': 1}, timeout=5)[0], 'ok')
+
+    def test_events_are_forwarded(self):
+        events = []
+        status, _ = self.pool.execute({'event': {'type': 'stdout', 'data': 'x'}}, timeout=5, on_event=events.append)
+        self.assertEqual(status, 'ok')
+        self.assertEqual(events, [{'type': 'stdout', 'data': 'x'}])
+
+    def test_busy_when_no_worker_is_free(self):
+        self.pool.acquire_timeout = 0.1
+        self.pool.start()
+        worker = self.pool._idle.get()
+        try:
+            self.assertEqual(self.pool.execute({'value': 1}, timeout=5), ('busy', None))
+        finally:
+            self.pool._idle.put(worker)
+
+    def test_unpicklable_job_replaces_worker(self):
+        with self.assertRaises(Exception):
+            self.pool.execute({'value': lambda: 1}, timeout=5)
+        self.assertEqual(self.pool.execute({'value': 1}, timeout=5)[0], 'ok')
+
+    def test_failing_event_handler_replaces_worker(self):
+        def on_event(event):
+            raise ValueError(event)
+
+        with self.assertRaises(ValueError):
+            self.pool.execute({'event': 'x'}, timeout=5, on_event=on_event)
+        self.assertEqual(self.pool.execute({'value': 1}, timeout=5)[0], 'ok')
+
+
+class PoolExecutorTests(SimpleTestCase):
+    """Ein fehlgeschlagener Aufruf darf den einzigen Worker nicht aus dem Pool nehmen."""
+
+    def test_unpicklable_globals_keep_pool_usable(self):
+        use_test_sandbox_pool(self).acquire_timeout = 2
+        with self.assertRaises(Exception):
+            SecurityExecutor().execute_secure('x = f()', additional_globals={'f': lambda: 1})
+        result = SecurityExecutor().execute_secure('print(1)')
+        self.assertTrue(result['success'], result.get('error'))
+
+
+class CurrentRssTests(SimpleTestCase):
+    """RSS-Messung ohne /proc und ohne das resource-Modul (Windows)."""
+
+    def test_without_proc_and_resource(self):
+        with mock.patch('builtins.open', side_effect=OSError), mock.patch.object(sandbox_pool, 'resource', None):
+            self.assertIsNone(sandbox_pool._current_rss_mb())
+
+    def test_getrusage_fallback(self):
+        with mock.patch('builtins.open', side_effect=OSError):
+            self.assertGreater(sandbox_pool._current_rss_mb(), 0)
@@ -0,0 +1,141 @@
+import time
+import signal
+from unittest import mock
+from django.test import SimpleTestCase
+from .. import execution
+from ..execution import resolve_test_options, EXECUTION_PROFILE
+from ..util.sandbox_profiler import SandboxProfiler
+from ..util.security_exe import SecurityExecutor
+from .utils import use_test_sandbox_pool, write_test_file
+
+BUSY_CODE = '''
+def busy():
+    total = 0
+    for i in range(300000):
+        total = total + i
+    return total
+
+
+def idle():
+    return 0
+
+
+busy()
+idle()
+'''
+
+PROFILE_TESTS = '''
+import unittest
+
+
+class BusyTest(unittest.TestCase):
+
+    def test_busy(self):
+        self.assertGreater(busy(), 0)
+
+    def test_list(self):
+        self.assertEqual(len(make_list()), 100000)
+'''
+
+USER_CODE = '''
+def busy():
+    total = 0
+    for i in range(200000):
+        total = total + i
+    return total
+
+
+def make_list():
+    return list(range(100000))
+'''
+
+
+class SandboxProfilerTests(SimpleTestCase):
+    """Stichproben pro Funktion des Benutzercodes und begrenzter Aufwand."""
+
+    def _profile(self, **options):
+        profiler = SandboxProfiler(interval=0.001, **options)
+        profiler.start()
+        try:
+            exec(compile(BUSY_CODE, '<string>', 'exec'), {})
+        finally:
+            profiler.stop()
+        return profiler
+
+    def test_busy_function_is_on_top(self):
+        report = self._profile().report()
+        self.assertGreater(report['samples'], 0)
+        self.assertFalse(report['truncated'])
+        self.assertEqual(report['top_functions'][0]['function'], 'busy')
+        self.assertEqual(report['top_functions'][0]['line'], 2)
+        self.assertIsNotNone(report['peak_memory_kb'])
+
+    def test_sampling_stops_after_max_samples(self):
+        report = self._profile(max_samples=3).report()
+        self.assertEqual(report['samples'], 3)
+        self.assertTrue(report['truncated'])
+
+    def test_signal_handler_is_restored(self):
+        previous = signal.getsignal(signal.SIGPROF)
+        self._profile()
+        self.assertIs(signal.getsignal(signal.SIGPROF), previous)
+        self.assertEqual(signal.getitimer(signal.ITIMER_PROF), (0.0, 0.0))
+
+
+_start_profiler = SandboxProfiler.start
+
+
+def _start_with_overhead(profiler):
+    # Simuliert teures Profiling: 0.6 s CPU-Zeit im profilierten Fenster
+    _start_profiler(profiler)
+    started_at = time.process_time()
+    while time.process_time() - started_at < 0.6:
+        pass
+
+
+class ProfileModeTests(SimpleTestCase):
+    """Profil-Modus einer Ausführung mit Tests."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+        self.test_entry = write_test_file(self, PROFILE_TESTS)
+
+    def test_profile_and_per_test_usage(self):
+        options = resolve_test_options(None, None, profile=True)
+        executor = SecurityExecutor(timeout=10, cpu_limit=5, test_options=options)
+        result = executor.execute_secure(USER_CODE, test_entry=self.test_entry)
+        self.assertTrue(result['success'], result.get('error'))
+        test_results = result['test_results']
+        self.assertTrue(test_results['success'], test_results)
+        self.assertEqual(test_results['profile']['top_functions'][0]['function'], 'busy')
+        for test in test_results['tests']:
+            self.assertIn('cpu_time', test)
+            self.assertIn('peak_memory_kb', test)
+        list_test, = [test for test in test_results['tests'] if test['name'] == 'BusyTest.test_list']
+        # 100000 ints in einer Liste brauchen deutlich mehr als 500 KB
+        self.assertGreater(list_test['peak_memory_kb'], 500)
+
+    def test_profile_option_only_when_enabled(self):
+        self.assertEqual(resolve_test_options(None, None, profile=True)['profile']['top_n'], EXECUTION_PROFILE['top_n'])
+        with mock.patch.dict(execution.EXECUTION_PROFILE, enabled=False):
+            self.assertNotIn('profile', resolve_test_options(None, None, profile=True))
+
+    def test_limits_include_profiled_window(self):
+        options = resolve_test_options(None, None, profile=True)
+        job = SecurityExecutor(timeout=10, cpu_limit=2, test_options=options)._build_job('x = 1')
+        allowance = 2 * EXECUTION_PROFILE['budget_fraction']
+        self.assertEqual((job['cpu_limit'], job['wall_limit'], job['profile_allowance']),
+                         (2 + allowance, 10 + allowance, allowance))
+        job = SecurityExecutor(timeout=10, cpu_limit=2)._build_job('x = 1')
+        self.assertEqual((job['cpu_limit'], job['wall_limit'], job['profile_allowance']), (2, 10, 0))
+
+    def test_profiling_overhead_does_not_exceed_cpu_limit(self):
+        options = resolve_test_options(None, None, profile=True)
+        options['profile'] = {**options['profile'], 'budget_fraction': 1.0}
+        # Die Worker werden erst beim ersten Job (mit dem Patch) geforkt
+        with mock.patch.object(SandboxProfiler, 'start', _start_with_overhead):
+            result = SecurityExecutor(timeout=10, cpu_limit=0.5, test_options=options).execute_secure(
+                USER_CODE, test_entry=self.test_entry
+            )
+        self.assertTrue(result['success'], result.get('error'))
+        self.assertGreater(result['usage']['cpu_time'], 0.5)
@@ -0,0 +1,148 @@
+import threading
+from django.test import SimpleTestCase
+from ..util.sandbox_sessions import SandboxSessionManager, SessionLimitReached
+
+
+class FakeWorker:
+    """Worker ohne Prozess: liefert den Job als Ergebnis zurück."""
+
+    def __init__(self, rss_mb=10.0):
+        self.rss_mb = rss_mb
+        self.jobs = []
+        self.killed = False
+        self.stopped = False
+
+    def run(self, job, timeout, on_event=None):
+        self.jobs.append(job)
+        return job.get('status', 'ok'), {'job': job}, self.rss_mb
+
+    def kill(self):
+        self.killed = True
+
+    def stop(self):
+        self.stopped = True
+
+
+class SandboxSessionManagerTests(SimpleTestCase):
+    """Sitzungen: Wiederverwendung des Workers, Limits und Beenden."""
+
+    def setUp(self):
+        self.workers = []
+        self.manager = self._manager()
+
+    def _spawn(self):
+        worker = FakeWorker()
+        self.workers.append(worker)
+        return worker
+
+    def _manager(self, **options):
+        manager = SandboxSessionManager(self._spawn, reap_interval=3600, **options)
+        self.addCleanup(manager.shutdown)
+        return manager
+
+    def test_cells_share_one_worker(self):
+        status, _, first = self.manager.execute((1, 10), {'cell': 1}, timeout=1)
+        _, _, second = self.manager.execute((1, 10), {'cell': 2}, timeout=1)
+        self.assertEqual(status, 'ok')
+        self.assertTrue(first['created'])
+        self.assertFalse(second['created'])
+        self.assertEqual(second['cells'], 2)
+        self.assertEqual(len(self.workers), 1)
+        self.assertEqual(self.workers[0].jobs, [{'cell': 1}, {'cell': 2}])
+
+    def test_user_and_global_limits(self):
+        manager = self._manager(max_sessions=2, per_user=1)
+        manager.execute((1, 10), {}, timeout=1)
+        with self.assertRaises(SessionLimitReached) as context:
+            manager.execute((1, 11), {}, timeout=1)
+        self.assertEqual(context.exception.reason, 'user_limit')
+        manager.execute((2, 10), {}, timeout=1)
+        with self.assertRaises(SessionLimitReached) as context:
+            manager.execute((3, 10), {}, timeout=1)
+        self.assertEqual(context.exception.reason, 'max_sessions')
+
+    def test_session_ends_after_max_cells(self):
+        manager = self._manager(max_cells=2)
+        manager.execute((1, 10), {}, timeout=1)
+        _, _, info = manager.execute((1, 10), {}, timeout=1)
+        self.assertEqual(info['ended'], 'max_cells')
+        self.assertTrue(self.workers[0].stopped)
+        self.assertIsNone(manager.info((1, 10)))
+
+    def test_session_ends_when_worker_uses_too_much_memory(self):
+        manager = self._manager(max_rss_mb=5)
+        _, _, info = manager.execute((1, 10), {}, timeout=1)
+        self.assertEqual(info['ended'], 'max_rss')
+
+    def test_timeout_kills_session(self):
+        status, _, info = self.manager.execute((1, 10), {'status': 'timeout'}, timeout=1)
+        self.assertEqual(status, 'timeout')
+        self.assertEqual(info['ended'], 'timeout')
+        self.assertTrue(self.workers[0].killed)
+
+    def test_idle_sessions_are_reaped(self):
+        manager = self._manager(idle_ttl=0)
+        manager.execute((1, 10), {}, timeout=1)
+        self.assertEqual(manager.reap(), 1)
+        self.assertTrue(self.workers[0].killed)
+        self.assertEqual(manager.stats()['sessions'], 0)
+
+    def test_close(self):
+        self.manager.execute((1, 10), {}, timeout=1)
+        self.assertTrue(self.manager.close((1, 10)))
+        self.assertFalse(self.manager.close((1, 10)))
+        self.assertTrue(self.workers[0].killed)
+
+
+class SessionSpawnTests(SimpleTestCase):
+    """Der Worker einer neuen Sitzung startet außerhalb des Locks des Managers."""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.spawning = threading.Event()
+        self.spawned = 0
+        self.manager = SandboxSessionManager(self._slow_spawn, reap_interval=3600)
+        self.addCleanup(self.manager.shutdown)
+
+    def _slow_spawn(self):
+        self.spawned += 1
+        self.spawning.set()
+        if not self.release.wait(5):
+            raise RuntimeError('spawn nicht freigegeben')
+        return FakeWorker()
+
+    def _execute_in_thread(self, key, results):
+        thread = threading.Thread(target=lambda: results.append(self.manager.execute(key, {}, timeout=1)))
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        return thread
+
+    def test_other_sessions_are_not_blocked_while_spawning(self):
+        results = []
+        thread = self._execute_in_thread((1, 10), results)
+        self.assertTrue(self.spawning.wait(5))
+        # Der Lock ist frei, obwohl der Worker noch startet
+        self.assertEqual(self.manager.stats()['sessions'], 1)
+        self.assertIsNotNone(self.manager.info((1, 10)))
+        with self.assertRaises(SessionLimitReached):
+            self.manager.execute((1, 11), {}, timeout=1)
+        self.release.set()
+        thread.join(5)
+        self.assertEqual(results[0][0], 'ok')
+
+    def test_concurrent_cells_share_one_spawn(self):
+        results = []
+        first = self._execute_in_thread((1, 10), results)
+        self.assertTrue(self.spawning.wait(5))
+        second = self._execute_in_thread((1, 10), results)
+        self.release.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual(self.spawned, 1)
+        self.assertEqual(sorted(info['created'] for _, _, info in results), [False, True])
+
+    def test_failed_spawn_frees_the_slot(self):
+        manager = SandboxSessionManager(lambda: 1 / 0, reap_interval=3600)
+        with self.assertRaises(ZeroDivisionError):
+            manager.execute((1, 10), {}, timeout=1)
+        self.assertEqual(manager.stats()['sessions'], 0)
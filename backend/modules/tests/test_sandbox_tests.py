@@ -0,0 +1,58 @@
+import os
+import pickle
+from django.test import SimpleTestCase
+from ..util.security_exe import SecurityExecutor
+from .utils import use_test_sandbox_pool, write_test_file
+
+# Die Tests prüfen zusätzlich, dass sie nicht im Prozess des Webservers laufen
+TASK_TESTS = '''
+import os
+import unittest
+
+
+class AddTest(unittest.TestCase):
+
+    def test_add(self):
+        self.assertEqual(add(2, 3), 5)
+
+    def test_negative(self):
+        self.assertEqual(add(-1, -1), -2)
+
+    def test_runs_in_sandbox(self):
+        self.assertNotEqual(os.getpid(), {web_pid})
+'''
+
+
+class SandboxTestRunTests(SimpleTestCase):
+    """Benutzercode und Tests der Aufgabe laufen gemeinsam im Sandbox-Worker."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+        self.test_entry = write_test_file(self, TASK_TESTS.format(web_pid=os.getpid()))
+
+    def _execute(self, code):
+        return SecurityExecutor(timeout=5).execute_secure(code, test_entry=self.test_entry)
+
+    def test_passing_solution(self):
+        result = self._execute('def add(a, b):\n    return a + b\n')
+        self.assertTrue(result['success'])
+        test_results = result['test_results']
+        self.assertTrue(test_results['success'])
+        self.assertEqual(test_results['runs'], 3)
+        self.assertEqual([test['status'] for test in test_results['tests']], ['passed'] * 3)
+        # Nur die kompakte Zusammenfassung kommt aus der Sandbox zurück
+        self.assertEqual(result['locals'], {})
+        pickle.dumps(test_results)
+
+    def test_failing_solution(self):
+        result = self._execute('def add(a, b):\n    return a - b\n')
+        test_results = result['test_results']
+        self.assertFalse(test_results['success'])
+        self.assertEqual(sorted(name.split()[0] for name, _ in test_results['failures']), ['test_add', 'test_negative'])
+        self.assertIn('AssertionError', test_results['failures'][0][1])
+
+    def test_user_code_error_skips_tests(self):
+        result = self._execute('add = 1 / 0\n')
+        self.assertFalse(result['success'])
+        self.assertIn('division by zero', result['error'])
+        self.assertIsNone(result['test_results'])
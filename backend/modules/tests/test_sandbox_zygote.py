@@ -0,0 +1,73 @@
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+import multiprocessing
+from unittest import mock
+from django.test import SimpleTestCase
+from ..util import security_exe, sandbox_tests
+from ..util.sandbox_pool import SandboxWorkerPool
+from ..util.sandbox_zygote import preload_test_code
+from ..util.security_exe import SecurityExecutor, SANDBOX_ZYGOTE_MODULE
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StartMethodTests(SimpleTestCase):
+    """Startmethode der Worker und Rückfall auf die Voreinstellung der Plattform."""
+
+    def _pool(self, start_method):
+        return SandboxWorkerPool(runner=security_exe._run_pool_job, size=1, start_method=start_method)
+
+    def test_unavailable_start_method_falls_back(self):
+        self.assertEqual(self._pool('zygote').start_method, multiprocessing.get_start_method())
+
+    def test_available_start_method_is_used(self):
+        self.assertEqual(self._pool('fork').start_method, 'fork')
+
+
+class ZygoteModuleTests(SimpleTestCase):
+    """Das vorgeladene Modul des Zygoten kommt ohne Django aus und füllt den Test-Code-Cache."""
+
+    def test_zygote_module_does_not_import_django(self):
+        output = subprocess.run(
+            [sys.executable, '-c', f"import sys, {SANDBOX_ZYGOTE_MODULE}; print('django' in sys.modules)"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout
+        self.assertEqual(output.strip(), 'False')
+
+    def test_preload_compiles_test_files(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for filename, source in (('test_ok.py', 'x = 1\n'), ('test_broken.py', 'def (\n'), ('notes.txt', '')):
+            with open(os.path.join(directory, filename), 'w') as f:
+                f.write(source)
+        with mock.patch.dict(sandbox_tests._loaded_test_code, clear=True):
+            preload_test_code(directory)
+            self.assertEqual(len(sandbox_tests._loaded_test_code), 1)
+
+
+class ForkserverPoolTests(SimpleTestCase):
+    """Worker aus dem Zygote führen Jobs wie gewohnt aus."""
+
+    def setUp(self):
+        if 'forkserver' not in multiprocessing.get_all_start_methods():
+            self.skipTest('forkserver ist auf dieser Plattform nicht verfügbar')
+        pool = SandboxWorkerPool(
+            runner=security_exe._run_pool_job,
+            initializer=security_exe._init_sandbox_worker,
+            should_recycle=security_exe._needs_fresh_worker,
+            size=1,
+            start_method='forkserver',
+            preload=[SANDBOX_ZYGOTE_MODULE],
+        )
+        self.addCleanup(pool.shutdown)
+        patcher = mock.patch.object(security_exe, '_sandbox_pool', pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_execution_in_forked_worker(self):
+        result = SecurityExecutor(timeout=30).execute_secure("print(sum(range(4)))\n")
+        self.assertTrue(result['success'], result.get('error'))
+        self.assertEqual(result['stdout'], '6\n')
@@ -0,0 +1,64 @@
+import multiprocessing
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from .. import execution
+from ..util import security_exe
+from ..util.sandbox_pool import spawn_worker
+from ..util.sandbox_sessions import SandboxSessionManager, SessionLimitReached
+from ..views import execute_python_code
+from .utils import create_task
+
+SESSION_URL = '/api/modules/execute/session/'
+
+
+def _spawn_fork_session_worker():
+    return spawn_worker(multiprocessing.get_context('fork'), security_exe._run_session_cell,
+                        security_exe._init_sandbox_worker)
+
+
+class ExecutePythonSessionViewTests(TestCase):
+    """Interaktive Sitzungen über den REPL-Endpunkt."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('lernende', password='geheim')
+        self.task = create_task()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        manager = SandboxSessionManager(_spawn_fork_session_worker, should_close=security_exe._needs_fresh_worker,
+                                        reap_interval=3600)
+        self.addCleanup(manager.shutdown)
+        patcher = mock.patch.object(execution, 'sessions', manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cell(self, code):
+        return self.client.post(SESSION_URL, {'code': code, 'task_id': self.task.pk}, format='json')
+
+    def test_cells_share_state_until_closed(self):
+        first = self._cell('zahl = 20\n')
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.json()['session']['created'])
+        second = self._cell('print(zahl + 1)\n').json()
+        self.assertEqual(second['stdout'], '21\n')
+        self.assertFalse(second['session']['created'])
+        self.assertIn('zahl', second['variables'])
+
+        response = self.client.delete(f'{SESSION_URL}?task_id={self.task.pk}')
+        self.assertEqual(response.json(), {'closed': True})
+        self.assertTrue(self._cell('x = 1\n').json()['session']['created'])
+
+    def test_delete_requires_task_id(self):
+        self.assertEqual(self.client.delete(SESSION_URL).status_code, 400)
+        self.assertEqual(self.client.delete(f'{SESSION_URL}?task_id={self.task.pk}').json(), {'closed': False})
+
+    def test_session_limit_is_429(self):
+        with mock.patch.object(execute_python_code, 'execute_session_cell', side_effect=SessionLimitReached('user_limit')):
+            response = self._cell('x = 1\n')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()['reason'], 'user_limit')
+
+    def test_disabled_sessions_are_404(self):
+        with mock.patch.dict(execute_python_code.EXECUTION_SESSIONS, enabled=False):
+            self.assertEqual(self._cell('x = 1\n').status_code, 404)
@@ -0,0 +1,82 @@
+import threading
+from django.test import SimpleTestCase
+from ..util.single_flight import SingleFlight
+
+
+class _WatchedEvent(threading.Event):
+    """Event, das meldet, sobald jemand darauf wartet."""
+
+    def __init__(self):
+        super().__init__()
+        self.waiting = threading.Event()
+
+    def wait(self, timeout=None):
+        self.waiting.set()
+        return super().wait(timeout)
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Gleichzeitige Aufrufe mit demselben Schlüssel teilen sich eine Ausführung."""
+
+    def setUp(self):
+        self.flights = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def _slow(self, result):
+        def func():
+            self.calls += 1
+            self.started.set()
+            if not self.release.wait(5):
+                raise RuntimeError('nicht freigegeben')
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return func
+
+    def _call_in_thread(self, key, func, results):
+        def call():
+            try:
+                results.append(self.flights.do(key, func))
+            except Exception as e:
+                results.append(e)
+        thread = threading.Thread(target=call)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        return thread
+
+    def _run_leader_and_follower(self, result):
+        """Zweiter Aufruf mit demselben Schlüssel, während der erste noch läuft."""
+        leader_results, follower_results = [], []
+        leader = self._call_in_thread('key', self._slow(result), leader_results)
+        self.assertTrue(self.started.wait(5))
+        done = self.flights._flights['key'].done = _WatchedEvent()
+        follower = self._call_in_thread('key', lambda: 1 / 0, follower_results)
+        self.assertTrue(done.waiting.wait(5))
+        self.release.set()
+        leader.join(5)
+        follower.join(5)
+        return leader_results[0], follower_results[0]
+
+    def test_follower_gets_copy_of_result(self):
+        (result, shared), (follower_result, follower_shared) = self._run_leader_and_follower({'stdout': 'hallo'})
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((shared, follower_shared), (False, True))
+        self.assertEqual(follower_result, result)
+        self.assertIsNot(follower_result, result)
+        self.assertEqual(len(self.flights), 0)
+
+    def test_exception_reaches_every_caller(self):
+        leader_error, follower_error = self._run_leader_and_follower(ValueError('kaputt'))
+        self.assertIsInstance(leader_error, ValueError)
+        self.assertIs(follower_error, leader_error)
+        self.assertEqual(len(self.flights), 0)
+
+    def test_key_is_free_after_completion(self):
+        self.assertEqual(self.flights.do('key', lambda: 1), (1, False))
+        self.assertEqual(self.flights.do('key', lambda: 2), (2, False))
+
+    def test_different_keys_run_separately(self):
+        self.assertEqual(self.flights.do('a', lambda: 'a'), ('a', False))
+        self.assertEqual(self.flights.do('b', lambda: 'b'), ('b', False))
@@ -0,0 +1,67 @@
+import json
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient
+from .. import execution
+from ..submissions import submission_writer
+from ..util.result_cache import ExecutionResultCache
+from .utils import create_task, use_test_sandbox_pool, write_test_file
+
+TASK_TESTS = '''
+import unittest
+
+
+class AddTest(unittest.TestCase):
+
+    def test_add(self):
+        self.assertEqual(add(2, 3), 5)
+
+    def test_zero(self):
+        self.assertEqual(add(0, 0), 0)
+'''
+
+CODE = 'def add(a, b):\n    return a + b\n\nprint("bereit")\n'
+
+
+class ExecuteStreamViewTests(TransactionTestCase):
+    """Ausgaben und Testergebnisse als NDJSON oder Server-Sent Events."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+        for patcher in (mock.patch.object(execution, 'result_cache', ExecutionResultCache()),
+                        mock.patch.object(submission_writer, 'submit', return_value=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user('lernende', password='geheim')
+        self.task = create_task(test_file_path=write_test_file(self, TASK_TESTS).path)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _post(self, **headers):
+        return self.client.post('/api/modules/execute/stream/', {'code': CODE, 'task_id': self.task.pk},
+                                format='json', **headers)
+
+    def test_ndjson_events(self):
+        response = self._post()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        events = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(events[0], {'type': 'stdout', 'data': 'bereit\n'})
+        self.assertEqual([(event['type'], event['name']) for event in events[1:3]],
+                         [('test', 'AddTest.test_add'), ('test', 'AddTest.test_zero')])
+        result = events[-1]
+        self.assertEqual(result['type'], 'result')
+        self.assertTrue(result['test_results']['success'])
+        self.assertEqual(result['stdout'], 'bereit\n')
+
+    def test_server_sent_events(self):
+        response = self._post(HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = b''.join(response.streaming_content).decode().split('\n\n')
+        self.assertTrue(all(chunk.startswith('data: ') for chunk in chunks if chunk))
+        self.assertEqual(json.loads(chunks[-2][len('data: '):])['type'], 'result')
+
+    def test_invalid_request_is_rejected_before_streaming(self):
+        response = self.client.post('/api/modules/execute/stream/', {'task_id': self.task.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,144 @@
+import threading
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from ..models import Submission, SubmissionCode
+from ..submissions import summarize_result, _write_submissions
+from ..util.batch_writer import BatchWriter
+from .utils import create_task
+
+
+class BatchWriterTests(SimpleTestCase):
+    """Gebündeltes Schreiben im Hintergrund-Thread."""
+
+    def setUp(self):
+        self.batches = []
+
+    def test_flush_writes_pending_entries(self):
+        writer = BatchWriter(self.batches.append, batch_size=10, flush_interval=60)
+        self.assertTrue(writer.submit(1))
+        self.assertTrue(writer.submit(2))
+        self.assertTrue(writer.flush(5))
+        self.assertEqual(self.batches, [[1, 2]])
+        self.assertEqual(writer.written, 2)
+
+    def test_full_batch_is_written_without_flush(self):
+        written = threading.Event()
+        writer = BatchWriter(lambda batch: (self.batches.append(batch), written.set()), batch_size=2, flush_interval=60)
+        writer.submit(1)
+        writer.submit(2)
+        self.assertTrue(written.wait(5))
+        self.assertEqual(self.batches, [[1, 2]])
+
+    def test_entries_are_dropped_when_queue_is_full(self):
+        writing, release = threading.Event(), threading.Event()
+
+        def write_batch(batch):
+            writing.set()
+            release.wait(5)
+
+        writer = BatchWriter(write_batch, batch_size=1, max_queue=1)
+        self.addCleanup(release.set)
+        writer.submit(1)
+        self.assertTrue(writing.wait(5))
+        self.assertTrue(writer.submit(2))
+        self.assertFalse(writer.submit(3))
+        self.assertEqual(writer.dropped, 1)
+
+    def test_failing_batch_does_not_stop_writer(self):
+        def write_batch(batch):
+            if batch == ['kaputt']:
+                raise ValueError('kaputt')
+            self.batches.append(batch)
+
+        writer = BatchWriter(write_batch, batch_size=10, flush_interval=60)
+        writer.submit('kaputt')
+        writer.flush(5)
+        writer.submit('gut')
+        writer.flush(5)
+        self.assertEqual(self.batches, [['gut']])
+        self.assertEqual((writer.dropped, writer.written), (1, 1))
+
+
+class SummarizeResultTests(SimpleTestCase):
+    """Verdichtung der Antwort auf die gespeicherte Zusammenfassung."""
+
+    def test_failed_tests_and_error(self):
+        passed, summary = summarize_result({
+            'stdout': 'viel Ausgabe', 'stderr': 'x' * 3000,
+            'test_results': {
+                'success': False, 'runs': 2, 'failures': [('test_a (Dog.test_a)', 'Traceback')], 'errors': [],
+                'tests': [{'name': 'Dog.test_a', 'status': 'failed'}, {'name': 'Dog.test_b', 'status': 'passed'}],
+            },
+        })
+        self.assertFalse(passed)
+        self.assertEqual(summary['failed_tests'], ['Dog.test_a'])
+        self.assertEqual(summary['tests_run'], 2)
+        self.assertNotIn('error', summary)
+
+    def test_error_is_shortened(self):
+        passed, summary = summarize_result({'success': False, 'error': 'x' * 3000})
+        self.assertFalse(passed)
+        self.assertEqual(len(summary['error']), 2000)
+
+
+class WriteSubmissionsTests(TestCase):
+    """Der Code wird pro Hash nur einmal gespeichert."""
+
+    def test_code_is_deduplicated(self):
+        user = User.objects.create_user('lernende', password='geheim')
+        task = create_task()
+
+        def entry(code):
+            return {
+                'user_id': user.pk, 'task_id': task.pk, 'code_hash': SubmissionCode.hash_code(code), 'code': code,
+                'passed': False, 'summary': {}, 'timings': {}, 'cached': False, 'created_at': timezone.now(),
+            }
+
+        _write_submissions([entry('x = 1'), entry('x = 1')])
+        _write_submissions([entry('x = 1'), entry('x = 2')])
+        self.assertEqual(Submission.objects.count(), 4)
+        self.assertEqual(SubmissionCode.objects.count(), 2)
+        self.assertEqual(Submission.objects.order_by('id').last().code.code, 'x = 2')
+
+
+class SubmissionListViewTests(TestCase):
+    """Keyset-Paginierung der Einreichungslisten."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('lernende', password='geheim')
+        self.other = User.objects.create_user('andere', password='geheim')
+        self.task = create_task()
+        code = SubmissionCode.objects.create(code_hash=SubmissionCode.hash_code('x = 1'),
+                                             compressed_code=SubmissionCode.compress_code('x = 1'), size=5)
+        self.ids = [
+            Submission.objects.create(user=self.user, task=self.task, code=code, passed=False,
+                                      summary={}, created_at=timezone.now()).pk
+            for _ in range(3)
+        ]
+        Submission.objects.create(user=self.other, task=self.task, code=code, passed=True,
+                                  summary={}, created_at=timezone.now())
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_pages_newest_first(self):
+        first = self.client.get('/api/modules/submissions/', {'limit': 2}).json()
+        self.assertEqual([entry['id'] for entry in first['results']], [self.ids[2], self.ids[1]])
+        self.assertEqual(first['next_before'], self.ids[1])
+        self.assertIsNone(first['results'][0]['code'])
+        second = self.client.get('/api/modules/submissions/', {'limit': 2, 'before': first['next_before']}).json()
+        self.assertEqual([entry['id'] for entry in second['results']], [self.ids[0]])
+        self.assertIsNone(second['next_before'])
+
+    def test_code_only_on_request(self):
+        results = self.client.get('/api/modules/submissions/', {'include_code': '1'}).json()['results']
+        self.assertEqual(results[0]['code'], 'x = 1')
+
+    def test_task_list_shows_all_users_only_to_staff(self):
+        url = f'/api/modules/tasks/{self.task.pk}/submissions/'
+        self.assertEqual(len(self.client.get(url).json()['results']), 3)
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(len(self.client.get(url).json()['results']), 4)
+        self.assertEqual(self.client.get('/api/modules/tasks/9999/submissions/').status_code, 404)
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+from django.test import SimpleTestCase
+from ..util.test_registry import TaskTestRegistry, load_test_file
+
+TASK_TESTS = '''
+import unittest
+from unittest import TestCase
+
+
+class DogTest(unittest.TestCase):
+
+    def test_bark(self):
+        pass
+
+    def helper(self):
+        pass
+
+
+class CatTest(TestCase):
+
+    def test_meow(self):
+        pass
+
+
+class NoTests:
+
+    def test_ignored(self):
+        pass
+'''
+
+
+class TaskTestRegistryTests(SimpleTestCase):
+    """Vorkompilierte Testdateien: Zuordnung zu Aufgaben und Neuladen geänderter Dateien."""
+
+    def setUp(self):
+        self.writes = 0
+        self.root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root_dir)
+        self.path = self._write('test_dog.py', TASK_TESTS)
+        self.registry = TaskTestRegistry(self.root_dir, refresh_interval=None)
+        self.discarded = []
+        self.registry.add_change_listener(self.discarded.append)
+
+    def _write(self, name, source):
+        path = os.path.join(self.root_dir, name)
+        with open(path, 'w') as f:
+            f.write(source)
+        # Jeder Schreibvorgang bekommt einen eigenen Änderungszeitpunkt, auch bei grober Zeitauflösung
+        self.writes += 1
+        os.utime(path, (self.writes, self.writes))
+        return path
+
+    def test_load_discovers_test_names_statically(self):
+        entry = load_test_file(self.path)
+        self.assertEqual(entry.test_names, ['DogTest.test_bark', 'CatTest.test_meow'])
+        self.assertEqual(len(entry.digest), 64)
+        self.assertFalse(entry.uses_files)
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            load_test_file(os.path.join(self.root_dir, 'missing.py'))
+
+    def test_path_is_resolved_once_per_task(self):
+        resolved = []
+
+        def resolve():
+            resolved.append(1)
+            return self.path
+
+        self.registry.preload()
+        first = self.registry.get_for_task(1, 'module/test_dog.py', resolve)
+        second = self.registry.get_for_task(1, 'module/test_dog.py', resolve)
+        self.assertIs(first, second)
+        self.assertEqual(len(resolved), 1)
+        # Geänderter Task.test_file_path wird neu aufgelöst
+        self.registry.get_for_task(1, 'module/other.py', resolve)
+        self.assertEqual(len(resolved), 2)
+
+    def test_changed_file_is_reloaded(self):
+        entry = self.registry.get_for_task(1, 'test_dog.py', lambda: self.path)
+        self._write('test_dog.py', TASK_TESTS.replace('test_meow', 'test_purr'))
+        self.registry.refresh()
+        new_entry = self.registry.get_for_task(1, 'test_dog.py', lambda: self.path)
+        self.assertIn('CatTest.test_purr', new_entry.test_names)
+        self.assertEqual(self.discarded, [entry.digest])
+
+    def test_broken_file_keeps_previous_version(self):
+        entry = self.registry.get_for_task(1, 'test_dog.py', lambda: self.path)
+        self._write('test_dog.py', 'class Broken(:\n')
+        self.registry.refresh()
+        self.assertIs(self.registry.get_for_task(1, 'test_dog.py', lambda: self.path), entry)
+        self.assertEqual(self.discarded, [])
+
+    def test_deleted_file_is_removed(self):
+        entry = self.registry.get_for_task(1, 'test_dog.py', lambda: self.path)
+        os.remove(self.path)
+        self.registry.refresh()
+        self.assertEqual(self.discarded, [entry.digest])
+        with self.assertRaises(FileNotFoundError):
+            self.registry.get_for_task(1, 'test_dog.py', lambda: self.path)
@@ -0,0 +1,121 @@
+import unittest
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from .. import submissions
+from ..models import Submission, SubmissionCode
+from ..submissions import record_submission, previous_failed_tests
+from ..util.sandbox_tests import select_tests, run_test_code
+from .utils import create_task
+
+SELECTION_TESTS = '''
+import unittest
+
+
+class FirstTest(unittest.TestCase):
+
+    def test_a(self):
+        pass
+
+    def test_b(self):
+        self.fail('b')
+
+
+class SecondTest(unittest.TestCase):
+
+    def test_c(self):
+        pass
+'''
+
+
+def _suite():
+    namespace = {}
+    exec(compile(SELECTION_TESTS, 'selection_tests.py', 'exec'), namespace)
+    loader = unittest.TestLoader()
+    return unittest.TestSuite([
+        loader.loadTestsFromTestCase(namespace['FirstTest']),
+        loader.loadTestsFromTestCase(namespace['SecondTest']),
+    ])
+
+
+def _names(suite):
+    return [test.id().split('.', 1)[-1] for test in suite]
+
+
+class SelectTestsTests(SimpleTestCase):
+    """Testauswahl und Reihenfolge (failfast, tests, failed_first)."""
+
+    def test_without_options_suite_is_unchanged(self):
+        suite = _suite()
+        self.assertIs(select_tests(suite), suite)
+
+    def test_selection_by_full_or_method_name(self):
+        self.assertEqual(_names(select_tests(_suite(), ['FirstTest.test_b', 'test_c'])),
+                         ['FirstTest.test_b', 'SecondTest.test_c'])
+
+    def test_failed_first_keeps_file_order_within_groups(self):
+        self.assertEqual(_names(select_tests(_suite(), failed_first=['SecondTest.test_c', 'FirstTest.test_b'])),
+                         ['FirstTest.test_b', 'SecondTest.test_c', 'FirstTest.test_a'])
+
+    def test_run_with_selection_is_partial(self):
+        code = compile(SELECTION_TESTS, 'selection_tests.py', 'exec')
+        test_results, _, _ = run_test_code(code, 'selection_tests.py', {}, test_names=['test_a'])
+        self.assertEqual(test_results['runs'], 1)
+        self.assertEqual(test_results['not_run'], 2)
+        self.assertTrue(test_results['partial'])
+        self.assertTrue(test_results['success'])
+
+    def test_failfast_stops_after_first_failure(self):
+        code = compile(SELECTION_TESTS, 'selection_tests.py', 'exec')
+        test_results, _, _ = run_test_code(code, 'selection_tests.py', {}, failfast=True)
+        self.assertEqual(test_results['runs'], 2)
+        self.assertTrue(test_results['partial'])
+        self.assertFalse(test_results['success'])
+
+
+class PreviousFailedTestsTests(TestCase):
+    """failed_first nutzt die zuletzt fehlgeschlagenen Tests, auch bevor das Protokoll geschrieben ist."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('lernende', password='geheim')
+        self.task = create_task()
+        patcher = mock.patch.dict(submissions._recent_failed_tests, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Nichts im Hintergrund schreiben - der Speicher im Prozess muss reichen
+        patcher = mock.patch.object(submissions.submission_writer, 'submit', return_value=True)
+        self.submit = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _response(self, failed):
+        return {
+            'stdout': '', 'stderr': '',
+            'test_results': {
+                'success': not failed, 'runs': 2,
+                'failures': [(name, 'AssertionError') for name in failed], 'errors': [],
+                'tests': [{'name': name, 'status': 'failed', 'duration': 0.0} for name in failed],
+            },
+        }
+
+    def test_latest_submission_is_used_before_it_is_written(self):
+        record_submission(self.user, self.task, 'x = 1', self._response(['DogClassTest.test_class_exists']))
+        self.assertEqual(previous_failed_tests(self.user, self.task), ['DogClassTest.test_class_exists'])
+        record_submission(self.user, self.task, 'x = 2', self._response([]))
+        self.assertEqual(previous_failed_tests(self.user, self.task), [])
+        self.assertEqual(self.submit.call_count, 2)
+
+    def test_falls_back_to_submission_log(self):
+        code = SubmissionCode.objects.create(code_hash=SubmissionCode.hash_code('x = 1'),
+                                             compressed_code=SubmissionCode.compress_code('x = 1'), size=5)
+        Submission.objects.create(user=self.user, task=self.task, code=code, passed=False,
+                                  summary={'failed_tests': ['DogClassTest.test_bark']}, created_at=timezone.now())
+        self.assertEqual(previous_failed_tests(self.user, self.task), ['DogClassTest.test_bark'])
+
+    def test_invalid_test_selection_is_rejected(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/api/modules/execute/', {'code': 'x = 1', 'task_id': self.task.pk, 'tests': 'test_a'},
+                               format='json')
+        self.assertEqual(response.status_code, 400)
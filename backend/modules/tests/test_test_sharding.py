@@ -0,0 +1,237 @@
+import os
+import ast
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase
+from .. import execution
+from ..util.test_registry import load_test_file
+from ..util.test_sharding import TestDurationStats, plan_shards, merge_shard_results
+from ..util.executor_metrics import PhaseTimings
+from ..execution import _execute_sharded, _plan_test_shards
+from ..util.admission import AdmissionController
+from ..util.security_exe import SecurityExecutor
+from .utils import use_test_sandbox_pool
+
+SHARDED_TESTS = '''
+import sys
+import unittest
+
+
+def _double():
+    return getattr(sys.modules.get('__main__'), 'double', None) or globals().get('double')
+
+
+class DoubleTest(unittest.TestCase):
+
+    def test_one(self):
+        self.assertEqual(_double()(1), 2)
+
+    def test_two(self):
+        self.assertEqual(_double()(2), 4)
+
+    def test_three(self):
+        self.assertEqual(_double()(3), 6)
+
+    def test_four(self):
+        self.assertEqual(_double()(4), 8)
+'''
+
+USER_CODE = 'def double(x):\n    return x * 2\n\nprint(double(21))\n'
+
+
+def _summary(names, runs=None, not_run=0, failures=(), duration=0.1):
+    """Testzusammenfassung wie von run_test_code."""
+    return {
+        'runs': len(names) if runs is None else runs,
+        'success': not failures,
+        'errors': [],
+        'failures': list(failures),
+        'tests': [{'name': name, 'status': 'passed', 'duration': duration} for name in names],
+        'duration': duration,
+        'not_run': not_run,
+        'partial': False,
+    }
+
+
+def _result(names, usage=None, **summary_options):
+    return {
+        'success': True,
+        'stdout': 'ausgabe\n',
+        'stderr': '',
+        'test_results': _summary(names, **summary_options),
+        'usage': usage,
+    }
+
+
+class PlanShardsTests(SimpleTestCase):
+    """Aufteilung nach der LPT-Regel."""
+
+    def test_longest_tests_are_spread_over_shards(self):
+        shards = plan_shards({'A.a': 4.0, 'A.b': 3.0, 'A.c': 2.0, 'A.d': 1.0}, max_shards=2)
+        self.assertEqual(shards, [['A.a', 'A.d'], ['A.b', 'A.c']])
+
+    def test_no_sharding_below_threshold(self):
+        self.assertIsNone(plan_shards({'A.a': 0.1, 'A.b': 0.1}, max_shards=4, min_total_seconds=1.0))
+
+    def test_no_sharding_for_single_test_or_worker(self):
+        self.assertIsNone(plan_shards({'A.a': 5.0}, max_shards=4))
+        self.assertIsNone(plan_shards({'A.a': 5.0, 'A.b': 5.0}, max_shards=1))
+
+    def test_shard_count_limited_by_longest_test(self):
+        shards = plan_shards({'A.a': 2.0, 'A.b': 1.0, 'A.c': 1.0, 'A.d': 0.5, 'A.e': 0.5}, max_shards=8)
+        self.assertEqual(len(shards), 3)
+        self.assertEqual(sorted(name for shard in shards for name in shard), ['A.a', 'A.b', 'A.c', 'A.d', 'A.e'])
+
+
+class MergeShardResultsTests(SimpleTestCase):
+    """Zusammenführen der Shard-Ergebnisse."""
+
+    def test_tests_follow_file_order_and_counts_are_summed(self):
+        merged = merge_shard_results(
+            [_result(['A.c', 'A.a'], not_run=2, duration=0.3), _result(['A.b', 'A.d'], not_run=2, duration=0.5)],
+            ['A.a', 'A.b', 'A.c', 'A.d'],
+        )
+        test_results = merged['test_results']
+        self.assertEqual([test['name'] for test in test_results['tests']], ['A.a', 'A.b', 'A.c', 'A.d'])
+        self.assertEqual(test_results['runs'], 4)
+        self.assertEqual(test_results['not_run'], 0)
+        self.assertFalse(test_results['partial'])
+        self.assertEqual(test_results['duration'], 0.5)
+        self.assertEqual(test_results['shards'], 2)
+        self.assertEqual(merged['stdout'], 'ausgabe\n')
+
+    def test_failures_are_collected(self):
+        merged = merge_shard_results(
+            [_result(['A.a'], not_run=1), _result(['A.b'], not_run=1, failures=['A.b: kaputt'])],
+            ['A.a', 'A.b'],
+        )
+        self.assertFalse(merged['test_results']['success'])
+        self.assertEqual(merged['test_results']['failures'], ['A.b: kaputt'])
+
+    def test_partial_when_tests_are_missing(self):
+        merged = merge_shard_results([_result(['A.a'], not_run=2), _result(['A.b'], not_run=2)], ['A.a', 'A.b', 'A.c'])
+        self.assertEqual(merged['test_results']['not_run'], 1)
+        self.assertTrue(merged['test_results']['partial'])
+
+    def test_failed_shard_is_returned(self):
+        failed = {'success': False, 'error': 'Zeitüberschreitung', 'stdout': '', 'stderr': '', 'usage': None}
+        self.assertIs(merge_shard_results([_result(['A.a'], not_run=1), failed], ['A.a', 'A.b']), failed)
+
+    def test_usage_is_merged(self):
+        usage_a = {'cpu_time': 0.5, 'stdout_bytes': 10, 'stderr_bytes': 0, 'peak_memory_mb': 20.0,
+                   'memory_exceeded': False, 'stdout_truncated': False, 'stderr_truncated': False}
+        usage_b = {**usage_a, 'cpu_time': 0.25, 'peak_memory_mb': 30.0, 'stdout_truncated': True}
+        merged = merge_shard_results(
+            [_result(['A.a'], usage=usage_a, not_run=1), _result(['A.b'], usage=usage_b, not_run=1)], ['A.a', 'A.b']
+        )
+        self.assertEqual(merged['usage']['cpu_time'], 0.75)
+        self.assertEqual(merged['usage']['stdout_bytes'], 20)
+        self.assertEqual(merged['usage']['peak_memory_mb'], 30.0)
+        self.assertTrue(merged['usage']['stdout_truncated'])
+
+
+class TestDurationStatsTests(SimpleTestCase):
+    """Gleitende Mittelwerte der Testlaufzeiten."""
+
+    def test_durations_only_when_every_test_ran(self):
+        stats = TestDurationStats(alpha=0.5)
+        stats.record('digest', _summary(['A.a'], not_run=1, duration=1.0))
+        self.assertIsNone(stats.durations('digest'))
+        stats.record('digest', _summary(['A.a', 'A.b'], duration=2.0))
+        self.assertEqual(stats.durations('digest'), {'A.a': 1.5, 'A.b': 2.0})
+
+    def test_least_recently_used_file_is_evicted(self):
+        stats = TestDurationStats(max_files=1)
+        stats.record('first', _summary(['A.a']))
+        stats.record('second', _summary(['A.a']))
+        self.assertIsNone(stats.durations('first'))
+        self.assertIsNotNone(stats.durations('second'))
+
+
+class ShardedExecutionTests(SimpleTestCase):
+    """Ausführung über mehrere Sandbox-Worker."""
+
+    def setUp(self):
+        handle, path = tempfile.mkstemp(suffix='.py', prefix='test_sharded_')
+        with os.fdopen(handle, 'w') as f:
+            f.write(SHARDED_TESTS)
+        self.addCleanup(os.remove, path)
+        self.test_entry = load_test_file(path)
+        self.task = SimpleNamespace(
+            pk=1, id=1, difficulty='Mittel', cpu_time_limit=None, time_limit=None,
+            memory_limit_mb=None, output_limit_bytes=None,
+        )
+        use_test_sandbox_pool(self, size=2)
+
+    def _execute(self, tree):
+        shards = [['DoubleTest.test_one', 'DoubleTest.test_three'], ['DoubleTest.test_two', 'DoubleTest.test_four']]
+        return _execute_sharded(
+            self.task, USER_CODE, self.test_entry, tree, {}, shards, self.test_entry.test_names, PhaseTimings()
+        )
+
+    def test_every_shard_compiles_the_tree(self):
+        # Die Shards teilen sich einen AST - die restricted Kompilierung darf ihn nicht verändern
+        tree = ast.parse(USER_CODE)
+        for _ in range(2):
+            result = self._execute(tree)
+            self.assertTrue(result['success'], result.get('error'))
+            self.assertEqual(result['test_results']['runs'], 4)
+            self.assertTrue(result['test_results']['success'])
+            self.assertEqual(result['test_results']['shards'], 2)
+            self.assertEqual(result['stdout'], '42\n')
+
+    def test_cpu_budget_is_split_and_retried_serially(self):
+        cpu_limits = []
+
+        def execute_secure(executor, code, test_entry=None, tree=None, timings=None, **options):
+            cpu_limits.append(executor.cpu_limit)
+            names = (executor.test_options or {}).get('test_names')
+            if names:
+                # Der Anteil eines Shards reicht nicht
+                usage = {'cpu_time': executor.cpu_limit, 'cpu_limit': executor.cpu_limit, 'cpu_limit_exceeded': True}
+                return {'success': False, 'error': 'CPU-Zeitlimit', 'stdout': '', 'stderr': '', 'usage': usage}
+            return _result(self.test_entry.test_names, usage={'cpu_time': 3.0, 'cpu_limit': executor.cpu_limit})
+
+        with mock.patch.object(SecurityExecutor, 'execute_secure', execute_secure):
+            result = self._execute(ast.parse(USER_CODE))
+        budget = execution.get_execution_limits(self.task)['cpu_time']
+        self.assertEqual(cpu_limits, [budget / 2, budget / 2, budget])
+        self.assertTrue(result['success'])
+        self.assertEqual(result['test_results']['runs'], 4)
+
+    def test_merged_usage_reports_task_budget(self):
+        result = self._execute(ast.parse(USER_CODE))
+        self.assertEqual(result['usage']['cpu_limit'], execution.get_execution_limits(self.task)['cpu_time'])
+
+
+class ShardAdmissionTests(SimpleTestCase):
+    """Weitere Shards nur mit freien Admission-Slots."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self, size=4)
+        self.test_entry = SimpleNamespace(digest='digest')
+        durations = {f'A.test_{index}': 1.0 for index in range(4)}
+        patcher = mock.patch.object(execution.test_durations, 'durations', return_value=durations)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _plan(self, controller):
+        with mock.patch.object(execution, 'admission', controller):
+            return _plan_test_shards(self.test_entry, {}, None)
+
+    def test_shards_limited_by_free_slots(self):
+        controller = AdmissionController(slots=4)
+        controller.acquire(1)
+        controller.acquire(2)
+        shards, _, extra_slots = self._plan(controller)
+        self.assertEqual((len(shards), extra_slots), (3, 2))
+        self.assertEqual(controller.stats()['active'], 4)
+        controller.release_slots(extra_slots)
+        self.assertEqual(controller.stats()['active'], 2)
+
+    def test_serial_without_free_slots(self):
+        controller = AdmissionController(slots=1)
+        controller.acquire(1)
+        self.assertEqual(self._plan(controller), (None, None, 0))
+        self.assertEqual(controller.stats()['active'], 1)
@@ -0,0 +1,136 @@
+import os
+from django.test import SimpleTestCase
+from ..management.commands.benchmark_executor import extract_reference_solution
+from ..util.test_registry import load_test_file
+from ..util.virtual_fs import VirtualFileSystem, safe_import
+from ..util.security_exe import SecurityExecutor
+from .utils import use_test_sandbox_pool, write_test_file
+
+FILE_TESTS = '''
+import os
+import tempfile
+import unittest
+
+
+class WriteFileTest(unittest.TestCase):
+
+    def setUp(self):
+        handle = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        self.path = handle.name
+        handle.close()
+
+    def test_write_and_read(self):
+        write_lines(self.path, ['a', 'b'])
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'a\\nb\\n')
+        # Die Datei wird nicht gelöscht - auf der echten Festplatte bliebe sie liegen
+        self.assertTrue(os.path.isfile(self.path))
+'''
+
+FILE_TASKS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'task_tests', 'module_python_files')
+
+USER_CODE = '''
+def write_lines(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(line + '\\n')
+'''
+
+
+class VirtualFileSystemTests(SimpleTestCase):
+    """Dateien, Verzeichnisse und Größenlimit im Speicher."""
+
+    def setUp(self):
+        self.fs = VirtualFileSystem(max_bytes=16)
+
+    def test_write_read_append(self):
+        with self.fs.open('daten.txt', 'w') as f:
+            f.write('hallo')
+        with self.fs.open('/sandbox/daten.txt', 'a') as f:
+            f.write('!')
+        with self.fs.open('daten.txt') as f:
+            self.assertEqual(f.read(), 'hallo!')
+        with self.fs.open('daten.txt', 'rb') as f:
+            self.assertEqual(f.read(), b'hallo!')
+        self.assertEqual(self.fs.getsize('daten.txt'), 6)
+
+    def test_missing_file_and_directory(self):
+        with self.assertRaises(FileNotFoundError):
+            self.fs.open('fehlt.txt')
+        with self.assertRaises(FileNotFoundError):
+            self.fs.open('ordner/datei.txt', 'w')
+        with self.assertRaises(IsADirectoryError):
+            self.fs.open('/tmp', 'w')
+
+    def test_exclusive_create(self):
+        self.fs.open('datei.txt', 'x').close()
+        with self.assertRaises(FileExistsError):
+            self.fs.open('datei.txt', 'x')
+
+    def test_size_limit(self):
+        with self.assertRaises(OSError):
+            with self.fs.open('gross.txt', 'w') as f:
+                f.write('x' * 17)
+
+    def test_directories(self):
+        self.fs.makedirs('a/b')
+        self.fs.open('a/b/datei.txt', 'w').close()
+        self.assertEqual(self.fs.listdir('a'), ['b'])
+        self.assertEqual(self.fs.listdir('a/b'), ['datei.txt'])
+        self.fs.rmtree('a')
+        self.assertFalse(self.fs.exists('a/b/datei.txt'))
+        self.assertFalse(self.fs.isdir('a'))
+
+    def test_tempfile_module(self):
+        tempfile = self.fs.tempfile_module()
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertTrue(self.fs.isdir(directory))
+            with tempfile.NamedTemporaryFile(mode='w', dir=directory, suffix='.txt') as f:
+                f.write('x')
+            self.assertEqual(len(self.fs.listdir(directory)), 1)
+        self.assertFalse(self.fs.exists(directory))
+
+    def test_user_code_builtins(self):
+        overlay = self.fs.builtins_for_user_code()
+        self.assertIs(overlay['open'].__self__, self.fs)
+        self.assertIs(overlay['IOError'], OSError)
+        for name in ('FileNotFoundError', 'FileExistsError', 'IsADirectoryError', 'ValueError', 'KeyError',
+                     'UnicodeDecodeError'):
+            self.assertIn(name, overlay)
+
+    def test_safe_import_only_allowed_names(self):
+        json = safe_import('json')
+        self.assertEqual(json.dumps([1]), '[1]')
+        self.assertFalse(hasattr(json, 'decoder'))
+        with self.assertRaises(ImportError):
+            safe_import('os')
+
+
+class VirtualFileSystemExecutionTests(SimpleTestCase):
+    """Benutzercode und Tests teilen sich ein Dateisystem im Speicher, die Festplatte bleibt unberührt."""
+
+    def setUp(self):
+        use_test_sandbox_pool(self)
+        self.test_entry = write_test_file(self, FILE_TESTS)
+
+    def test_file_task_runs_in_memory(self):
+        self.assertTrue(self.test_entry.uses_files)
+        before = set(os.listdir('/tmp'))
+        result = SecurityExecutor(timeout=5, virtual_fs=True).execute_secure(USER_CODE, test_entry=self.test_entry)
+        self.assertTrue(result['success'], result.get('error'))
+        self.assertTrue(result['test_results']['success'], result['test_results'])
+        self.assertEqual(set(os.listdir('/tmp')) - before, set())
+
+    def test_reference_solutions_pass(self):
+        for filename in sorted(os.listdir(FILE_TASKS_DIR)):
+            if not filename.endswith('.py'):
+                continue
+            path = os.path.join(FILE_TASKS_DIR, filename)
+            # Die Importe der Lösung stehen oben in der Testdatei, nicht im __main__-Block
+            code = 'import csv\nimport json\n' + extract_reference_solution(path)
+            with self.subTest(filename):
+                result = SecurityExecutor(timeout=5, virtual_fs=True).execute_secure(
+                    code, test_entry=load_test_file(path)
+                )
+                self.assertTrue(result['success'], result.get('error'))
+                self.assertTrue(result['test_results']['success'], result['test_results'])
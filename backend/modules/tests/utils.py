@@ -0,0 +1,41 @@
+import os
+import tempfile
+from unittest import mock
+from ..models import Module, Task
+from ..util import security_exe
+from ..util.sandbox_pool import SandboxWorkerPool
+from ..util.test_registry import load_test_file
+
+
+def use_test_sandbox_pool(test_case, size=1):
+    """
+    Ersetzt den prozessweiten Sandbox-Worker-Pool für die Dauer eines Tests durch einen eigenen
+    Pool mit fork (ohne Zygote) und beendet ihn danach wieder.
+    """
+    pool = SandboxWorkerPool(
+        runner=security_exe._run_pool_job,
+        initializer=security_exe._init_sandbox_worker,
+        should_recycle=security_exe._needs_fresh_worker,
+        size=size,
+        start_method='fork',
+    )
+    test_case.addCleanup(pool.shutdown)
+    patcher = mock.patch.object(security_exe, '_sandbox_pool', pool)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    return pool
+
+
+def write_test_file(test_case, source):
+    """Legt eine temporäre Testdatei an (wird nach dem Test gelöscht) und liefert ihren Registry-Eintrag."""
+    handle, path = tempfile.mkstemp(suffix='.py', prefix='test_task_')
+    with os.fdopen(handle, 'w') as f:
+        f.write(source)
+    test_case.addCleanup(os.remove, path)
+    return load_test_file(path)
+
+
+def create_task(title='Hund', test_file_path='task_tests/module_python_oop/test_dog_class.py', **fields):
+    """Aufgabe (mit Modul) für Tests, standardmäßig mit einer Testdatei aus task_tests."""
+    module, _ = Module.objects.get_or_create(title='Python Grundlagen')
+    return Task.objects.create(module=module, title=title, description=title, test_file_path=test_file_path, **fields)
@@ -17,4 +17,16 @@ urlpatterns = [
 
     # Code Execution View
     path('execute/', views.ExecutePythonCodeView.as_view(), name='execute-python-code'),
+    path('execute/check/', views.CheckPythonCodeView.as_view(), name='check-python-code'),
+    path('execute/session/', views.ExecutePythonSessionView.as_view(), name='execute-python-session'),
+    path('execute/stream/', views.ExecutePythonCodeStreamView.as_view(), name='execute-python-code-stream'),
+    path('execute/metrics/', views.ExecutorMetricsView.as_view(), name='executor-metrics'),
+
+    # Asynchrone Code-Ausführung (Job einreichen / Status abfragen)
+    path('execute/jobs/', views.ExecutionJobSubmitView.as_view(), name='execution-job-submit'),
+    path('execute/jobs/<int:pk>/', views.ExecutionJobStatusView.as_view(), name='execution-job-status'),
+
+    # Einreichungsprotokoll (Keyset-Paginierung über ?before=<id>)
+    path('submissions/', views.SubmissionListView.as_view(), name='submission-list'),
+    path('tasks/<int:task_id>/submissions/', views.TaskSubmissionListView.as_view(), name='task-submission-list'),
 ]
@@ -0,0 +1,131 @@
+import os
+import time
+import threading
+import contextlib
+
+
+class AdmissionRejected(Exception):
+    """
+    Wird ausgelöst, wenn eine Ausführung nicht zugelassen wird.
+
+    Attributes:
+        reason (str): 'user_limit', 'queue_full' oder 'queue_timeout'
+        retry_after (int): Empfohlene Wartezeit in Sekunden bis zum nächsten Versuch
+    """
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Begrenzt die gleichzeitigen Code-Ausführungen eines Prozesses.
+
+    - Globale Slots (Standard: Anzahl CPU-Kerne), damit die Sandboxen die CPU nicht überbuchen
+    - Pro Benutzer höchstens per_user laufende oder wartende Ausführungen
+    - Begrenzte Warteschlange: Ist sie voll oder wird die Wartezeit überschritten, wird die
+      Anfrage sofort abgelehnt, statt alle anderen mit in die Zeitüberschreitung zu ziehen
+    """
+
+    def __init__(self, slots=None, per_user=2, max_queue=None, queue_timeout=5.0, retry_after=2):
+        """
+        Args:
+            slots (int): Gleichzeitig laufende Ausführungen (Standard: Anzahl CPU-Kerne)
+            per_user (int): Maximale laufende oder wartende Ausführungen pro Benutzer
+            max_queue (int): Maximale Anzahl wartender Anfragen (Standard: 4 * slots)
+            queue_timeout (float): Maximale Wartezeit in Sekunden auf einen freien Slot
+            retry_after (int): Wert für den Retry-After-Header bei Ablehnung (Sekunden)
+        """
+        self.slots = slots or os.cpu_count() or 2
+        self.per_user = per_user
+        self.max_queue = max_queue if max_queue is not None else self.slots * 4
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._active = 0
+        self._waiting = 0
+        self._per_user = {}
+        self._condition = threading.Condition()
+
+    def acquire(self, user_key):
+        """
+        Belegt einen Slot für user_key und wartet dafür höchstens queue_timeout Sekunden.
+
+        Returns:
+            float: Wartezeit in Sekunden
+
+        Raises:
+            AdmissionRejected: Wenn Benutzerlimit, Warteschlange oder Wartezeit überschritten sind
+        """
+        started_at = time.monotonic()
+        with self._condition:
+            if self._per_user.get(user_key, 0) >= self.per_user:
+                raise AdmissionRejected('user_limit', self.retry_after)
+            if self._active >= self.slots and self._waiting >= self.max_queue:
+                raise AdmissionRejected('queue_full', self.retry_after)
+
+            self._per_user[user_key] = self._per_user.get(user_key, 0) + 1
+            self._waiting += 1
+            try:
+                deadline = started_at + self.queue_timeout
+                while self._active >= self.slots:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._release_user(user_key)
+                        raise AdmissionRejected('queue_timeout', self.retry_after)
+                    self._condition.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._active += 1
+        return time.monotonic() - started_at
+
+    def release(self, user_key):
+        """Gibt den Slot von user_key wieder frei."""
+        with self._condition:
+            self._active -= 1
+            self._release_user(user_key)
+            self._condition.notify()
+
+    def _release_user(self, user_key):
+        count = self._per_user.get(user_key, 0) - 1
+        if count > 0:
+            self._per_user[user_key] = count
+        else:
+            self._per_user.pop(user_key, None)
+
+    def try_acquire_slots(self, count):
+        """
+        Belegt ohne zu warten bis zu count zusätzliche Slots für eine bereits zugelassene Ausführung
+        (z.B. für weitere Test-Shards). Wartet jemand auf einen Slot, gibt es keine zusätzlichen.
+
+        Returns:
+            int: Anzahl der belegten Slots (mit release_slots wieder freigeben)
+        """
+        with self._condition:
+            if self._waiting:
+                return 0
+            acquired = max(0, min(count, self.slots - self._active))
+            self._active += acquired
+            return acquired
+
+    def release_slots(self, count):
+        """Gibt mit try_acquire_slots belegte Slots wieder frei."""
+        if count <= 0:
+            return
+        with self._condition:
+            self._active -= count
+            self._condition.notify(count)
+
+    @contextlib.contextmanager
+    def admit(self, user_key):
+        """Context-Manager um acquire/release. Liefert die Wartezeit in Sekunden."""
+        waited = self.acquire(user_key)
+        try:
+            yield waited
+        finally:
+            self.release(user_key)
+
+    def stats(self):
+        with self._condition:
+            return {'active': self._active, 'waiting': self._waiting, 'slots': self.slots}
@@ -0,0 +1,121 @@
+import time
+import queue
+import atexit
+import threading
+
+
+class _FlushRequest:
+    """Markierung in der Warteschlange: bisher gesammelte Einträge sofort schreiben."""
+    __slots__ = ('done',)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class BatchWriter:
+    """
+    Sammelt Einträge in einer begrenzten Warteschlange und übergibt sie gebündelt an
+    write_batch(batch) - in einem eigenen Hintergrund-Thread, also außerhalb des Request-Pfads.
+
+    Geschrieben wird, sobald batch_size Einträge gesammelt sind oder flush_interval Sekunden
+    seit dem ersten ungeschriebenen Eintrag vergangen sind. Ist die Warteschlange voll, werden
+    neue Einträge verworfen, statt die Anfrage zu blockieren.
+    """
+
+    def __init__(self, write_batch, batch_size=100, flush_interval=1.0, max_queue=10000, name='batch-writer'):
+        """
+        Args:
+            write_batch (callable): Schreibt eine Liste von Einträgen (z.B. per bulk_create)
+            batch_size (int): Maximale Anzahl Einträge pro Schreibvorgang
+            flush_interval (float): Maximale Verzögerung eines Eintrags in Sekunden
+            max_queue (int): Maximale Anzahl wartender Einträge
+            name (str): Name des Hintergrund-Threads
+        """
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.name = name
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, item):
+        """
+        Reiht einen Eintrag ein, ohne zu blockieren.
+
+        Returns:
+            bool: False, wenn die Warteschlange voll war und der Eintrag verworfen wurde
+        """
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout=10.0):
+        """
+        Schreibt alle bis jetzt eingereihten Einträge und wartet darauf.
+
+        Returns:
+            bool: False, wenn das Schreiben nicht innerhalb von timeout Sekunden abgeschlossen war
+        """
+        if self._thread is None:
+            return True
+        request = _FlushRequest()
+        # Blockiert nur, wenn die Warteschlange voll ist - die Markierung darf nicht verloren gehen
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    def _ensure_thread(self):
+        # Der Thread startet erst beim ersten Eintrag (nicht schon beim Import, z.B. vor einem fork)
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None:
+                # Beim Beenden des Prozesses noch Gesammeltes schreiben
+                atexit.register(self.flush)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            flush_request = None
+            if isinstance(item, _FlushRequest):
+                flush_request = item
+            elif item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch and (flush_request is not None or len(batch) >= self.batch_size
+                          or time.monotonic() >= deadline):
+                self._write(batch)
+                batch = []
+                deadline = None
+            if flush_request is not None:
+                flush_request.done.set()
+
+    def _write(self, batch):
+        try:
+            self.write_batch(batch)
+            self.written += len(batch)
+        except Exception as e:
+            # Ein fehlerhafter Batch darf den Writer-Thread nicht beenden
+            self.dropped += len(batch)
+            print(f"[{self.name}] Fehler beim Schreiben von {len(batch)} Einträgen: {e}")
@@ -0,0 +1,118 @@
+import time
+import threading
+import contextlib
+
+# Obergrenzen der Histogramm-Buckets in Sekunden
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class ExecutorMetrics:
+    """
+    Prozessweite Zähler und Phasen-Histogramme der Code-Ausführung.
+
+    Die Werte gelten pro Django-Prozess (bei mehreren Gunicorn-Workern liefert jeder
+    Worker seine eigenen Werte, die Aggregation übernimmt Prometheus).
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name, amount=1):
+        """Erhöht einen Zähler (z.B. 'timeouts', 'cache_hits')."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, phase, seconds):
+        """Erfasst die Dauer einer Ausführungsphase."""
+        with self._lock:
+            histogram = self._histograms.get(phase)
+            if histogram is None:
+                histogram = self._histograms[phase] = {
+                    'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0
+                }
+            for index, upper_bound in enumerate(self.buckets):
+                if seconds <= upper_bound:
+                    histogram['buckets'][index] += 1
+            histogram['count'] += 1
+            histogram['sum'] += seconds
+
+    def snapshot(self):
+        """Liefert eine Kopie aller Zähler und Histogramme."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                phase: {'buckets': list(h['buckets']), 'count': h['count'], 'sum': h['sum']}
+                for phase, h in self._histograms.items()
+            }
+        return counters, histograms
+
+    def render_prometheus(self, gauges=None):
+        """
+        Gibt alle Metriken im Prometheus-Textformat (Version 0.0.4) aus.
+
+        Args:
+            gauges (dict): Optionale Momentanwerte (Name -> Zahl), z.B. belegte Ausführungs-Slots
+        """
+        counters, histograms = self.snapshot()
+        lines = []
+        for name in sorted(gauges or {}):
+            metric = f"executor_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {gauges[name]}")
+        for name in sorted(counters):
+            metric = f"executor_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {counters[name]}")
+
+        lines.append("# HELP executor_phase_seconds Dauer der einzelnen Ausführungsphasen")
+        lines.append("# TYPE executor_phase_seconds histogram")
+        for phase in sorted(histograms):
+            histogram = histograms[phase]
+            for upper_bound, count in zip(self.buckets, histogram['buckets']):
+                lines.append(f'executor_phase_seconds_bucket{{phase="{phase}",le="{upper_bound}"}} {count}')
+            lines.append(f'executor_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {histogram["count"]}')
+            lines.append(f'executor_phase_seconds_sum{{phase="{phase}"}} {histogram["sum"]:.6f}')
+            lines.append(f'executor_phase_seconds_count{{phase="{phase}"}} {histogram["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+# Prozessweite Instanz
+metrics = ExecutorMetrics()
+
+
+class PhaseTimings:
+    """
+    Phasen-Zeiten einer einzelnen Ausführung. Jede erfasste Phase wird zusätzlich
+    in die prozessweiten Histogramme übernommen.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else metrics
+        self.phases = {}
+
+    def record(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        self.registry.observe(phase, seconds)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Misst die Dauer des umschlossenen Blocks als Phase `name`."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started_at)
+
+    def server_timing(self):
+        """Formatiert die Phasen als Wert für den HTTP-Header `Server-Timing` (Dauer in ms)."""
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items()
+        )
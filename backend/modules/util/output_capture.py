@@ -0,0 +1,94 @@
+import io
+
+
+class OutputBudget:
+    """
+    Gemeinsames Byte-Budget für alle Ausgabe-Puffer eines Streams (z.B. stdout von
+    Benutzercode und Tests einer Ausführung).
+
+    Attributes:
+        limit (int): Maximale Anzahl Bytes, die behalten werden (None = unbegrenzt)
+        kept (int): Bisher behaltene Bytes
+        total (int): Insgesamt geschriebene Bytes (auch die verworfenen)
+    """
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.kept = 0
+        self.total = 0
+        self.marked = False
+
+    @property
+    def truncated(self):
+        return self.total > self.kept
+
+    def take(self, text):
+        """
+        Verbucht text und liefert den Teil, der noch ins Budget passt.
+
+        Returns:
+            tuple: (kept_text, was_cut) - was_cut ist True, wenn text (teilweise) verworfen wurde
+        """
+        size = len(text.encode('utf-8', 'replace'))
+        self.total += size
+        if self.limit is None:
+            self.kept += size
+            return text, False
+        remaining = self.limit - self.kept
+        if size <= remaining:
+            self.kept += size
+            return text, False
+        if remaining <= 0:
+            return '', True
+        # An einer Byte-Grenze abschneiden, ohne ein UTF-8-Zeichen zu zerteilen
+        kept_text = text.encode('utf-8', 'replace')[:remaining].decode('utf-8', 'ignore')
+        self.kept += len(kept_text.encode('utf-8'))
+        return kept_text, True
+
+    def marker(self):
+        return f"\n[... Ausgabe gekürzt: Limit von {self.limit} Bytes erreicht ...]\n"
+
+    def stats(self, prefix):
+        """Byte-Zählung für die Antwort, z.B. {'stdout_bytes': ..., 'stdout_truncated': ...}."""
+        return {
+            f'{prefix}_bytes': self.total,
+            f'{prefix}_truncated': self.truncated,
+            f'{prefix}_limit_bytes': self.limit,
+        }
+
+
+class BoundedOutput(io.TextIOBase):
+    """
+    Ersatz für sys.stdout/sys.stderr in der Sandbox: behält höchstens so viele Bytes,
+    wie das (geteilte) OutputBudget erlaubt, und hängt beim Überschreiten einmalig eine
+    Kürzungsmarkierung an. Mit sink werden Ausgaben direkt weitergereicht (Streaming)
+    statt gesammelt.
+    """
+
+    def __init__(self, budget=None, sink=None):
+        super().__init__()
+        self.budget = budget if budget is not None else OutputBudget()
+        self.sink = sink
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        kept_text, was_cut = self.budget.take(text)
+        if kept_text:
+            self._emit(kept_text)
+        if was_cut and not self.budget.marked:
+            # Markierung nur einmal pro Budget, auch wenn mehrere Puffer es teilen
+            self.budget.marked = True
+            self._emit(self.budget.marker())
+        return len(text)
+
+    def _emit(self, text):
+        if self.sink is not None:
+            self.sink(text)
+        else:
+            self._parts.append(text)
+
+    def getvalue(self):
+        return ''.join(self._parts)
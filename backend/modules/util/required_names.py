@@ -0,0 +1,141 @@
+import ast
+import builtins
+
+# Aufrufe, über die Testdateien den Benutzer-Namensraum nachschlagen
+_NAMESPACE_CALLS = {'globals', 'locals'}
+_BUILTIN_NAMES = frozenset(dir(builtins))
+
+
+def _string_arg(node, index):
+    if len(node.args) > index:
+        arg = node.args[index]
+        if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+            return arg.value
+    return None
+
+
+def _is_namespace_call(node):
+    """globals() bzw. locals()"""
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in _NAMESPACE_CALLS and not node.args)
+
+
+def _refers_to_main_module(node):
+    """sys.modules.get('__main__') bzw. sys.modules['__main__']"""
+    return any(
+        isinstance(child, ast.Constant) and child.value == '__main__'
+        for child in ast.walk(node)
+    )
+
+
+def _looked_up_names(tree):
+    """
+    Namen, die die Testdatei per String im Benutzer-Namensraum nachschlägt:
+    globals().get('x'), 'x' in globals(), getattr/hasattr(sys.modules.get('__main__'), 'x')
+    """
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            func = node.func
+            if (isinstance(func, ast.Attribute) and func.attr == 'get'
+                    and _is_namespace_call(func.value) and _string_arg(node, 0)):
+                names.add(_string_arg(node, 0))
+            elif (isinstance(func, ast.Name) and func.id in ('getattr', 'hasattr')
+                    and _string_arg(node, 1) and _refers_to_main_module(node.args[0])):
+                names.add(_string_arg(node, 1))
+        elif (isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.ops[0], ast.In)
+                and isinstance(node.left, ast.Constant) and isinstance(node.left.value, str)
+                and _is_namespace_call(node.comparators[0])):
+            names.add(node.left.value)
+    return names
+
+
+def _free_names(tree):
+    """Namen, die die Testdatei direkt verwendet, aber nirgends selbst definiert oder importiert."""
+    loaded = set()
+    bound = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            (loaded if isinstance(node.ctx, ast.Load) else bound).add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(node.name)
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                bound.add((alias.asname or alias.name).split('.')[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            bound.add(node.name)
+    return loaded - bound - _BUILTIN_NAMES
+
+
+def discover_required_names(tree):
+    """
+    Ermittelt statisch die Namen, die der Benutzercode für eine Testdatei definieren muss.
+
+    Args:
+        tree (ast.Module): AST der Testdatei
+
+    Returns:
+        tuple: Sortierte Namen (z.B. ('fibonacci_generator',))
+    """
+    names = _looked_up_names(tree) | _free_names(tree)
+    return tuple(sorted(name for name in names if name.isidentifier() and name != '__main__'))
+
+
+def _iter_module_scope(node):
+    """Wie ast.walk, steigt aber nicht in Funktions-, Klassen- und Lambda-Körper ab."""
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        yield current
+        if isinstance(current, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            pending.extend(current.decorator_list)
+        elif not isinstance(current, ast.Lambda):
+            pending.extend(ast.iter_child_nodes(current))
+
+
+def defined_names(tree):
+    """
+    Ermittelt die auf Modulebene definierten Namen des Benutzercodes (def, class, Zuweisungen,
+    Importe, Schleifen- und with-Variablen, auch in if/try-Blöcken sowie per global).
+
+    Returns:
+        set: Die Namen oder None, wenn sie sich nicht statisch bestimmen lassen (Stern-Import)
+    """
+    names = set()
+    for node in _iter_module_scope(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == '*':
+                    return None
+                names.add((alias.asname or alias.name).split('.')[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Global):
+            names.update(node.names)
+    return names
+
+
+def find_missing_names(tree, required_names):
+    """
+    Prüft, ob der Benutzercode alle von den Tests benötigten Namen definiert.
+
+    Args:
+        tree (ast.Module): AST des Benutzercodes
+        required_names (tuple): Benötigte Namen (siehe discover_required_names)
+
+    Returns:
+        list: Fehlende Namen (leer, wenn alle vorhanden sind oder es sich nicht bestimmen lässt)
+    """
+    if not required_names:
+        return []
+    names = defined_names(tree)
+    if names is None:
+        return []
+    return [name for name in required_names if name not in names]
@@ -0,0 +1,200 @@
+import sys
+import math
+import time
+import signal
+import threading
+import contextlib
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class CpuLimitExceeded(BaseException):
+    """
+    Wird in der Sandbox ausgelöst, wenn das CPU-Zeitbudget aufgebraucht ist.
+    Erbt von BaseException, damit `except Exception` im Benutzercode das Limit nicht abfängt.
+    """
+
+
+class WallTimeExceeded(BaseException):
+    """
+    Wird in der Sandbox ausgelöst, wenn die Wall-Clock-Zeit abgelaufen ist (z.B. bei blockierendem
+    Code). Wie CpuLimitExceeded eine BaseException, damit der Benutzercode sie nicht abfängt.
+    """
+
+
+def _raise_cpu_limit(signum, frame):
+    raise CpuLimitExceeded()
+
+
+def _raise_wall_time(signum, frame):
+    raise WallTimeExceeded()
+
+
+def _can_enforce():
+    # RLIMIT_CPU und Signal-Handler nur im Hauptthread eines Sandbox-Prozesses (nicht im Thread-Fallback)
+    return resource is not None and threading.current_thread() is threading.main_thread()
+
+
+@contextlib.contextmanager
+def limit_cpu_time(seconds):
+    """
+    Begrenzt die CPU-Zeit des umschlossenen Blocks und misst den Verbrauch.
+
+    Das Budget wird über einen ITIMER_VIRTUAL-Timer durchgesetzt: er zählt die CPU-Zeit des
+    Prozesses im Benutzermodus und sendet nach genau seconds Sekunden SIGVTALRM, das als
+    CpuLimitExceeded im Benutzercode ankommt (ITIMER_PROF bleibt dem SandboxProfiler vorbehalten).
+    RLIMIT_CPU (weiches Limit: bisheriger Verbrauch des langlebigen Worker-Prozesses plus Budget,
+    auf ganze Sekunden aufgerundet, plus eine Sekunde) ist nur die Notbremse, z.B. für Code, der
+    die Zeit im Kernel verbringt. Über das Ergebnis entscheidet der exakt gemessene Verbrauch
+    (siehe cpu_limit_exceeded) - unabhängig davon, wie ausgelastet der Host ist. Ein Abbruch durch
+    Timer oder Notbremse zählt immer als Überschreitung ('cpu_limit_exceeded'), auch wenn
+    process_time() wegen der gröberen Abrechnung knapp unter dem Budget liegt.
+
+    Args:
+        seconds (float): CPU-Zeitbudget in Sekunden (None = nur messen)
+
+    Yields:
+        dict: {'cpu_time', 'cpu_limit'} - cpu_time wird beim Verlassen des Blocks gesetzt, nach einem
+            Abbruch zusätzlich 'cpu_limit_exceeded'
+    """
+    usage = {'cpu_time': None, 'cpu_limit': seconds}
+    started_at = time.process_time()
+    previous = None
+
+    if seconds and _can_enforce():
+        soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        limit = math.ceil(started_at + seconds) + 1
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        previous_handler = signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+        previous_timer = None
+        if hasattr(signal, 'setitimer'):
+            previous_timer = (signal.signal(signal.SIGVTALRM, _raise_cpu_limit),
+                              signal.setitimer(signal.ITIMER_VIRTUAL, seconds))
+        previous = (soft, hard, previous_handler, previous_timer)
+
+    try:
+        yield usage
+    except CpuLimitExceeded:
+        usage['cpu_limit_exceeded'] = True
+        raise
+    finally:
+        usage['cpu_time'] = round(time.process_time() - started_at, 6)
+        if previous is not None:
+            soft, hard, previous_handler, previous_timer = previous
+            if previous_timer is not None:
+                timer_handler, timer = previous_timer
+                signal.setitimer(signal.ITIMER_VIRTUAL, *timer)
+                signal.signal(signal.SIGVTALRM, timer_handler)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+            signal.signal(signal.SIGXCPU, previous_handler)
+
+
+@contextlib.contextmanager
+def limit_wall_time(seconds):
+    """
+    Bricht den umschlossenen Block nach seconds Sekunden Wall-Clock-Zeit ab (ITIMER_REAL/SIGALRM,
+    als WallTimeExceeded im Benutzercode). So endet eine Zeitüberschreitung im Worker selbst und
+    die bis dahin erfassten Ausgaben bleiben erhalten; das Beenden des Workers durch den
+    Elternprozess ist nur noch die Notbremse.
+
+    Args:
+        seconds (float): Zeitlimit in Sekunden (None = unbegrenzt)
+    """
+    if not seconds or not _can_enforce() or not hasattr(signal, 'setitimer'):
+        yield
+        return
+
+    previous_handler = signal.signal(signal.SIGALRM, _raise_wall_time)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def cpu_limit_exceeded(usage):
+    """Prüft, ob die Ausführung wegen des CPU-Budgets abgebrochen wurde oder es überschritten hat."""
+    if usage.get('cpu_limit_exceeded'):
+        return True
+    return bool(usage['cpu_limit']) and usage['cpu_time'] is not None and usage['cpu_time'] > usage['cpu_limit']
+
+
+def _read_status_kb(field):
+    """Liest einen kB-Wert (z.B. VmSize, VmHWM) aus /proc/self/status, None falls nicht verfügbar."""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """Setzt den Spitzenwert des RSS (VmHWM) zurück. Liefert False, wenn das nicht möglich ist."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb(peak_was_reset):
+    if peak_was_reset:
+        peak_kb = _read_status_kb('VmHWM')
+        if peak_kb is not None:
+            return round(peak_kb / 1024, 2)
+    if resource is None:
+        return None
+    # Fallback: Spitzenwert seit Prozessstart (bei langlebigen Workern ggf. aus früheren Jobs)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS liefert Bytes, Linux Kilobytes
+    return round(max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024, 2)
+
+
+@contextlib.contextmanager
+def limit_memory(limit_mb):
+    """
+    Begrenzt den zusätzlichen Adressraum des umschlossenen Blocks und misst den Spitzen-RSS.
+
+    Das weiche RLIMIT_AS wird auf die aktuelle Größe des Adressraums plus limit_mb gesetzt.
+    Größere Allokationen schlagen dann mit MemoryError fehl, statt den Host in den Swap zu
+    treiben. Der Spitzen-RSS wird vorher über /proc/self/clear_refs zurückgesetzt, damit der
+    gemeldete Wert nur diese Ausführung betrifft.
+
+    Args:
+        limit_mb (int): Speicherlimit in MB (None = nur messen)
+
+    Yields:
+        dict: {'peak_memory_mb', 'memory_limit_mb'} - peak_memory_mb wird beim Verlassen gesetzt
+    """
+    usage = {'peak_memory_mb': None, 'memory_limit_mb': limit_mb}
+    if not _can_enforce():
+        yield usage
+        return
+
+    peak_was_reset = _reset_peak_rss()
+    previous = None
+    vm_size_kb = _read_status_kb('VmSize')
+    if limit_mb and vm_size_kb is not None:
+        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = vm_size_kb * 1024 + int(limit_mb * 1024 * 1024)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        previous = (soft, hard)
+
+    try:
+        yield usage
+    finally:
+        if previous is not None:
+            resource.setrlimit(resource.RLIMIT_AS, previous)
+        usage['peak_memory_mb'] = _peak_rss_mb(peak_was_reset)
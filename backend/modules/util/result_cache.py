@@ -0,0 +1,85 @@
+import ast
+import copy
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ExecutionResultCache:
+    """
+    Inhaltsadressierter LRU-Cache für Ausführungsergebnisse.
+
+    Schlüssel ist (Hash des normalisierten AST des Codes, Hash der Testdatei, Executor-Version).
+    Kommentare, Leerzeilen und Formatierung ändern den Schlüssel daher nicht.
+    Ändert sich eine Testdatei, werden alle Einträge mit dem alten Datei-Hash verworfen
+    (siehe discard_test_digest, aufgerufen von der TaskTestRegistry).
+    """
+
+    def __init__(self, max_entries=1000, ttl=3600):
+        """
+        Args:
+            max_entries (int): Maximale Anzahl Einträge, danach wird der älteste verdrängt (LRU)
+            ttl (int): Gültigkeit eines Eintrags in Sekunden (None = unbegrenzt)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def code_fingerprint(tree):
+        """
+        Hash des normalisierten AST (ohne Positionsangaben).
+
+        Args:
+            tree (ast.Module): Der bereits geparste AST des Codes
+        """
+        normalized = ast.dump(tree, annotate_fields=False, include_attributes=False)
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def make_key(self, tree, test_digest, version):
+        """
+        Baut den Cache-Schlüssel.
+
+        Args:
+            tree (ast.Module): Der geparste Code des Benutzers (vor dem Restricted-Kompilieren,
+                da dieses den AST verändert)
+            test_digest (str): Hash des Inhalts der Testdatei (siehe TaskTestRegistry)
+            version (str): Version der Ausführungsumgebung
+        """
+        return (self.code_fingerprint(tree), test_digest, version)
+
+    def discard_test_digest(self, test_digest):
+        """Verwirft alle Einträge einer geänderten oder gelöschten Testdatei."""
+        with self._lock:
+            stale_keys = [key for key in self._entries if key[1] == test_digest]
+            for key in stale_keys:
+                del self._entries[key]
+
+    def get(self, key):
+        """Liefert eine Kopie des gespeicherten Ergebnisses oder None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(value), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
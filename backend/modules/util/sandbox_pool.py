@@ -0,0 +1,269 @@
+import os
+import sys
+import time
+import queue
+import threading
+import multiprocessing
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class SandboxWorkerPool:
+    """
+    Pool aus langlebigen Sandbox-Worker-Prozessen.
+
+    Statt für jede Ausführung einen neuen Prozess aus dem Django-Worker zu forken,
+    werden die Worker einmalig gestartet, vorinitialisiert (RestrictedPython,
+    Safe-Globals) und nehmen danach Jobs über eine Pipe entgegen.
+    Ein Worker wird ersetzt, wenn er:
+    1. das Timeout eines Jobs überschreitet (Prozess wird beendet)
+    2. eine maximale Anzahl Jobs abgearbeitet hat
+    3. einen Speicher-Schwellwert (RSS) überschreitet
+    4. unerwartet abstürzt
+    5. should_recycle für das Ergebnis eines Jobs True liefert
+    """
+
+    def __init__(self, runner, initializer=None, size=None, max_jobs_per_worker=100,
+                 max_rss_mb=256, acquire_timeout=30, should_recycle=None, start_method=None, preload=None):
+        """
+        Args:
+            runner (callable): Modulweite Funktion runner(job, emit) -> result, die im Worker ausgeführt wird.
+                Über emit(event) können Zwischenereignisse an den Aufrufer gesendet werden.
+            initializer (callable): Optionale Funktion, die beim Start jedes Workers einmal läuft
+            size (int): Anzahl Worker (Standard: Anzahl CPU-Kerne)
+            max_jobs_per_worker (int): Jobs, nach denen ein Worker recycelt wird
+            max_rss_mb (int): RSS-Schwellwert in MB, ab dem ein Worker recycelt wird
+            acquire_timeout (int): Maximale Wartezeit in Sekunden auf einen freien Worker
+            should_recycle (callable): Optional should_recycle(result) -> bool, um einen Worker
+                abhängig vom Ergebnis eines Jobs zu ersetzen (z.B. nach einem MemoryError)
+            start_method (str): multiprocessing-Startmethode der Worker ('forkserver', 'fork', 'spawn';
+                Standard: Voreinstellung der Plattform). Nicht verfügbare Methoden fallen auf die Voreinstellung zurück.
+            preload (list): Module, die der forkserver (Zygote) einmalig importiert, bevor er Worker forkt
+        """
+        self.runner = runner
+        self.initializer = initializer
+        self.size = size or os.cpu_count() or 2
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_rss_mb = max_rss_mb
+        self.acquire_timeout = acquire_timeout
+        self.should_recycle = should_recycle
+        if start_method not in multiprocessing.get_all_start_methods():
+            start_method = None
+        self._context = multiprocessing.get_context(start_method)
+        self.start_method = self._context.get_start_method()
+        if self.start_method == 'forkserver' and preload:
+            self._context.set_forkserver_preload(preload)
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    @property
+    def context(self):
+        """multiprocessing-Kontext der Worker (z.B. für eigene Prozesse aus demselben Zygote)."""
+        return self._context
+
+    def start(self):
+        """Startet alle Worker (idempotent)."""
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.put(self._spawn_worker())
+            self._started = True
+
+    def start_zygote(self):
+        """
+        Startet den forkserver (Zygote) vorab, z.B. beim Start des Web-Workers, damit die erste
+        Ausführung nicht auf dessen Imports warten muss. Ohne forkserver ohne Wirkung.
+        """
+        if self.start_method == 'forkserver':
+            from multiprocessing import forkserver
+            forkserver.ensure_running()
+
+    def _spawn_worker(self):
+        return spawn_worker(self._context, self.runner, self.initializer)
+
+    def _release(self, worker, rss_mb=None, result=None):
+        """Gibt einen Worker zurück in den Pool oder ersetzt ihn bei Bedarf."""
+        worker.jobs_done += 1
+        recycle = (
+            worker.jobs_done >= self.max_jobs_per_worker
+            or (rss_mb is not None and self.max_rss_mb and rss_mb > self.max_rss_mb)
+            or (self.should_recycle is not None and self.should_recycle(result))
+        )
+        if recycle:
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+
+    def _replace(self, worker):
+        worker.kill()
+        if not self._closed:
+            self._idle.put(self._spawn_worker())
+
+    def execute(self, job, timeout, on_event=None, phases=None):
+        """
+        Führt einen Job in einem freien Worker aus.
+
+        Args:
+            job: Picklebares Job-Objekt, das an runner(job, emit) übergeben wird
+            timeout (float): Timeout in Sekunden für die Ausführung
+            on_event (callable): Optionaler Empfänger für Zwischenereignisse des Workers
+            phases (dict): Optional, erhält die Wartezeit auf einen Worker ('pool_wait') und die
+                Dauer vom Senden des Jobs bis zum Ergebnis ('sandbox') in Sekunden
+
+        Returns:
+            tuple: (status, result) - status ist 'ok', 'timeout', 'crashed' oder 'busy'
+
+        Raises:
+            Exception: Fehler beim Senden des Jobs oder aus on_event; der Worker wird vorher ersetzt
+        """
+        phases = phases if phases is not None else {}
+        self.start()
+        started_at = time.perf_counter()
+        try:
+            worker = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            return 'busy', None
+        finally:
+            phases['pool_wait'] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        try:
+            status, result, rss_mb = worker.run(job, timeout, on_event)
+        except BaseException:
+            # z.B. nicht picklebarer Job oder Fehler in on_event: der Zustand der Pipe ist
+            # unbekannt, daher den Worker ersetzen statt ihn aus dem Pool zu verlieren
+            self._replace(worker)
+            raise
+        if status != 'ok':
+            # Zeitüberschreitung oder Absturz: Worker beenden und ersetzen
+            self._replace(worker)
+            return status, None
+
+        phases['sandbox'] = time.perf_counter() - started_at
+        self._release(worker, rss_mb, result)
+        return 'ok', result
+
+    def shutdown(self):
+        """Beendet alle Worker des Pools."""
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    worker = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                worker.stop()
+            self._started = False
+
+
+class _SandboxWorker:
+    """Handle auf einen einzelnen Worker-Prozess im Elternprozess."""
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.jobs_done = 0
+
+    def run(self, job, timeout, on_event=None):
+        """
+        Sendet einen Job an den Worker und wartet auf das Ergebnis.
+
+        Returns:
+            tuple: (status, result, rss_mb) - status ist 'ok', 'timeout' oder 'crashed'. Bei
+                'timeout' und 'crashed' ist der Worker nicht mehr verwendbar.
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            self.conn.send(job)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.conn.poll(remaining):
+                    return 'timeout', None, None
+                message = self.conn.recv()
+                if message[0] == 'event':
+                    if on_event is not None:
+                        on_event(message[1])
+                    continue
+                _, result, rss_mb = message
+                return 'ok', result, rss_mb
+        except (EOFError, OSError, BrokenPipeError):
+            # Worker ist abgestürzt (z.B. durch Signal)
+            return 'crashed', None, None
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def spawn_worker(context, runner, initializer=None):
+    """
+    Startet einen einzelnen Worker-Prozess (siehe _worker_main).
+
+    Args:
+        context: multiprocessing-Kontext (bestimmt die Startmethode, z.B. forkserver)
+        runner (callable): Modulweite Funktion runner(job, emit) -> result
+        initializer (callable): Optionale Funktion, die beim Start des Workers einmal läuft
+    """
+    parent_conn, child_conn = context.Pipe()
+    process = context.Process(
+        target=_worker_main,
+        args=(child_conn, runner, initializer),
+        daemon=True,
+    )
+    process.start()
+    # Das Kind-Ende wird im Elternprozess nicht benötigt
+    child_conn.close()
+    return _SandboxWorker(process, parent_conn)
+
+
+def _current_rss_mb():
+    """
+    Liefert den aktuellen RSS des Prozesses in MB (Linux: /proc, sonst Peak via getrusage).
+    Ohne beides (Windows) None, der Worker wird dann nicht nach RSS recycelt.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        if resource is None:
+            return None
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS liefert Bytes, Linux Kilobytes
+        return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+def _worker_main(conn, runner, initializer):
+    """Hauptschleife eines Worker-Prozesses: Jobs empfangen, ausführen, Ergebnis senden."""
+    if initializer is not None:
+        initializer()
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            # Elternprozess ist weg
+            break
+        if job is None:
+            break
+        result = runner(job, lambda event: conn.send(('event', event)))
+        try:
+            conn.send(('result', result, _current_rss_mb()))
+        except (OSError, BrokenPipeError):
+            break
@@ -0,0 +1,118 @@
+import time
+import signal
+import threading
+import tracemalloc
+from collections import Counter
+
+# Dateiname, unter dem der Benutzercode kompiliert wird (siehe SecurityExecutor.compile_checked)
+USER_CODE_FILENAME = '<string>'
+
+
+class SandboxProfiler:
+    """
+    Profil einer Ausführung in der Sandbox (Profil-Modus): Stichproben der CPU-Zeit pro Funktion
+    des Benutzercodes und Speicher-Spitzen über tracemalloc.
+
+    Ein SIGPROF-Timer (ITIMER_PROF, zählt CPU-Zeit des Prozesses) unterbricht die Ausführung alle
+    interval Sekunden; gezählt wird die innerste Funktion des Benutzercodes im Stack. Der Aufwand
+    ist begrenzt: nach max_samples Stichproben oder sobald die Ausführung cpu_budget Sekunden
+    CPU-Zeit verbraucht hat, werden Timer und tracemalloc abgeschaltet ('truncated'), der Rest
+    läuft ohne Profiling weiter. So bleibt genug vom CPU-Budget der Aufgabe für den Code selbst.
+    """
+
+    def __init__(self, interval=0.005, max_samples=10000, cpu_budget=None, filename=USER_CODE_FILENAME):
+        """
+        Args:
+            interval (float): Abstand der Stichproben in Sekunden CPU-Zeit
+            max_samples (int): Maximale Anzahl Stichproben
+            cpu_budget (float): CPU-Zeit in Sekunden, nach der das Profiling endet (None = unbegrenzt)
+            filename (str): Dateiname des Benutzercodes (nur dessen Funktionen werden gezählt)
+        """
+        self.interval = interval
+        self.max_samples = max_samples
+        self.cpu_budget = cpu_budget
+        self.filename = filename
+        self.samples = Counter()
+        self.total_samples = 0
+        self.truncated = False
+        self.peak_memory_kb = None
+        self._sampling = False
+        self._previous_handler = None
+        self._started_at = None
+
+    def start(self):
+        """Startet Stichproben und tracemalloc (Stichproben nur im Hauptthread unter Unix)."""
+        self._started_at = time.process_time()
+        tracemalloc.start()
+        if hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread():
+            self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            self._sampling = True
+
+    def stop(self):
+        """Beendet das Profiling (idempotent)."""
+        self._stop_sampling()
+        self._stop_tracing()
+
+    def _stop_sampling(self):
+        if self._sampling:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+            self._sampling = False
+
+    def _stop_tracing(self):
+        if tracemalloc.is_tracing():
+            self._record_peak()
+            tracemalloc.stop()
+
+    def _record_peak(self):
+        peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        self.peak_memory_kb = max(self.peak_memory_kb or 0.0, peak_kb)
+
+    def test_started(self):
+        """Setzt die Speicher-Spitze für den nächsten Test zurück (die bisherige bleibt in peak_memory_kb)."""
+        if tracemalloc.is_tracing():
+            self._record_peak()
+            tracemalloc.reset_peak()
+
+    def test_peak_kb(self):
+        """Speicher-Spitze seit test_started in KB (None, wenn das Profiling bereits beendet ist)."""
+        if not tracemalloc.is_tracing():
+            return None
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+
+    def _sample(self, signum, frame):
+        self.total_samples += 1
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename == self.filename:
+                self.samples[(code.co_name, code.co_firstlineno)] += 1
+                break
+            frame = frame.f_back
+        if self.total_samples >= self.max_samples or (
+                self.cpu_budget and time.process_time() - self._started_at > self.cpu_budget):
+            self.truncated = True
+            self.stop()
+
+    def report(self, top_n=10):
+        """
+        Returns:
+            dict: 'samples' (gesamt), 'interval', 'truncated', 'peak_memory_kb' und 'top_functions' -
+                die top_n Funktionen des Benutzercodes mit 'function', 'line', 'samples' und 'share'
+                (Anteil an allen Stichproben)
+        """
+        return {
+            'samples': self.total_samples,
+            'interval': self.interval,
+            'truncated': self.truncated,
+            'peak_memory_kb': self.peak_memory_kb,
+            'top_functions': [
+                {
+                    'function': name,
+                    'line': line,
+                    'samples': count,
+                    'share': round(count / self.total_samples, 4),
+                }
+                for (name, line), count in self.samples.most_common(top_n)
+            ],
+        }
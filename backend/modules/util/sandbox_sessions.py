@@ -0,0 +1,243 @@
+import time
+import threading
+
+
+class SessionLimitReached(Exception):
+    """
+    Es kann keine neue Sitzung angelegt werden.
+
+    Attributes:
+        reason (str): 'max_sessions' (global ausgeschöpft) oder 'user_limit' (Sitzungen des Benutzers)
+    """
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class SandboxSession:
+    """
+    Eine interaktive Sitzung: ein eigener, warmer Sandbox-Worker, dessen Interpreter-Zustand
+    (Variablen, Funktionen, Importe) zwischen den Zellen erhalten bleibt.
+    """
+
+    def __init__(self, key, worker=None):
+        self.key = key
+        # Bis der Worker gestartet ist (ready), reserviert die Sitzung nur ihren Platz
+        self.worker = worker
+        self.ready = threading.Event()
+        if worker is not None:
+            self.ready.set()
+        self.cells = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        # Zellen einer Sitzung laufen nacheinander
+        self.lock = threading.Lock()
+
+    def kill(self):
+        """Beendet den Worker, sobald er gestartet ist."""
+        self.ready.wait()
+        if self.worker is not None:
+            self.worker.kill()
+
+    def idle_for(self, now=None):
+        return (now or time.monotonic()) - self.last_used
+
+
+class SandboxSessionManager:
+    """
+    Verwaltet interaktive Sandbox-Sitzungen (REPL-Modus), eine pro Schlüssel (z.B. Benutzer und Aufgabe).
+
+    Jede Sitzung besitzt einen eigenen Worker-Prozess, der nur die jeweils neue Zelle ausführt.
+    Eine Sitzung endet:
+    1. nach idle_ttl Sekunden ohne Zelle (Hintergrund-Thread, alle reap_interval Sekunden)
+    2. nach max_cells Zellen
+    3. wenn der Worker mehr als max_rss_mb Speicher belegt oder should_close(result) True liefert
+    4. bei Zeitüberschreitung oder Absturz des Workers (der Zustand ist dann verloren)
+    """
+
+    def __init__(self, spawn, max_sessions=16, per_user=1, max_cells=200, idle_ttl=300,
+                 max_rss_mb=256, reap_interval=30, should_close=None):
+        """
+        Args:
+            spawn (callable): Startet einen Worker für eine neue Sitzung (siehe sandbox_pool.spawn_worker)
+            max_sessions (int): Maximale Anzahl gleichzeitiger Sitzungen im Prozess
+            per_user (int): Maximale Anzahl Sitzungen pro Benutzer (erstes Element des Schlüssels)
+            max_cells (int): Zellen, nach denen eine Sitzung beendet wird
+            idle_ttl (int): Sekunden ohne Zelle, nach denen eine Sitzung beendet wird
+            max_rss_mb (int): RSS-Schwellwert des Workers in MB, ab dem die Sitzung beendet wird
+            reap_interval (int): Sekunden zwischen zwei Prüfungen auf abgelaufene Sitzungen
+            should_close (callable): Optional should_close(result) -> bool, um eine Sitzung abhängig
+                vom Ergebnis einer Zelle zu beenden (z.B. nach einem MemoryError)
+        """
+        self.spawn = spawn
+        self.max_sessions = max_sessions
+        self.per_user = per_user
+        self.max_cells = max_cells
+        self.idle_ttl = idle_ttl
+        self.max_rss_mb = max_rss_mb
+        self.reap_interval = reap_interval
+        self.should_close = should_close
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    def execute(self, key, job, timeout, on_event=None):
+        """
+        Führt eine Zelle in der Sitzung zu key aus und legt die Sitzung bei Bedarf an.
+
+        Args:
+            key (tuple): (Benutzer, Bereich), z.B. (user.pk, task.pk)
+            job (dict): Ausführungsauftrag für den Worker
+            timeout (float): Maximale Laufzeit der Zelle in Sekunden
+            on_event (callable): Optionaler Empfänger für Zwischenereignisse aus dem Worker
+
+        Returns:
+            tuple: (status, result, info) - status ist 'ok', 'timeout', 'crashed' oder 'busy' (es läuft
+                bereits eine Zelle dieser Sitzung), info beschreibt die Sitzung (siehe _info)
+
+        Raises:
+            SessionLimitReached: Wenn keine neue Sitzung angelegt werden kann
+        """
+        self._ensure_reaper()
+        session, created = self._get_or_create(key)
+        if not session.lock.acquire(blocking=False):
+            return 'busy', None, self._info(session, created)
+        try:
+            status, result, rss_mb = session.worker.run(job, timeout, on_event)
+            session.cells += 1
+            session.last_used = time.monotonic()
+
+            ended = None
+            if status != 'ok':
+                ended = status
+            elif self.should_close is not None and self.should_close(result):
+                ended = 'memory_exceeded'
+            elif rss_mb is not None and rss_mb > self.max_rss_mb:
+                ended = 'max_rss'
+            elif session.cells >= self.max_cells:
+                ended = 'max_cells'
+            if ended is not None:
+                self._remove(session, kill=status != 'ok')
+            return status, result, self._info(session, created, ended)
+        finally:
+            session.lock.release()
+
+    def close(self, key):
+        """
+        Beendet die Sitzung zu key.
+
+        Returns:
+            bool: False, wenn es keine Sitzung gab
+        """
+        with self._lock:
+            session = self._sessions.pop(key, None)
+        if session is None:
+            return False
+        session.kill()
+        return True
+
+    def info(self, key):
+        """Liefert die Beschreibung der Sitzung zu key oder None, wenn es keine gibt."""
+        with self._lock:
+            session = self._sessions.get(key)
+        return self._info(session) if session is not None else None
+
+    def reap(self):
+        """
+        Beendet alle Sitzungen, die länger als idle_ttl Sekunden unbenutzt waren.
+
+        Returns:
+            int: Anzahl beendeter Sitzungen
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                session for session in self._sessions.values()
+                if session.ready.is_set() and session.idle_for(now) > self.idle_ttl and not session.lock.locked()
+            ]
+            for session in expired:
+                del self._sessions[session.key]
+        for session in expired:
+            session.kill()
+        return len(expired)
+
+    def shutdown(self):
+        """Beendet alle Sitzungen."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.kill()
+
+    def stats(self):
+        with self._lock:
+            return {'sessions': len(self._sessions), 'max_sessions': self.max_sessions}
+
+    def _get_or_create(self, key):
+        while True:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    if len(self._sessions) >= self.max_sessions:
+                        raise SessionLimitReached('max_sessions')
+                    if sum(1 for other in self._sessions if other[0] == key[0]) >= self.per_user:
+                        raise SessionLimitReached('user_limit')
+                    # Der Platzhalter zählt für die Limits und lässt eine gleichzeitige Zelle derselben
+                    # Sitzung auf diesen Worker warten - gestartet wird er außerhalb des Locks
+                    session = self._sessions[key] = SandboxSession(key)
+                    break
+            session.ready.wait()
+            if session.worker is not None:
+                return session, False
+            # Der Start ist fehlgeschlagen und der Platzhalter entfernt - erneut versuchen
+
+        try:
+            session.worker = self.spawn()
+        except BaseException:
+            with self._lock:
+                if self._sessions.get(key) is session:
+                    del self._sessions[key]
+            raise
+        finally:
+            session.ready.set()
+        return session, True
+
+    def _remove(self, session, kill=False):
+        with self._lock:
+            if self._sessions.get(session.key) is session:
+                del self._sessions[session.key]
+        if kill:
+            session.worker.kill()
+        else:
+            session.worker.stop()
+
+    def _info(self, session, created=False, ended=None):
+        """Beschreibung einer Sitzung für die Antwort an den Client."""
+        return {
+            'created': created,
+            'cells': session.cells,
+            'max_cells': self.max_cells,
+            'idle_ttl': self.idle_ttl,
+            'age': round(time.monotonic() - session.created_at, 3),
+            # Grund, falls die Sitzung mit dieser Zelle beendet wurde
+            'ended': ended,
+        }
+
+    def _ensure_reaper(self):
+        # Der Thread startet erst mit der ersten Sitzung (nicht schon beim Import, z.B. vor einem fork)
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        with self._lock:
+            if self._reaper is None or not self._reaper.is_alive():
+                self._reaper = threading.Thread(target=self._reap_loop, name='sandbox-session-reaper', daemon=True)
+                self._reaper.start()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(self.reap_interval)
+            try:
+                self.reap()
+            except Exception as e:
+                # Ein Fehler beim Aufräumen darf den Thread nicht beenden
+                print(f"[sandbox-sessions] Fehler beim Beenden abgelaufener Sitzungen: {e}")
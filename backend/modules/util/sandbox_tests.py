@@ -0,0 +1,202 @@
+import io
+import sys
+import time
+import types
+import marshal
+import unittest
+from .resource_limits import CpuLimitExceeded, WallTimeExceeded
+
+# Bereits geladene Test-Code-Objekte pro Worker-Prozess (Digest -> Code-Objekt)
+_loaded_test_code = {}
+_LOADED_TEST_CODE_LIMIT = 256
+
+
+def _test_name(test):
+    """"Klasse.methode" eines Testfalls ohne den synthetischen Modulnamen."""
+    return '.'.join(test.id().split('.')[-2:])
+
+
+class TestResultCollector(unittest.TestResult):
+    """
+    Schlankes TestResult, das Status und Laufzeit jedes einzelnen Tests erfasst.
+
+    Ersetzt TextTestRunner/TextTestResult: es wird kein Fortschrittstext formatiert, nur die
+    Tracebacks fehlgeschlagener Tests (wie bei unittest.TestResult). Mit failfast endet der
+    Lauf nach dem ersten Fehlschlag oder Fehler. Mit einem profiler (Profil-Modus) werden pro
+    Test zusätzlich CPU-Zeit und Speicher-Spitze erfasst.
+
+    unittest fängt auch BaseExceptions eines Tests ab. Ein Abbruch durch CPU- oder Zeitlimit
+    beendet deshalb hier den ganzen Lauf und wird in aborted festgehalten (siehe run_test_code).
+    """
+
+    def __init__(self, on_test=None, failfast=False, profiler=None):
+        super().__init__()
+        self.failfast = failfast
+        self.on_test = on_test
+        self.profiler = profiler
+        self.test_timings = []
+        self.aborted = None
+        self._started_at = None
+        self._cpu_started_at = None
+        self._current_status = None
+
+    def startTest(self, test):
+        if self.profiler is not None:
+            self.profiler.test_started()
+            self._cpu_started_at = time.process_time()
+        self._started_at = time.perf_counter()
+        self._current_status = 'passed'
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        timing = {
+            'name': _test_name(test),
+            'status': self._current_status,
+            'duration': round(time.perf_counter() - self._started_at, 6),
+        }
+        if self.profiler is not None:
+            timing['cpu_time'] = round(time.process_time() - self._cpu_started_at, 6)
+            timing['peak_memory_kb'] = self.profiler.test_peak_kb()
+        self.test_timings.append(timing)
+        if self.on_test is not None:
+            self.on_test(timing)
+
+    def addError(self, test, err):
+        self._current_status = 'error'
+        if issubclass(err[0], (CpuLimitExceeded, WallTimeExceeded)):
+            if self.aborted is None:
+                self.aborted = err[1]
+            self.stop()
+            return
+        super().addError(test, err)
+
+    def addFailure(self, test, err):
+        self._current_status = 'failed'
+        super().addFailure(test, err)
+
+    def addSkip(self, test, reason):
+        self._current_status = 'skipped'
+        super().addSkip(test, reason)
+
+
+def _iter_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
+        else:
+            yield test
+
+
+def select_tests(suite, test_names=None, failed_first=None):
+    """
+    Wählt Tests einer Suite aus und ordnet sie neu.
+
+    Args:
+        suite (unittest.TestSuite): Alle Tests der Testdatei
+        test_names (list): Optional nur diese Tests ausführen ("Klasse.methode" oder "methode")
+        failed_first (list): Optional diese Tests ("Klasse.methode") zuerst ausführen, z.B. die
+            bei der letzten Einreichung fehlgeschlagenen
+
+    Returns:
+        unittest.TestSuite: Die ausgewählten Tests (die Suite selbst, wenn nichts zu tun ist)
+    """
+    if not test_names and not failed_first:
+        return suite
+    tests = list(_iter_tests(suite))
+    if test_names:
+        wanted = set(test_names)
+        tests = [test for test in tests if _test_name(test) in wanted or _test_name(test).split('.')[-1] in wanted]
+    if failed_first:
+        first = set(failed_first)
+        # sort ist stabil: innerhalb beider Gruppen bleibt die Reihenfolge der Testdatei erhalten
+        tests.sort(key=lambda test: _test_name(test) not in first)
+    return unittest.TestSuite(tests)
+
+
+def load_test_code(test_code_bytes, test_digest):
+    """
+    Deserialisiert ein vorkompiliertes Test-Code-Objekt. Pro Worker wird jede
+    Testdatei-Version nur einmal geladen.
+    """
+    code = _loaded_test_code.get(test_digest)
+    if code is None:
+        if len(_loaded_test_code) >= _LOADED_TEST_CODE_LIMIT:
+            _loaded_test_code.clear()
+        code = marshal.loads(test_code_bytes)
+        _loaded_test_code[test_digest] = code
+    return code
+
+
+def run_test_code(test_code, test_filename, user_namespace, on_test=None, stdout=None, stderr=None, builtins=None,
+                  failfast=False, test_names=None, failed_first=None, profiler=None):
+    """
+    Lädt eine vorkompilierte Testdatei in ein frisches Modul, injiziert die Definitionen
+    des Benutzers und führt alle enthaltenen unittest-Fälle aus.
+
+    Args:
+        test_code: Kompiliertes Code-Objekt der Testdatei
+        test_filename (str): Dateiname (für Tracebacks)
+        user_namespace (dict): Vom Benutzercode definierte Namen
+        on_test (callable): Optionaler Callback, der nach jedem Test mit Name, Status und Dauer aufgerufen wird
+        stdout: Optionaler Puffer (mit getvalue()) für die Standardausgabe, z.B. ein BoundedOutput
+        stderr: Optionaler Puffer (mit getvalue()) für die Fehlerausgabe
+        builtins (dict): Optionale Builtins für das Testmodul (z.B. mit open des virtuellen Dateisystems)
+        failfast (bool): Nach dem ersten fehlgeschlagenen Test abbrechen
+        test_names (list): Optional nur diese Tests ausführen (siehe select_tests)
+        failed_first (list): Optional diese Tests zuerst ausführen (siehe select_tests)
+        profiler (SandboxProfiler): Optional, erfasst pro Test CPU-Zeit und Speicher-Spitze
+
+    Returns:
+        tuple: (test_results, stdout, stderr) - test_results ist eine kompakte, serialisierbare
+            Zusammenfassung. 'not_run' zählt die nicht ausgeführten Tests (Auswahl oder failfast),
+            'partial' ist dann True und 'success' gilt nur für die ausgeführten Tests.
+
+    Raises:
+        CpuLimitExceeded, WallTimeExceeded: Wenn ein Test das CPU- oder Zeitlimit erreicht hat
+    """
+    test_module = types.ModuleType('task_test_module')
+    test_module.__file__ = test_filename
+    if builtins is not None:
+        test_module.__builtins__ = builtins
+    # Benutzerdefinitionen im Modul-Scope verfügbar machen, bevor die Tests geladen werden
+    test_module.__dict__.update(user_namespace)
+
+    old_stdout = sys.stdout
+    old_stderr = sys.stderr
+    redirected_output = stdout if stdout is not None else io.StringIO()
+    redirected_error = stderr if stderr is not None else io.StringIO()
+    sys.stdout = redirected_output
+    sys.stderr = redirected_error
+
+    started_at = time.perf_counter()
+    try:
+        exec(test_code, test_module.__dict__)
+        suite = unittest.defaultTestLoader.loadTestsFromModule(test_module)
+        total = suite.countTestCases()
+        suite = select_tests(suite, test_names, failed_first)
+
+        result = TestResultCollector(on_test=on_test, failfast=failfast, profiler=profiler)
+        result.startTestRun()
+        try:
+            suite(result)
+        finally:
+            result.stopTestRun()
+    finally:
+        sys.stdout = old_stdout
+        sys.stderr = old_stderr
+
+    if result.aborted is not None:
+        raise result.aborted
+
+    test_results = {
+        "runs": result.testsRun,
+        "success": result.wasSuccessful(),
+        "errors": [(str(test), err) for test, err in result.errors],
+        "failures": [(str(test), fail) for test, fail in result.failures],
+        "tests": result.test_timings,
+        "duration": round(time.perf_counter() - started_at, 6),
+        "not_run": total - result.testsRun,
+        "partial": result.testsRun < total,
+    }
+    return test_results, redirected_output.getvalue(), redirected_error.getvalue()
@@ -0,0 +1,40 @@
+"""
+Vorgeladenes Modul des Sandbox-Zygoten (multiprocessing-forkserver). Wird nur im Zygote
+importiert, nie im Django-Prozess.
+
+Der Zygote ist ein schlanker Prozess ohne Django: er importiert nur dieses Modul (und damit
+RestrictedPython, unittest und den Executor) und forkt daraus die Sandbox-Worker. Die Worker
+erben so weder Datenbankverbindungen noch Locks oder die Seitentabellen des Django-Prozesses,
+und müssen trotzdem nichts neu importieren.
+
+Der Import hat bewusst Nebenwirkungen: Er wärmt RestrictedPython vor und lädt alle Testdateien
+unterhalb von task_tests in den Test-Code-Cache (siehe load_test_code), den die Worker per
+Copy-on-Write übernehmen.
+"""
+import os
+from .security_exe import SecurityExecutor
+from .sandbox_tests import _loaded_test_code, _LOADED_TEST_CODE_LIMIT
+from .test_registry import load_test_file
+
+TASK_TESTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'task_tests')
+
+
+def preload_test_code(root_dir=TASK_TESTS_DIR):
+    """Kompiliert alle Testdateien unterhalb von root_dir in den Test-Code-Cache des Prozesses."""
+    for directory, _, filenames in os.walk(root_dir):
+        for filename in filenames:
+            if not filename.endswith('.py') or len(_loaded_test_code) >= _LOADED_TEST_CODE_LIMIT:
+                continue
+            try:
+                entry = load_test_file(os.path.join(directory, filename))
+            except (OSError, SyntaxError):
+                continue
+            _loaded_test_code[entry.digest] = entry.code
+
+
+def _warm_up():
+    SecurityExecutor(use_pool=False).run_restricted("warmup = sum(range(10))")
+    preload_test_code()
+
+
+_warm_up()
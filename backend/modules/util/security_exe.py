@@ -10,21 +10,138 @@ import platform
 import signal
 import warnings
 import re
-from RestrictedPython import compile_restricted, safe_globals
-from RestrictedPython.Guards import guarded_setattr, safe_builtins
+import pickle
+import marshal
+from types import MappingProxyType
+from RestrictedPython import compile_restricted, compile_restricted_exec, safe_globals
+from RestrictedPython.Guards import guarded_setattr, safe_builtins, guarded_iter_unpack_sequence, guarded_unpack_sequence
 from RestrictedPython.PrintCollector import PrintCollector
+from .sandbox_pool import SandboxWorkerPool, spawn_worker
+from .sandbox_sessions import SandboxSessionManager
+from .sandbox_tests import load_test_code, run_test_code
+from .test_registry import load_test_file
+from .resource_limits import (
+    CpuLimitExceeded, WallTimeExceeded, limit_cpu_time, limit_wall_time, cpu_limit_exceeded, limit_memory,
+)
+from .executor_metrics import metrics, PhaseTimings
+from .output_capture import OutputBudget, BoundedOutput
+from .virtual_fs import VirtualFileSystem
+from .sandbox_profiler import SandboxProfiler
+
+# Version der Ausführungsumgebung. Muss erhöht werden, wenn sich das Ergebnis
+# für denselben Code ändern kann (z.B. neue Guards oder Builtins), damit
+# zwischengespeicherte Ergebnisse ungültig werden.
+EXECUTOR_VERSION = "6"
+
+# Positionsangabe in Fehlermeldungen von compile_restricted, z.B. 'Line 3: "_x" is an invalid ...'
+RESTRICTED_ERROR_POSITION = re.compile(r'Line (\d+): (.*)', re.DOTALL)
 
 # RestrictedPython-spezifische Warnungen unterdrücken
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="RestrictedPython")
 
+def _guarded_getitem(ob, index):
+    # Simple implementation of safe getitem
+    if isinstance(ob, (list, tuple, dict, str)):
+        return ob[index]
+    raise TypeError(f"Unsupported type for getitem: {type(ob)}")
+
+
+def _guarded_setitem(ob, index, value):
+    # Simple implementation of safe setitem
+    if isinstance(ob, (list, dict)):
+        ob[index] = value
+        return value
+    raise TypeError(f"Unsupported type for setitem: {type(ob)}")
+
+
+def _write_output(text):
+    """
+    Schreibt Ausgaben auf das aktuelle sys.stdout. In der Sandbox ist das ein begrenzter
+    Puffer (siehe run_restricted), in Tests ggf. deren eigene Umleitung (redirect_stdout).
+    """
+    sys.stdout.write(text)
+
+
+def _safe_print(*args, **kwargs):
+    """Print-Funktion, die Ausgaben über _write_output ausgibt"""
+    result = " ".join(str(arg) for arg in args)
+    
+    # Zeilenumbruch hinzufügen, wenn nicht anders angegeben
+    end = kwargs.get('end', '\n')
+    
+    _write_output(result + end)
+    
+    # Auch für PrintCollector bereitstellen
+    return result
+
+
+class _OutputPrintCollector(PrintCollector):
+    """
+    PrintCollector, den RestrictedPython für print()-Aufrufe verwendet. Die Ausgaben
+    landen über _write_output im begrenzten stdout-Puffer und werden nicht zusätzlich
+    im Collector gesammelt ('printed' bleibt daher leer), damit der Speicher begrenzt bleibt.
+    """
+    def _call_print(self, *objects, **kwargs):
+        # Einen print()-Aufruf als Ganzes weitergeben statt Stück für Stück
+        if kwargs.get('file') is None:
+            buffer = io.StringIO()
+            kwargs['file'] = buffer
+            print(*objects, **kwargs)
+            self.write(buffer.getvalue())
+        else:
+            super()._call_print(*objects, **kwargs)
+    
+    def write(self, text):
+        _write_output(text)
+
+
+# Erlaubte Builtins der Sandbox (print wird durch _safe_print ersetzt)
+RESTRICTED_BUILTINS = MappingProxyType({
+    'abs': abs, 'all': all, 'any': any, 'bool': bool, 'callable': callable,
+    'chr': chr, 'complex': complex, 'dict': dict, 'divmod': divmod,
+    'enumerate': enumerate, 'filter': filter, 'float': float, 'frozenset': frozenset,
+    'getattr': getattr, 'hasattr': hasattr, 'hash': hash, 'hex': hex,
+    'int': int, 'isinstance': isinstance, 'issubclass': issubclass,
+    'iter': iter, 'len': len, 'list': list, 'map': map, 'max': max,
+    'min': min, 'next': next, 'oct': oct, 'ord': ord, 'pow': pow,
+    'print': _safe_print, 'range': range, 'repr': repr, 'reversed': reversed,
+    'round': round, 'set': set, 'slice': slice, 'sorted': sorted,
+    'str': str, 'sum': sum, 'tuple': tuple, 'type': type, 'zip': zip
+})
+
+
+def _build_safe_globals_template():
+    """Baut die für alle Ausführungen gleichen Globals (RestrictedPython-Guards, print, Builtins)."""
+    template = safe_globals.copy()
+    template['_getattr_'] = getattr
+    template['_setattr_'] = guarded_setattr
+    template['_getitem_'] = _guarded_getitem
+    template['_setitem_'] = _guarded_setitem
+    template['_print_'] = _OutputPrintCollector
+    # Schleifen über Iteratoren (z.B. csv.reader, Dateien) und Entpacken in Schleifen/Zuweisungen
+    template['_getiter_'] = iter
+    template['_iter_unpack_sequence_'] = guarded_iter_unpack_sequence
+    template['_unpack_sequence_'] = guarded_unpack_sequence
+    template['printed'] = ''
+    # Wird pro Ausführung durch eine eigene Kopie ersetzt (siehe create_safe_globals)
+    template['__builtins__'] = RESTRICTED_BUILTINS
+    return MappingProxyType(template)
+
+
+# Beim Import einmalig aufgebaut und von allen Ausführungen geteilt (nur lesend)
+SAFE_GLOBALS_TEMPLATE = _build_safe_globals_template()
+
+
 class SecurityExecutor:
     """
     Eine Sicherheitsschicht für die Ausführung von Python-Code.
-    Kombiniert mehrere Sicherheitsmechanismen:
-    1. RestrictedPython - Verhindert Zugriff auf gefährliche Funktionen
-    2. Eingeschränkter Namensraum - Nur Whitelisted-Builtins erlaubt
-    3. Timeout via threading (für Windows) oder multiprocessing (für Unix) - Stoppt Endlosschleifen, CPU-Abuse
-    4. AST Codeanalyse - Filtert gefährliche Syntax vorab
+    Kombiniert mehrere Sicherheitsmechanismen (in der Reihenfolge der Ausführung):
+    1. AST Codeanalyse - Filtert gefährliche Syntax vorab
+    2. RestrictedPython - Verhindert Zugriff auf gefährliche Funktionen
+    3. Eingeschränkter Namensraum - Nur Whitelisted-Builtins erlaubt
+    4. Timeout via threading (für Windows) oder Sandbox-Worker-Pool (für Unix) - Stoppt Endlosschleifen, CPU-Abuse
+       Zusätzlich gilt pro Ausführung ein CPU-Zeitbudget, die Wall-Clock-Zeit ist nur Notbremse
+    5. Speicherlimit pro Ausführung (RLIMIT_AS) - Verhindert, dass einzelne Einreichungen den Host in den Swap treiben
     """
     
     # AST-Prüfungen: Verbotene Module und Funktionen
@@ -42,14 +159,49 @@ class SecurityExecutor:
         '__import__', 'load', 'loads', 'dump', 'dumps'
     }
     
-    def __init__(self, timeout=5):
+    FORBIDDEN_CALLS = {'eval', 'exec', 'compile', 'open', 'input'}
+    
+    # Im Dateisystem-Modus erlaubt: open() und Dateimethoden wirken nur auf das virtuelle Dateisystem
+    VIRTUAL_FS_ALLOWED_CALLS = {'open'}
+    VIRTUAL_FS_ALLOWED_ATTRIBUTES = {'write', 'load', 'loads', 'dump', 'dumps'}
+    
+    # Sekunden, die der Elternprozess über timeout hinaus wartet, bevor er den Worker beendet
+    WALL_TIME_GRACE = 1.0
+    
+    def __init__(self, timeout=5, use_pool=True, cpu_limit=None, memory_limit_mb=None,
+                 max_stdout_bytes=None, max_stderr_bytes=None, virtual_fs=False, test_options=None):
         """
         Initialisiert den Sicherheits-Executor.
         
         Args:
             timeout (int): Timeout in Sekunden für die Codeausführung (Standard: 5)
+            use_pool (bool): Unter Unix den vorgestarteten Sandbox-Worker-Pool verwenden
+                statt pro Ausführung einen Prozess zu forken (Standard: True)
+            cpu_limit (float): CPU-Zeitbudget in Sekunden pro Ausführung (Standard: None = nur messen).
+                Anders als timeout ist es unabhängig von der Auslastung des Hosts.
+            memory_limit_mb (int): Speicherlimit in MB pro Ausführung (Standard: None = nur messen)
+            max_stdout_bytes (int): Maximal behaltene Bytes der Standardausgabe (Standard: None = unbegrenzt)
+            max_stderr_bytes (int): Maximal behaltene Bytes der Fehlerausgabe (Standard: None = unbegrenzt)
+            virtual_fs (bool): Dateisystem-Modus für Dateiaufgaben: open(), os und tempfile wirken auf ein
+                Dateisystem im Speicher, json und csv dürfen importiert werden (Standard: False)
+            test_options (dict): Optionen für die Testausführung: 'failfast', 'test_names' und
+                'failed_first' (siehe sandbox_tests.run_test_code) sowie 'profile' für den Profil-Modus
+                ({'top_n', 'interval', 'max_samples', 'budget_fraction'}, siehe SandboxProfiler;
+                Standard: None = alle Tests ohne Profiling)
         """
         self.timeout = timeout
+        self.use_pool = use_pool
+        self.cpu_limit = cpu_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.max_stdout_bytes = max_stdout_bytes
+        self.max_stderr_bytes = max_stderr_bytes
+        self.virtual_fs = virtual_fs
+        self.test_options = test_options or {}
+        self.forbidden_attributes = self.FORBIDDEN_ATTRIBUTES
+        self.forbidden_calls = self.FORBIDDEN_CALLS
+        if virtual_fs:
+            self.forbidden_attributes = self.FORBIDDEN_ATTRIBUTES - self.VIRTUAL_FS_ALLOWED_ATTRIBUTES
+            self.forbidden_calls = self.FORBIDDEN_CALLS - self.VIRTUAL_FS_ALLOWED_CALLS
         # Überprüfen, ob wir auf Windows laufen
         self.is_windows = platform.system() == 'Windows'
     
@@ -69,115 +221,180 @@ class SecurityExecutor:
             # Direkter SyntaxError wird durchgereicht, ohne Wrapper
             return False, str(e)
         
+        return self.check_tree(tree)
+    
+    def check_tree(self, tree):
+        """
+        Prüft einen bereits geparsten AST in einem einzigen Durchlauf auf verbotene
+        Module, Attribute und Funktionsaufrufe.
+        
+        Args:
+            tree (ast.AST): Der AST des Benutzercodes
+            
+        Returns:
+            tuple: (is_safe, message) - Ob der Code sicher ist und eine Nachricht
+        """
+        for node, message in self.iter_violations(tree):
+            return False, message
+        
+        # Keine verbotenen Konstrukte gefunden
+        return True, "Code-Analyse bestanden"
+    
+    def iter_violations(self, tree):
+        """
+        Liefert alle verbotenen Konstrukte im AST (Reihenfolge wie ast.walk).
+        
+        Args:
+            tree (ast.AST): Der AST des Benutzercodes
+            
+        Yields:
+            tuple: (node, message) - Der betroffene AST-Knoten (mit Positionsangaben) und die Meldung
+        """
         # Prüfe auf verbotene Importe und Attribute
         for node in ast.walk(tree):
             # 1. Prüfe auf Import-Statements (import os, etc.)
             if isinstance(node, ast.Import):
                 for name in node.names:
                     if name.name.split('.')[0] in self.FORBIDDEN_MODULES:
-                        return False, f"Verbotenes Modul: {name.name} kann aus Sicherheitsgründen nicht importiert werden"
+                        yield node, f"Verbotenes Modul: {name.name} kann aus Sicherheitsgründen nicht importiert werden"
             
             # 2. Prüfe auf Import-From-Statements (from os import system, etc.)
             elif isinstance(node, ast.ImportFrom):
                 if node.module and node.module.split('.')[0] in self.FORBIDDEN_MODULES:
-                    return False, f"Verbotenes Modul: {node.module} kann aus Sicherheitsgründen nicht importiert werden"
+                    yield node, f"Verbotenes Modul: {node.module} kann aus Sicherheitsgründen nicht importiert werden"
                 
                 for name in node.names:
-                    if name.name in self.FORBIDDEN_ATTRIBUTES:
-                        return False, f"Verbotene Funktion: {node.module}.{name.name} kann aus Sicherheitsgründen nicht verwendet werden"
+                    if name.name in self.forbidden_attributes:
+                        yield node, f"Verbotene Funktion: {node.module}.{name.name} kann aus Sicherheitsgründen nicht verwendet werden"
             
             # 3. Prüfe auf gefährliche Attributzugriffe (os.system, etc.)
             elif isinstance(node, ast.Attribute):
-                if node.attr in self.FORBIDDEN_ATTRIBUTES:
-                    return False, f"Verbotener Attributzugriff: {node.attr} kann aus Sicherheitsgründen nicht verwendet werden"
+                if node.attr in self.forbidden_attributes:
+                    yield node, f"Verbotener Attributzugriff: {node.attr} kann aus Sicherheitsgründen nicht verwendet werden"
                     
             # 4. Prüfe auf gefährliche Funktionsaufrufe
             elif isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name) and node.func.id in {'eval', 'exec', 'compile', 'open', 'input'}:
-                    return False, f"Verbotene Funktion: {node.func.id} kann aus Sicherheitsgründen nicht verwendet werden"
-                elif isinstance(node.func, ast.Attribute) and node.func.attr in self.FORBIDDEN_ATTRIBUTES:
-                    return False, f"Verbotene Methode: {node.func.attr} kann aus Sicherheitsgründen nicht verwendet werden"
-        
-        # Keine verbotenen Konstrukte gefunden
-        return True, "Code-Analyse bestanden"
+                if isinstance(node.func, ast.Name) and node.func.id in self.forbidden_calls:
+                    yield node, f"Verbotene Funktion: {node.func.id} kann aus Sicherheitsgründen nicht verwendet werden"
+                elif isinstance(node.func, ast.Attribute) and node.func.attr in self.forbidden_attributes:
+                    yield node, f"Verbotene Methode: {node.func.attr} kann aus Sicherheitsgründen nicht verwendet werden"
     
-    def create_safe_globals(self, additional_globals=None):
+    def diagnose(self, code):
         """
-        Erstellt einen eingeschränkten globalen Namensraum für die Codeausführung.
+        Prüft Syntax, Sicherheitsregeln und RestrictedPython-Einschränkungen, ohne den Code
+        auszuführen (kein Sandbox-Lauf), und liefert alle Befunde mit Position - z.B. für
+        Hinweise direkt im Editor.
         
         Args:
-            additional_globals (dict): Zusätzliche erlaubte globale Variablen
+            code (str): Der zu prüfende Python-Code
             
         Returns:
-            dict: Ein sicherer globaler Namensraum
+            list: Befunde als dicts mit 'kind' ('syntax', 'security' oder 'restricted'), 'message',
+                'line', 'column' und ggf. 'end_line'/'end_column' (Zeilen und Spalten ab 1)
         """
-        # Starte mit RestrictedPython's sicheren Globals
-        restricted_globals = safe_globals.copy()
-        
-        # Setattr-Schutz hinzufügen
-        restricted_globals['_getattr_'] = getattr
-        restricted_globals['_setattr_'] = guarded_setattr
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            # Bei Syntaxfehlern ist keine weitere Prüfung möglich
+            return [{
+                'kind': 'syntax',
+                'message': e.msg,
+                'line': e.lineno,
+                'column': e.offset,
+                'end_line': getattr(e, 'end_lineno', None),
+                'end_column': getattr(e, 'end_offset', None),
+            }]
+        except ValueError as e:
+            # z.B. Null-Bytes im Quelltext
+            return [{'kind': 'syntax', 'message': str(e), 'line': None, 'column': None,
+                     'end_line': None, 'end_column': None}]
         
-        # Hilfsfunktionen für sicheren Zugriff auf Listen und Dictionaries
-        def guarded_getitem(ob, index):
-            # Simple implementation of safe getitem
-            if isinstance(ob, (list, tuple, dict, str)):
-                return ob[index]
-            raise TypeError(f"Unsupported type for getitem: {type(ob)}")
-            
-        def guarded_setitem(ob, index, value):
-            # Simple implementation of safe setitem
-            if isinstance(ob, (list, dict)):
-                ob[index] = value
-                return value
-            raise TypeError(f"Unsupported type for setitem: {type(ob)}")
+        diagnostics = [
+            {
+                'kind': 'security',
+                'message': message,
+                'line': node.lineno,
+                'column': node.col_offset + 1,
+                'end_line': node.end_lineno,
+                'end_column': node.end_col_offset + 1 if node.end_col_offset is not None else None,
+            }
+            for node, message in self.iter_violations(tree)
+        ]
         
-        # Füge eigene Hilfsfunktionen hinzu
-        restricted_globals['_getitem_'] = guarded_getitem
-        restricted_globals['_setitem_'] = guarded_setitem
+        # Einschränkungen von RestrictedPython (z.B. Namen mit Unterstrich); kompiliert den AST,
+        # verändert ihn dabei aber - er wird danach nicht mehr verwendet
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=SyntaxWarning, module="RestrictedPython")
+            result = compile_restricted_exec(tree, filename="<string>")
+        for error in result.errors:
+            match = RESTRICTED_ERROR_POSITION.match(error)
+            diagnostics.append({
+                'kind': 'restricted',
+                'message': match.group(2) if match else error,
+                'line': int(match.group(1)) if match else None,
+                'column': None,
+                'end_line': None,
+                'end_column': None,
+            })
         
-        # Sammler-Variable für Ausgaben
-        restricted_globals['output_buffer'] = []
+        diagnostics.sort(key=lambda diagnostic: (diagnostic['line'] or 0, diagnostic['column'] or 0))
+        return diagnostics
+    
+    def compile_checked(self, code, tree=None, timings=None):
+        """
+        Parst den Code genau einmal, führt die Sicherheitsanalyse auf dem AST durch und
+        kompiliert denselben AST anschließend mit RestrictedPython.
         
-        # Verbesserte print-Funktion, die Ausgaben erfasst
-        def safe_print(*args, **kwargs):
-            """Print-Funktion, die Ausgaben in output_buffer sammelt"""
-            result = " ".join(str(arg) for arg in args)
-            
-            # Zeilenumbruch hinzufügen, wenn nicht anders angegeben
-            end = kwargs.get('end', '\n')
-            
-            # Ausgabe in buffer speichern
-            if 'output_buffer' in restricted_globals:
-                restricted_globals['output_buffer'].append(result + end)
-            
-            # Auch für PrintCollector bereitstellen
-            return result
+        Args:
+            code (str): Der Python-Code
+            tree (ast.Module): Optional bereits geparster AST (wird durch das Kompilieren verändert)
+            timings (PhaseTimings): Optional, erfasst die Phasen 'parse', 'ast_check' und 'restricted_compile'
             
-        # Die sichere print-Funktion als print verwenden
-        restricted_builtins = {
-            'abs': abs, 'all': all, 'any': any, 'bool': bool, 'callable': callable,
-            'chr': chr, 'complex': complex, 'dict': dict, 'divmod': divmod,
-            'enumerate': enumerate, 'filter': filter, 'float': float, 'frozenset': frozenset,
-            'getattr': getattr, 'hasattr': hasattr, 'hash': hash, 'hex': hex,
-            'int': int, 'isinstance': isinstance, 'issubclass': issubclass,
-            'iter': iter, 'len': len, 'list': list, 'map': map, 'max': max,
-            'min': min, 'next': next, 'oct': oct, 'ord': ord, 'pow': pow,
-            'print': safe_print, 'range': range, 'repr': repr, 'reversed': reversed,
-            'round': round, 'set': set, 'slice': slice, 'sorted': sorted,
-            'str': str, 'sum': sum, 'tuple': tuple, 'type': type, 'zip': zip
-        }
+        Returns:
+            tuple: (byte_code, message) - byte_code ist None, wenn der Code abgelehnt wurde
+        """
+        timings = timings or PhaseTimings()
+        if tree is None:
+            try:
+                with timings.phase('parse'):
+                    tree = ast.parse(code)
+            except SyntaxError as e:
+                # Direkter SyntaxError wird durchgereicht, ohne Wrapper
+                return None, str(e)
+        
+        with timings.phase('ast_check'):
+            is_safe, message = self.check_tree(tree)
+        if not is_safe:
+            return None, message
+        
+        # RestrictedPython-Warnungen unterdrücken
+        with warnings.catch_warnings(), timings.phase('restricted_compile'):
+            warnings.filterwarnings("ignore", category=SyntaxWarning, module="RestrictedPython")
+            result = compile_restricted_exec(tree, filename="<string>")
+        if result.errors:
+            return None, "\n".join(result.errors)
+        return result.code, message
+    
+    def create_safe_globals(self, additional_globals=None):
+        """
+        Erstellt einen eingeschränkten globalen Namensraum für die Codeausführung.
         
-        restricted_globals['__builtins__'] = restricted_builtins
+        Die unveränderlichen Teile (Guards, print, Builtins) werden beim Import einmalig
+        aufgebaut (SAFE_GLOBALS_TEMPLATE); pro Ausführung entstehen nur flache Kopien, damit
+        Änderungen des Benutzercodes nicht in die nächste Ausführung im selben Worker wandern.
         
-        # Für PrintCollector
-        restricted_globals['_print_'] = PrintCollector
-        restricted_globals['printed'] = ''
+        Args:
+            additional_globals (dict): Zusätzliche erlaubte globale Variablen
+            
+        Returns:
+            dict: Ein sicherer globaler Namensraum
+        """
+        restricted_globals = dict(SAFE_GLOBALS_TEMPLATE)
+        restricted_globals['__builtins__'] = dict(RESTRICTED_BUILTINS)
         
         # Füge zusätzliche Globals hinzu (z.B. für Test-Funktionen)
         if additional_globals:
-            for key, value in additional_globals.items():
-                restricted_globals[key] = value
+            restricted_globals.update(additional_globals)
                 
         return restricted_globals
 
@@ -247,182 +464,413 @@ class SecurityExecutor:
             
         return printed_output
     
-    def _execute_code_unix(self, code, additional_globals=None):
+    def run_restricted(self, code, additional_globals=None, byte_code=None, output_sink=None,
+                       stdout_budget=None, stderr_budget=None, builtins_overlay=None, namespace=None,
+                       stdout=None, stderr=None):
         """
-        Unix-spezifische Implementierung für Code-Ausführung mit Timeout.
+        Kompiliert und führt Code im aktuellen Prozess aus (ohne Timeout).
+        Gemeinsame Grundlage für Thread-, Prozess- und Worker-Pool-Ausführung.
         
         Args:
             code (str): Der auszuführende Python-Code
             additional_globals (dict): Zusätzliche erlaubte globale Variablen
+            byte_code: Optional bereits geprüfter und restricted kompilierter Code (siehe compile_checked)
+            output_sink (callable): Optionaler Empfänger für Ausgaben (Streaming) - sie werden dann
+                direkt weitergereicht statt gesammelt
+            stdout_budget (OutputBudget): Optionales Byte-Limit für stdout (über Phasen hinweg geteilt)
+            stderr_budget (OutputBudget): Optionales Byte-Limit für stderr
+            builtins_overlay (dict): Optionale zusätzliche Builtins für diese Ausführung (z.B. open
+                des virtuellen Dateisystems)
+            namespace (dict): Optional ein bestehender Namensraum (siehe create_safe_globals), in dem
+                der Code ausgeführt wird, z.B. der einer REPL-Sitzung. Ersetzt additional_globals und
+                builtins_overlay.
+            stdout (BoundedOutput): Optional ein bereits angelegter Puffer für stdout (statt output_sink
+                und stdout_budget), dessen Inhalt auch nach einem Abbruch lesbar bleibt
+            stderr (BoundedOutput): Optional ein bereits angelegter Puffer für stderr (statt stderr_budget)
             
         Returns:
-            tuple: (success, result, stdout, stderr)
+            tuple: (success, result, stdout, stderr) - result enthält bei Erfolg die vom Code neu
+                definierten oder geänderten Namen
         """
-        result_queue = Queue()
+        # Ausgabeumleitung
+        old_stdout = sys.stdout
+        old_stderr = sys.stderr
+        redirected_output = stdout if stdout is not None else BoundedOutput(stdout_budget, output_sink)
+        redirected_error = stderr if stderr is not None else BoundedOutput(stderr_budget)
+        sys.stdout = redirected_output
+        sys.stderr = redirected_error
         
-        def execute_target():
-            # Ausgabeumleitung
-            old_stdout = sys.stdout
-            old_stderr = sys.stderr
-            redirected_output = io.StringIO()
-            redirected_error = io.StringIO()
-            sys.stdout = redirected_output
-            sys.stderr = redirected_error
-            
-            try:
-                # RestrictedPython-Warnungen unterdrücken
-                with warnings.catch_warnings():
-                    warnings.filterwarnings("ignore", category=SyntaxWarning, module="RestrictedPython")
-                    
-                    # Sichere Umgebung erstellen
-                    restricted_globals = self.create_safe_globals(additional_globals)
-                    
-                    # Kompilieren und Ausführen des Codes
-                    byte_code = compile_restricted(code, filename="<string>", mode="exec")
-                    exec_locals = {}
-                    
-                    # Ausführen des Codes in der eingeschränkten Umgebung
-                    exec(byte_code, restricted_globals, exec_locals)
-                    
-                    # Gesammelte print-Ausgaben abrufen
-                    collected_output = self.extract_printed_output(restricted_globals)
-                
-                # Ausgabe erfassen
-                stdout = redirected_output.getvalue()
-                
-                # Wenn wir Ausgaben gesammelt haben, diese verwenden
-                if collected_output and collected_output.strip():
-                    stdout = collected_output
-                
-                stderr = self.filter_stderr(redirected_error.getvalue())
-                
-                # Prüfen, ob wir einen speziellen Rückgabewert (say_hello) haben
-                if 'say_hello' in exec_locals and callable(exec_locals['say_hello']):
-                    try:
-                        result = exec_locals['say_hello']()
-                        if result and not stdout:
-                            stdout = result + "\n"
-                    except:
-                        pass
+        try:
+            # RestrictedPython-Warnungen unterdrücken
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", category=SyntaxWarning, module="RestrictedPython")
                 
-                # Ergebnis zurückgeben
-                result_queue.put((True, exec_locals, stdout, stderr))
+                # Sichere Umgebung erstellen (oder den Namensraum der Sitzung weiterverwenden)
+                if namespace is not None:
+                    restricted_globals = namespace
+                else:
+                    restricted_globals = self.create_safe_globals(additional_globals)
+                    if builtins_overlay:
+                        restricted_globals['__builtins__'].update(builtins_overlay)
                 
-            except Exception as e:
-                # Fehler erfassen - Original-Fehlermeldung ohne Wrapper
-                error_msg = str(e)
-                tb = traceback.format_exc()
-                stderr = self.filter_stderr(redirected_error.getvalue() + f"\n{error_msg}\n{tb}")
-                stdout = redirected_output.getvalue()
+                # Kompilieren und Ausführen des Codes (entfällt, wenn bereits vorkompiliert)
+                if byte_code is None:
+                    byte_code = compile_restricted(code, filename="<string>", mode="exec")
                 
-                result_queue.put((False, str(e), stdout, stderr))
+                # Ausführen des Codes in der eingeschränkten Umgebung. Ein gemeinsamer Namensraum wie
+                # bei einem Modul, damit Funktionen andere Funktionen und Importe des Codes sehen
+                predefined = dict(restricted_globals)
+                exec(byte_code, restricted_globals)
+                exec_locals = {
+                    name: value for name, value in restricted_globals.items()
+                    if not name.startswith('_') and (name not in predefined or predefined[name] is not value)
+                }
                 
-            finally:
-                # Ausgabeumleitung zurücksetzen
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
+                # Gesammelte print-Ausgaben abrufen
+                collected_output = self.extract_printed_output(restricted_globals)
+            
+            # Ausgabe erfassen
+            stdout = redirected_output.getvalue()
+            
+            # Wenn wir Ausgaben gesammelt haben, diese verwenden
+            if collected_output and collected_output.strip():
+                stdout = collected_output
+            
+            stderr = self.filter_stderr(redirected_error.getvalue())
+            
+            # Prüfen, ob wir einen speziellen Rückgabewert (say_hello) haben
+            if 'say_hello' in exec_locals and callable(exec_locals['say_hello']):
+                try:
+                    result = exec_locals['say_hello']()
+                    if result and not stdout:
+                        stdout = result + "\n"
+                except:
+                    pass
+            
+            return True, exec_locals, stdout, stderr
+            
+        except MemoryError:
+            # Speicherlimit - wird in run_job in eine verständliche Meldung übersetzt
+            raise
+            
+        except Exception as e:
+            # Fehler erfassen - Original-Fehlermeldung ohne Wrapper
+            error_msg = str(e)
+            tb = traceback.format_exc()
+            stderr = self.filter_stderr(redirected_error.getvalue() + f"\n{error_msg}\n{tb}")
+            stdout = redirected_output.getvalue()
+            
+            return False, str(e), stdout, stderr
+            
+        finally:
+            # Ausgabeumleitung zurücksetzen
+            sys.stdout = old_stdout
+            sys.stderr = old_stderr
+    
+    def run_job(self, job, emit=None, namespace=None):
+        """
+        Führt einen Ausführungsauftrag im aktuellen Prozess aus: den Benutzercode und,
+        falls angegeben, die Testdatei der Aufgabe in derselben Sandbox.
+        
+        Args:
+            job (dict): 'code', 'additional_globals', optional 'byte_code' (marshal-Bytes des
+                restricted kompilierten Codes) sowie 'test_code' (marshal-Bytes), 'test_digest', 'test_filename'
+                und 'test_options'
+            emit (callable): Optionaler Empfänger für Zwischenereignisse (Streaming): Ausgaben als
+                {'type': 'stdout', 'data': ...} und Testergebnisse als {'type': 'test', ...}
+            namespace (dict): Optional der bestehende Namensraum einer REPL-Sitzung (siehe run_restricted)
+            
+        Returns:
+            tuple: (success, result, stdout, stderr, usage) - result enthält bei Test-Jobs die
+                serialisierbare Testzusammenfassung statt der lokalen Variablen, usage den
+                Ressourcenverbrauch ({'cpu_time', 'cpu_limit', 'peak_memory_mb', 'memory_limit_mb',
+                'memory_exceeded', 'timed_out'} sowie Bytes und Kürzung von stdout/stderr). Nach einem
+                Abbruch (CPU-, Zeit- oder Speicherlimit) enthalten stdout/stderr die bis dahin erfassten Ausgaben. Im Profil-Modus enthält
+                die Testzusammenfassung zusätzlich 'profile' (siehe SandboxProfiler.report).
+        """
+        success, result = False, None
+        interrupted = False
+        timed_out = False
+        memory_exceeded = False
+        phases = {}
+        # Puffer (stdout, stderr) der Phasen - nach einem Abbruch kommt ihr bisheriger Inhalt zurück
+        outputs = []
+        # Ausgaben von Benutzercode und Tests teilen sich jeweils ein Byte-Budget
+        stdout_budget = OutputBudget(job.get('max_stdout_bytes'))
+        stderr_budget = OutputBudget(job.get('max_stderr_bytes'))
+        profile = (job.get('test_options') or {}).get('profile')
+        profiler = self._create_profiler(profile, job.get('profile_allowance')) if profile else None
+        try:
+            with limit_cpu_time(job.get('cpu_limit')) as usage, \
+                    limit_memory(job.get('memory_limit_mb')) as memory_usage, \
+                    limit_wall_time(job.get('wall_limit')):
+                if profiler is not None:
+                    profiler.start()
+                try:
+                    success, result, stdout, stderr = self._run_job_unlimited(
+                        job, emit, phases, stdout_budget, stderr_budget, namespace, profiler, outputs
+                    )
+                finally:
+                    if profiler is not None:
+                        profiler.stop()
+        except CpuLimitExceeded:
+            # Der Benutzercode wurde vom SIGXCPU-Handler abgebrochen
+            interrupted = True
+            stdout, stderr = self._partial_output(outputs)
+        except WallTimeExceeded:
+            timed_out = True
+            stdout, stderr = self._partial_output(outputs)
+        except MemoryError:
+            memory_exceeded = True
+            stdout, stderr = self._partial_output(outputs)
+        usage.update(memory_usage)
+        usage.update(stdout_budget.stats('stdout'))
+        usage.update(stderr_budget.stats('stderr'))
+        # Phasen-Zeiten im Worker - werden im Elternprozess in die Metriken übernommen (siehe execute_secure)
+        usage['phases'] = phases
+        
+        # MemoryErrors innerhalb der Tests fängt unittest selbst ab
+        if not memory_exceeded and success and isinstance(result, dict) and 'errors' in result:
+            memory_exceeded = any('MemoryError' in err for _, err in result['errors'])
+        usage['memory_exceeded'] = memory_exceeded
+        usage['timed_out'] = timed_out
+        
+        if profiler is not None and success and isinstance(result, dict) and 'tests' in result:
+            result['profile'] = profiler.report(profile['top_n'])
+        
+        if interrupted or cpu_limit_exceeded(usage):
+            return False, self._cpu_limit_message(usage['cpu_limit']), stdout, stderr, usage
+        if timed_out:
+            return False, self._timeout_message(job['wall_limit']), stdout, stderr, usage
+        if memory_exceeded:
+            return False, self._memory_limit_message(usage['memory_limit_mb']), stdout, stderr, usage
+        return success, result, stdout, stderr, usage
+    
+    def _partial_output(self, outputs):
+        """Bis zu einem Abbruch erfasste Ausgaben aller Phasen, inklusive einer Kürzungsmarkierung."""
+        stdout = "\n".join(value for value in (out.getvalue() for out, _ in outputs) if value)
+        stderr = "".join(self.filter_stderr(err.getvalue()) for _, err in outputs)
+        return stdout, stderr
+    
+    def _create_profiler(self, profile, allowance):
+        """
+        Profiler für den Profil-Modus. Profiliert werden höchstens allowance Sekunden CPU-Zeit;
+        um genau diesen Zuschlag sind CPU- und Zeitlimit des Jobs erhöht (siehe _profile_allowance).
+        """
+        return SandboxProfiler(profile['interval'], profile['max_samples'], allowance or None)
+    
+    def _profile_allowance(self):
+        """
+        Zuschlag in Sekunden auf CPU- und Zeitlimit im Profil-Modus: der profilierte Anteil
+        profile['budget_fraction'] des CPU-Budgets. Der Mehraufwand des Profilings fällt nur in
+        diesem Fenster an und ist damit kleiner als der Zuschlag - Code, der ohne Profiling in die
+        Limits passt, passt auch mit Profiling hinein.
+        """
+        profile = (self.test_options or {}).get('profile')
+        if not profile or not self.cpu_limit:
+            return 0
+        return self.cpu_limit * profile['budget_fraction']
+    
+    def _cpu_limit_message(self, cpu_limit):
+        return f"CPU-Zeitlimit überschritten - Code benötigte mehr als {cpu_limit} Sekunden Rechenzeit"
+    
+    def _timeout_message(self, timeout):
+        return f"Zeitüberschreitung - Code lief länger als {timeout} Sekunden"
+    
+    def _memory_limit_message(self, memory_limit_mb):
+        if memory_limit_mb:
+            return f"Speicherlimit überschritten - Code benötigte mehr als {memory_limit_mb} MB Arbeitsspeicher"
+        return "Speicherlimit überschritten - nicht genügend Arbeitsspeicher verfügbar"
+    
+    def _run_job_unlimited(self, job, emit=None, phases=None, stdout_budget=None, stderr_budget=None,
+                           namespace=None, profiler=None, outputs=None):
+        """
+        Führt Benutzercode und Tests eines Jobs aus (siehe run_job), ohne Ressourcenbegrenzung.
+        Die Dauer der Phasen 'user_exec', 'test_load' und 'test_run' wird in phases eingetragen,
+        die Ausgabepuffer jeder Phase als (stdout, stderr) in outputs.
+        """
+        outputs = outputs if outputs is not None else []
+        test_options = {option: value for option, value in (job.get('test_options') or {}).items() if option != 'profile'}
+        phases = phases if phases is not None else {}
+        byte_code = marshal.loads(job['byte_code']) if job.get('byte_code') else None
+        output_sink = None
+        on_test = None
+        if emit is not None:
+            output_sink = lambda text: emit({'type': 'stdout', 'data': text})
+            on_test = lambda test: emit({'type': 'test', **test})
+        
+        builtins_overlay = None
+        test_builtins = None
+        if job.get('virtual_fs') and namespace is None:
+            # Pro Job ein frisches Dateisystem im Speicher, gemeinsam für Benutzercode und Tests
+            file_system = VirtualFileSystem()
+            builtins_overlay = file_system.builtins_for_user_code()
+            test_builtins = file_system.builtins_for_tests()
+        
+        user_output = (BoundedOutput(stdout_budget, output_sink), BoundedOutput(stderr_budget))
+        outputs.append(user_output)
+        started_at = time.perf_counter()
+        success, result, stdout, stderr = self.run_restricted(
+            job['code'], job.get('additional_globals'), byte_code, builtins_overlay=builtins_overlay,
+            namespace=namespace, stdout=user_output[0], stderr=user_output[1]
+        )
+        phases['user_exec'] = time.perf_counter() - started_at
+        if not success or job.get('test_code') is None:
+            return success, result, stdout, stderr
+        
+        try:
+            started_at = time.perf_counter()
+            test_code = load_test_code(job['test_code'], job['test_digest'])
+            phases['test_load'] = time.perf_counter() - started_at
+            test_output = (BoundedOutput(stdout_budget, output_sink), BoundedOutput(stderr_budget))
+            outputs.append(test_output)
+            started_at = time.perf_counter()
+            test_results, test_stdout, test_stderr = run_test_code(
+                test_code, job['test_filename'], result, on_test, stdout=test_output[0], stderr=test_output[1],
+                builtins=test_builtins, profiler=profiler, **test_options
+            )
+            phases['test_run'] = time.perf_counter() - started_at
+        except Exception as e:
+            # Test-Ausführungsfehler - wird in stderr angezeigt, keine doppelte Meldung
+            return True, None, stdout, stderr + f"Fehler bei der Test-Ausführung: {e}"
+        
+        # Ausgaben der Tests an die Benutzerausgabe anhängen
+        if test_stdout and test_stdout not in stdout:
+            stdout = stdout + "\n" + test_stdout if stdout else test_stdout
+        stderr += self.filter_stderr(test_stderr)
+        return True, test_results, stdout, stderr
+    
+    def _build_job(self, code, additional_globals=None, test_file_path=None, test_entry=None, byte_code=None, stream=False):
+        """
+        Baut den (picklebaren) Ausführungsauftrag. Die Testdatei wird im Elternprozess
+        kompiliert, sofern kein vorkompilierter Registry-Eintrag übergeben wurde.
+        
+        Raises:
+            FileNotFoundError: Wenn die Testdatei nicht existiert
+        """
+        allowance = self._profile_allowance()
+        job = {
+            'code': code,
+            'additional_globals': additional_globals,
+            'byte_code': marshal.dumps(byte_code) if byte_code is not None else None,
+            'stream': stream,
+            'cpu_limit': self.cpu_limit + allowance if self.cpu_limit else self.cpu_limit,
+            # Der Worker bricht nach timeout selbst ab, der Elternprozess erst nach WALL_TIME_GRACE mehr
+            'wall_limit': self.timeout + allowance,
+            'profile_allowance': allowance,
+            'memory_limit_mb': self.memory_limit_mb,
+            'max_stdout_bytes': self.max_stdout_bytes,
+            'max_stderr_bytes': self.max_stderr_bytes,
+            'virtual_fs': self.virtual_fs,
+            'test_options': self.test_options,
+        }
+        if test_entry is None and test_file_path:
+            test_entry = load_test_file(test_file_path)
+        if test_entry is not None:
+            job['test_code'] = test_entry.code_bytes
+            job['test_digest'] = test_entry.digest
+            job['test_filename'] = test_entry.path
+        return job
+    
+    def _execute_job_unix(self, job):
+        """
+        Unix-spezifische Implementierung für Code-Ausführung mit Timeout.
+        Forkt für jede Ausführung einen neuen Prozess (Fallback ohne Worker-Pool, ohne Streaming).
+        
+        Args:
+            job (dict): Ausführungsauftrag (siehe run_job)
+            
+        Returns:
+            tuple: (success, result, stdout, stderr, usage)
+        """
+        started_at = time.perf_counter()
+        result_queue = Queue()
+        
+        def execute_target():
+            result_queue.put(_run_pool_job(job))
         
         # Prozess starten und mit Timeout ausführen
         process = Process(target=execute_target)
         process.start()
-        process.join(self.timeout)
+        process.join(job['wall_limit'] + self.WALL_TIME_GRACE)
         
         # Timeout prüfen
         if process.is_alive():
             process.terminate()
             process.join()
-            return False, f"Zeitüberschreitung - Code lief länger als {self.timeout} Sekunden", "", f"Execution timed out after {self.timeout} seconds"
+            return self._timeout_result()
         
         # Ergebnis abrufen
         if not result_queue.empty():
-            return result_queue.get()
+            result = result_queue.get()
+            # Fork, Prozessstart und Übertragung zusammen - entspricht 'sandbox' im Worker-Pool
+            result[4]['phases']['sandbox'] = time.perf_counter() - started_at
+            return result
         else:
-            return False, "Unbekannter Fehler bei der Codeausführung", "", "No result from process"
+            return False, "Unbekannter Fehler bei der Codeausführung", "", "No result from process", self._empty_usage()
+    
+    def _execute_job_pool(self, job, on_event=None):
+        """
+        Unix-Implementierung über den vorgestarteten Sandbox-Worker-Pool.
+        
+        Args:
+            job (dict): Ausführungsauftrag (siehe run_job)
+            on_event (callable): Optionaler Empfänger für Zwischenereignisse aus der Sandbox
+            
+        Returns:
+            tuple: (success, result, stdout, stderr, usage)
+        """
+        pool_phases = {}
+        status, result = get_sandbox_pool().execute(job, job['wall_limit'] + self.WALL_TIME_GRACE, on_event, pool_phases)
+        
+        if status == 'ok':
+            result[4]['phases'].update(pool_phases)
+            return result
+        if status == 'timeout':
+            return self._timeout_result()
+        if status == 'busy':
+            metrics.increment('pool_busy')
+            return False, "Alle Sandbox-Worker sind ausgelastet, bitte später erneut versuchen", "", "No sandbox worker available", self._empty_usage()
+        metrics.increment('worker_crashes')
+        return False, "Unbekannter Fehler bei der Codeausführung", "", "Sandbox worker crashed", self._empty_usage()
+    
+    def _empty_usage(self):
+        # Verbrauch unbekannt (z.B. Worker abgebrochen)
+        return {
+            'cpu_time': None, 'cpu_limit': self.cpu_limit,
+            'peak_memory_mb': None, 'memory_limit_mb': self.memory_limit_mb, 'memory_exceeded': False,
+            'stdout_bytes': None, 'stdout_truncated': False, 'stdout_limit_bytes': self.max_stdout_bytes,
+            'stderr_bytes': None, 'stderr_truncated': False, 'stderr_limit_bytes': self.max_stderr_bytes,
+            'phases': {},
+        }
+    
+    def _timeout_result(self):
+        # Notbremse: der Worker hat auf sein eigenes Zeitlimit nicht reagiert, die Ausgaben sind verloren
+        metrics.increment('timeouts')
+        return False, self._timeout_message(self.timeout), "", f"Execution timed out after {self.timeout} seconds", self._empty_usage()
     
-    def _execute_code_windows(self, code, additional_globals=None):
+    def _execute_job_windows(self, job, on_event=None):
         """
         Windows-spezifische Implementierung für Code-Ausführung mit Timeout.
         Benutzt Threading statt Multiprocessing.
         
         Args:
-            code (str): Der auszuführende Python-Code
-            additional_globals (dict): Zusätzliche erlaubte globale Variablen
+            job (dict): Ausführungsauftrag (siehe run_job)
+            on_event (callable): Optionaler Empfänger für Zwischenereignisse
             
         Returns:
-            tuple: (success, result, stdout, stderr)
-        """
-        # Variablen für das Ergebnis
-        result = {
-            "success": False,
-            "locals": {},
-            "stdout": "",
-            "stderr": "",
-            "error": None
-        }
+            tuple: (success, result, stdout, stderr, usage)
+        """
+        # Variable für das Ergebnis
+        result_holder = {}
         
         # Event für das Timeout
         execution_finished = threading.Event()
         
         def execute_target():
-            # Ausgabeumleitung
-            old_stdout = sys.stdout
-            old_stderr = sys.stderr
-            redirected_output = io.StringIO()
-            redirected_error = io.StringIO()
-            sys.stdout = redirected_output
-            sys.stderr = redirected_error
-            
             try:
-                # RestrictedPython-Warnungen unterdrücken
-                with warnings.catch_warnings():
-                    warnings.filterwarnings("ignore", category=SyntaxWarning, module="RestrictedPython")
-                    
-                    # Sichere Umgebung erstellen
-                    restricted_globals = self.create_safe_globals(additional_globals)
-                    
-                    # Kompilieren und Ausführen des Codes
-                    byte_code = compile_restricted(code, filename="<string>", mode="exec")
-                    exec_locals = {}
-                    
-                    # Ausführen des Codes in der eingeschränkten Umgebung
-                    exec(byte_code, restricted_globals, exec_locals)
-                    
-                    # Gesammelte print-Ausgaben abrufen
-                    collected_output = self.extract_printed_output(restricted_globals)
-                
-                # Ausgabe erfassen
-                result["stdout"] = redirected_output.getvalue()
-                
-                # Wenn wir Ausgaben gesammelt haben, diese verwenden
-                if collected_output and collected_output.strip():
-                    result["stdout"] = collected_output
-                
-                # Prüfen, ob wir einen speziellen Rückgabewert (say_hello) haben
-                if 'say_hello' in exec_locals and callable(exec_locals['say_hello']):
-                    try:
-                        hello_result = exec_locals['say_hello']()
-                        if hello_result and not result["stdout"]:
-                            result["stdout"] = hello_result + "\n"
-                    except:
-                        pass
-                
-                result["stderr"] = self.filter_stderr(redirected_error.getvalue())
-                result["success"] = True
-                result["locals"] = exec_locals
-                
-            except Exception as e:
-                # Fehler erfassen - Original-Fehlermeldung ohne Wrapper
-                error_msg = str(e)
-                tb = traceback.format_exc()
-                result["stderr"] = self.filter_stderr(redirected_error.getvalue() + f"\n{error_msg}\n{tb}")
-                result["stdout"] = redirected_output.getvalue()
-                result["success"] = False
-                result["error"] = str(e)  # Original-Fehlermeldung ohne Wrapper
-                
+                result_holder["result"] = self.run_job(job, on_event)
             finally:
-                # Ausgabeumleitung zurücksetzen
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
                 # Marke setzen, dass die Ausführung beendet ist
                 execution_finished.set()
         
@@ -432,67 +880,116 @@ class SecurityExecutor:
         thread.start()
         
         # Auf Beendigung warten oder Timeout
-        finished = execution_finished.wait(self.timeout)
+        finished = execution_finished.wait(job['wall_limit'])
         
         # Timeout prüfen
         if not finished:
-            # Thread läuft noch nach Timeout
-            result["success"] = False
-            result["error"] = f"Zeitüberschreitung - Code lief länger als {self.timeout} Sekunden"
-            result["stderr"] = f"Execution timed out after {self.timeout} seconds"
             # Hinweis: Thread wird nicht gewaltsam beendet, aber als Daemon markiert, damit er das Hauptprogramm nicht blockiert
-            return False, result["error"], result["stdout"], result["stderr"]
+            return self._timeout_result()
         
-        # Erfolg oder Fehler zurückgeben
-        if result["success"]:
-            return True, result["locals"], result["stdout"], result["stderr"]
-        else:
-            return False, result["error"], result["stdout"], result["stderr"]
+        return result_holder["result"]
     
-    def execute_code_with_timeout(self, code, additional_globals=None):
+    def execute_code_with_timeout(self, code, additional_globals=None, test_file_path=None, test_entry=None,
+                                  byte_code=None, on_event=None):
         """
         Führt Code mit Timeout aus. Wählt je nach Betriebssystem die passende Methode.
         
         Args:
             code (str): Der auszuführende Python-Code
             additional_globals (dict): Zusätzliche erlaubte globale Variablen
+            test_file_path (str): Optionaler Pfad zu einer unittest-Datei, die in derselben
+                Sandbox gegen den Benutzercode ausgeführt wird
+            test_entry (TestFileEntry): Alternativ die bereits vorkompilierte Testdatei aus der Registry
+            byte_code: Optional bereits restricted kompilierter Code (wird sonst in der Sandbox kompiliert)
+            on_event (callable): Optionaler Empfänger für Zwischenereignisse (Ausgaben, Testergebnisse).
+                Gestreamte Ausgaben sind im zurückgegebenen stdout nicht mehr enthalten.
             
         Returns:
-            tuple: (success, result, stdout, stderr) - Erfolg, Ergebnis, Ausgabe, Fehler
+            tuple: (success, result, stdout, stderr, usage) - Erfolg, Ergebnis, Ausgabe, Fehler, Ressourcenverbrauch
         """
+        job = self._build_job(
+            code, additional_globals, test_file_path, test_entry, byte_code, stream=on_event is not None
+        )
         if self.is_windows:
-            return self._execute_code_windows(code, additional_globals)
+            return self._execute_job_windows(job, on_event)
+        elif self.use_pool:
+            return self._execute_job_pool(job, on_event)
         else:
-            return self._execute_code_unix(code, additional_globals)
+            return self._execute_job_unix(job)
+    
+    def _record_usage(self, usage, timings):
+        """Übernimmt die in der Sandbox gemessenen Phasen und Limit-Verletzungen in die Metriken."""
+        phases = usage.pop('phases', {})
+        sandbox_time = phases.pop('sandbox', None)
+        for phase, seconds in phases.items():
+            timings.record(phase, seconds)
+        if sandbox_time is not None:
+            # Restzeit des Sandbox-Aufrufs: Übertragung von Job und Ergebnis (Pickle, Pipe, Prozessstart)
+            timings.record('ipc', max(sandbox_time - sum(phases.get(p, 0.0) for p in
+                                                          ('user_exec', 'test_load', 'test_run')), 0.0))
+        if phases.get('pool_wait', 0.0) > 0.001:
+            metrics.increment('pool_waits')
+        if cpu_limit_exceeded(usage):
+            metrics.increment('cpu_limit_exceeded')
+        if usage.get('memory_exceeded'):
+            metrics.increment('memory_limit_exceeded')
+        if usage.get('timed_out'):
+            metrics.increment('timeouts')
     
-    def execute_secure(self, code, additional_globals=None):
+    def execute_secure(self, code, additional_globals=None, test_file_path=None, test_entry=None, tree=None,
+                       on_event=None, timings=None):
         """
         Führt Code sicher aus mit allen Sicherheitsschichten.
         
         Args:
             code (str): Der auszuführende Python-Code
             additional_globals (dict): Zusätzliche erlaubte globale Variablen
+            test_file_path (str): Optionaler Pfad zur Testdatei der Aufgabe
+            test_entry (TestFileEntry): Alternativ die vorkompilierte Testdatei aus der Registry
+            tree (ast.Module): Optional bereits geparster AST des Codes, um erneutes Parsen zu vermeiden
+            on_event (callable): Optionaler Empfänger für Zwischenereignisse (siehe execute_code_with_timeout)
+            timings (PhaseTimings): Optional, erfasst die Dauer der Ausführungsphasen (Prüfung,
+                Kompilierung, Warten auf einen Worker, Ausführung, Tests, Übertragung)
             
         Returns:
-            dict: Ergebnis der Codeausführung mit Status, Ausgabe, Fehler und lokalen Variablen
+            dict: Ergebnis der Codeausführung mit Status, Ausgabe, Fehler, lokalen Variablen,
+                Ressourcenverbrauch (usage) und (bei Angabe einer Testdatei) der Testzusammenfassung
         """
-        # 1. AST-Codeanalyse
-        is_safe, message = self.analyze_code_safety(code)
-        if not is_safe:
+        timings = timings or PhaseTimings()
+        metrics.increment('executions')
+        
+        # 1. & 2. AST-Codeanalyse und RestrictedPython-Kompilierung auf demselben AST
+        byte_code, message = self.compile_checked(code, tree, timings)
+        if byte_code is None:
+            metrics.increment('security_rejections')
             # Der original Fehler wird durchgereicht, ohne "Sicherheitsverletzung" Wrapper
             return {
                 "success": False,
                 "error": message,  # Originale Fehlermeldung
                 "stdout": "",
                 "stderr": message,  # Originale Fehlermeldung
-                "locals": {}
+                "locals": {},
+                "test_results": None
             }
         
-        # 2 & 3. RestrictedPython + Timeout + eingeschränkter Namensraum
-        success, result, stdout, stderr = self.execute_code_with_timeout(code, additional_globals)
+        # 3., 4. & 5. Eingeschränkter Namensraum, Timeout und Speicherlimit (der Bytecode geht direkt in die Sandbox)
+        success, result, stdout, stderr, usage = self.execute_code_with_timeout(
+            code, additional_globals, test_file_path, test_entry, byte_code, on_event
+        )
+        self._record_usage(usage, timings)
         
         # Ergebnis aufbereiten
-        if success:
+        if success and (test_file_path or test_entry is not None):
+            # Bei Test-Jobs werden keine lokalen Variablen aus der Sandbox übertragen
+            return {
+                "success": True,
+                "stdout": stdout,
+                "stderr": stderr,
+                "locals": {},
+                "test_results": result,
+                "usage": usage
+            }
+        elif success:
             # Fallback für den Fall, dass kein Output erfasst wurde, aber wir eine say_hello-Funktion haben
             if not stdout and isinstance(result, dict) and 'say_hello' in result and callable(result['say_hello']):
                 try:
@@ -506,7 +1003,9 @@ class SecurityExecutor:
                 "success": True,
                 "stdout": stdout,
                 "stderr": stderr,
-                "locals": result
+                "locals": result,
+                "test_results": None,
+                "usage": usage
             }
         else:
             return {
@@ -514,8 +1013,199 @@ class SecurityExecutor:
                 "error": result,  # Original-Fehlermeldung ohne Wrapper
                 "stdout": stdout,
                 "stderr": stderr,
-                "locals": {}
+                "locals": {},
+                "test_results": None,
+                "usage": usage
+            }
+
+    def execute_in_session(self, sessions, session_key, code, tree=None, on_event=None, timings=None):
+        """
+        Führt eine Zelle in einer interaktiven Sitzung aus (REPL-Modus): nur der neue Code läuft,
+        im Namensraum der vorherigen Zellen derselben Sitzung. Limits (CPU, Speicher, Ausgaben,
+        Timeout) gelten pro Zelle.
+        
+        Args:
+            sessions (SandboxSessionManager): Verwaltung der Sitzungen (siehe sandbox_sessions.py)
+            session_key (tuple): Schlüssel der Sitzung, z.B. (user.pk, task.pk)
+            code (str): Der Code der Zelle
+            tree (ast.Module): Optional bereits geparster AST des Codes
+            on_event (callable): Optionaler Empfänger für Zwischenereignisse (siehe execute_code_with_timeout)
+            timings (PhaseTimings): Optional, erfasst die Dauer der Ausführungsphasen
+            
+        Returns:
+            dict: Status, Ausgabe, Fehler und Ressourcenverbrauch wie bei execute_secure, dazu
+                'variables' (Name -> Typ aller in der Sitzung definierten Namen) und 'session'
+                (Zellen, Limits und ggf. Grund für das Ende der Sitzung)
+        
+        Raises:
+            SessionLimitReached: Wenn keine neue Sitzung angelegt werden kann
+        """
+        timings = timings or PhaseTimings()
+        metrics.increment('session_cells')
+        
+        byte_code, message = self.compile_checked(code, tree, timings)
+        if byte_code is None:
+            metrics.increment('security_rejections')
+            # Abgelehnte Zellen erreichen den Worker nicht, die Sitzung bleibt unverändert
+            return {
+                "success": False,
+                "error": message,
+                "stdout": "",
+                "stderr": message,
+                "variables": None,
+                "session": sessions.info(session_key),
             }
+        
+        job = self._build_job(code, byte_code=byte_code, stream=on_event is not None)
+        started_at = time.perf_counter()
+        status, result, session = sessions.execute(session_key, job, self.timeout + self.WALL_TIME_GRACE, on_event)
+        if status == 'ok':
+            success, result, stdout, stderr, usage = result
+            usage['phases']['sandbox'] = time.perf_counter() - started_at
+        elif status == 'timeout':
+            success, result, stdout, stderr, usage = self._timeout_result()
+        elif status == 'busy':
+            success, result, stdout, stderr, usage = (
+                False, "In dieser Sitzung läuft bereits eine Zelle, bitte warte auf ihr Ergebnis",
+                "", "Session busy", self._empty_usage()
+            )
+        else:
+            metrics.increment('worker_crashes')
+            success, result, stdout, stderr, usage = (
+                False, "Unbekannter Fehler bei der Codeausführung", "", "Sandbox worker crashed", self._empty_usage()
+            )
+        self._record_usage(usage, timings)
+        if session['created']:
+            metrics.increment('sessions_started')
+        if session['ended']:
+            metrics.increment('sessions_ended')
+        
+        return {
+            "success": success,
+            "error": None if success else result,
+            "stdout": stdout,
+            "stderr": stderr,
+            "variables": result if success else None,
+            "usage": usage,
+            "session": session,
+        }
+
+# --- Sandbox-Worker-Pool (Unix) ---
+
+_sandbox_pool = None
+_sandbox_pool_lock = threading.Lock()
+_sandbox_pool_options = {}
+
+# Vom Zygote vorab importiertes Modul (ohne Django)
+SANDBOX_ZYGOTE_MODULE = __name__.rsplit('.', 1)[0] + '.sandbox_zygote'
+
+
+def configure_sandbox_pool(**options):
+    """
+    Setzt die Optionen für den Sandbox-Worker-Pool (siehe SandboxWorkerPool).
+    Muss vor der ersten Codeausführung aufgerufen werden, z.B. in AppConfig.ready().
+    """
+    _sandbox_pool_options.update(options)
+
+
+def get_sandbox_pool():
+    """
+    Liefert den prozessweiten Sandbox-Worker-Pool und legt ihn beim ersten Zugriff an.
+    Standardmäßig werden die Worker aus einem schlanken Zygote-Prozess (forkserver, siehe
+    sandbox_zygote.py) geforkt statt aus dem Django-Prozess.
+    """
+    global _sandbox_pool
+    with _sandbox_pool_lock:
+        if _sandbox_pool is None:
+            options = {'start_method': 'forkserver', 'preload': [SANDBOX_ZYGOTE_MODULE], **_sandbox_pool_options}
+            _sandbox_pool = SandboxWorkerPool(
+                runner=_run_pool_job,
+                initializer=_init_sandbox_worker,
+                should_recycle=_needs_fresh_worker,
+                **options
+            )
+        return _sandbox_pool
+
+
+def start_sandbox_zygote():
+    """Startet den Zygote-Prozess des Sandbox-Pools (beim Start des Web-Workers aufrufen)."""
+    get_sandbox_pool().start_zygote()
+
+
+def _init_sandbox_worker():
+    """Initialisiert einen Worker: Signale ignorieren und RestrictedPython vorwärmen."""
+    # Strg+C im Entwicklungsserver soll nur den Elternprozess beenden
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    SecurityExecutor(use_pool=False).run_restricted("_warmup = sum(range(10))")
+
+
+def _run_pool_job(job, emit=None):
+    """Führt einen Job im Worker aus. Das Ergebnis muss picklebar sein."""
+    executor = SecurityExecutor(use_pool=False)
+    success, result, stdout, stderr, usage = executor.run_job(job, emit if job.get('stream') else None)
+    if success and job.get('test_code') is None:
+        result = _picklable_locals(result)
+    return success, result, stdout, stderr, usage
+
+
+def create_session_manager(**options):
+    """
+    Legt die Verwaltung der REPL-Sitzungen an (siehe SandboxSessionManager). Die Worker der
+    Sitzungen stammen aus demselben Zygote wie die des Pools.
+    """
+    return SandboxSessionManager(spawn=spawn_session_worker, should_close=_needs_fresh_worker, **options)
+
+
+def spawn_session_worker():
+    """Startet den Worker einer REPL-Sitzung aus demselben Zygote wie die Worker des Pools."""
+    return spawn_worker(get_sandbox_pool().context, _run_session_cell, _init_sandbox_worker)
+
+
+# Namensraum der REPL-Sitzung, nur im Sitzungs-Worker belegt (bleibt zwischen den Zellen erhalten)
+_session_namespace = None
+
+
+def _run_session_cell(job, emit=None):
+    """Führt eine Zelle im Sitzungs-Worker aus, im Namensraum der vorherigen Zellen."""
+    global _session_namespace
+    executor = SecurityExecutor(use_pool=False)
+    if _session_namespace is None:
+        _session_namespace = executor.create_safe_globals(job.get('additional_globals'))
+        if job.get('virtual_fs'):
+            # Ein Dateisystem im Speicher für die gesamte Sitzung
+            file_system = VirtualFileSystem()
+            _session_namespace['__builtins__'].update(file_system.builtins_for_user_code())
+    success, result, stdout, stderr, usage = executor.run_job(
+        job, emit if job.get('stream') else None, _session_namespace
+    )
+    if success:
+        result = _session_variables(_session_namespace)
+    return success, result, stdout, stderr, usage
+
+
+def _session_variables(namespace):
+    """Von den Zellen einer Sitzung definierte Namen mit ihrem Typ (für die Anzeige im Client)."""
+    return {
+        name: type(value).__name__ for name, value in namespace.items()
+        if not name.startswith('_') and name not in SAFE_GLOBALS_TEMPLATE
+    }
+
+
+def _needs_fresh_worker(result):
+    """Nach einem MemoryError ist der Heap des Workers fragmentiert - Worker ersetzen."""
+    return result[4]['memory_exceeded']
+
+
+def _picklable_locals(exec_locals):
+    """Filtert lokale Variablen, die nicht über die Pipe übertragen werden können."""
+    picklable = {}
+    for key, value in exec_locals.items():
+        try:
+            pickle.dumps(value)
+        except Exception:
+            continue
+        picklable[key] = value
+    return picklable
 
 # Beispiel für die Verwendung
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+import copy
+import threading
+
+
+class _Flight:
+    """Eine laufende Ausführung, auf die weitere identische Anfragen warten können."""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Fasst gleichzeitige Aufrufe mit demselben Schlüssel zusammen: Nur der erste Aufruf
+    führt die Funktion aus, alle weiteren warten auf dessen Ergebnis (oder Exception).
+    Nach Abschluss wird der Schlüssel sofort freigegeben - es ist kein Cache.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Führt func() aus oder schließt sich einer laufenden Ausführung mit demselben Schlüssel an.
+
+        Returns:
+            tuple: (result, shared) - shared ist True, wenn das Ergebnis von einem anderen Aufruf stammt
+                (dann als eigene Kopie)
+
+        Raises:
+            Exception: Die Exception von func() - bei allen beteiligten Aufrufen
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result), True
+
+        try:
+            flight.result = func()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def __len__(self):
+        return len(self._flights)
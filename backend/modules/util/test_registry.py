@@ -0,0 +1,211 @@
+import ast
+import os
+import hashlib
+import marshal
+import threading
+from .required_names import discover_required_names
+
+
+class TestFileEntry:
+    """
+    Vorkompilierte Testdatei einer Aufgabe.
+
+    Attributes:
+        path (str): Absoluter Pfad der Testdatei
+        digest (str): SHA-256 des Dateiinhalts
+        code: Kompiliertes Code-Objekt der Testdatei
+        code_bytes (bytes): Per marshal serialisiertes Code-Objekt (für die Übergabe an die Sandbox)
+        test_names (list): Gefundene Testfälle im Format "Klasse.methode"
+        required_names (tuple): Namen, die der Benutzercode für die Tests definieren muss
+        uses_files (bool): Die Tests arbeiten mit Dateien (Ausführung mit virtuellem Dateisystem)
+        signature (tuple): (mtime_ns, size) zum Erkennen von Änderungen
+    """
+    __slots__ = ('path', 'digest', 'code', 'code_bytes', 'test_names', 'required_names', 'uses_files', 'signature')
+
+    def __init__(self, path, digest, code, test_names, signature, required_names=(), uses_files=False):
+        self.path = path
+        self.digest = digest
+        self.code = code
+        self.code_bytes = marshal.dumps(code)
+        self.test_names = test_names
+        self.required_names = required_names
+        self.uses_files = uses_files
+        self.signature = signature
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def discover_test_names(tree):
+    """
+    Ermittelt die Testfälle statisch aus dem AST (ohne die Datei auszuführen):
+    Methoden "test*" in Klassen, die von (unittest.)TestCase erben.
+    """
+    test_names = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        is_test_case = any(
+            (isinstance(base, ast.Name) and base.id == 'TestCase') or
+            (isinstance(base, ast.Attribute) and base.attr == 'TestCase')
+            for base in node.bases
+        )
+        if not is_test_case:
+            continue
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name.startswith('test'):
+                test_names.append(f"{node.name}.{item.name}")
+    return test_names
+
+
+def uses_file_system(tree):
+    """Erkennt Testdateien für Dateiaufgaben: sie importieren tempfile oder rufen open() auf."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import) and any(alias.name == 'tempfile' for alias in node.names):
+            return True
+        if isinstance(node, ast.ImportFrom) and node.module == 'tempfile':
+            return True
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'open':
+            return True
+    return False
+
+
+def load_test_file(path):
+    """
+    Liest, kompiliert und analysiert eine Testdatei.
+
+    Raises:
+        FileNotFoundError: Wenn die Datei nicht existiert
+        SyntaxError: Wenn die Testdatei selbst fehlerhaft ist
+    """
+    signature = _file_signature(path)
+    with open(path, 'rb') as f:
+        source = f.read()
+    tree = ast.parse(source, filename=path)
+    return TestFileEntry(
+        path=path,
+        digest=hashlib.sha256(source).hexdigest(),
+        code=compile(tree, path, 'exec'),
+        test_names=discover_test_names(tree),
+        required_names=discover_required_names(tree),
+        uses_files=uses_file_system(tree),
+        signature=signature,
+    )
+
+
+class TaskTestRegistry:
+    """
+    Registry der vorkompilierten Testdateien, zugeordnet nach Task-ID.
+
+    Beim Start werden alle Testdateien unterhalb von root_dir kompiliert. Ein
+    Hintergrund-Thread prüft regelmäßig die Änderungszeitpunkte und lädt geänderte
+    Dateien neu, sodass der Ausführungspfad selbst keine Dateisystemzugriffe macht.
+    """
+
+    def __init__(self, root_dir, refresh_interval=2.0):
+        """
+        Args:
+            root_dir (str): Verzeichnis mit den Testdateien (z.B. modules/task_tests)
+            refresh_interval (float): Prüfintervall in Sekunden für geänderte Dateien (None = kein Watcher)
+        """
+        self.root_dir = root_dir
+        self.refresh_interval = refresh_interval
+        self._files = {}  # Pfad -> TestFileEntry
+        self._tasks = {}  # Task-ID -> (relativer Pfad aus Task.test_file_path, absoluter Pfad)
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def preload(self):
+        """Kompiliert alle Testdateien unterhalb von root_dir."""
+        for directory, _, filenames in os.walk(self.root_dir):
+            for filename in filenames:
+                if filename.endswith('.py'):
+                    path = os.path.abspath(os.path.join(directory, filename))
+                    try:
+                        self._store(load_test_file(path))
+                    except (OSError, SyntaxError):
+                        continue
+
+    def add_change_listener(self, callback):
+        """Registriert callback(old_digest), das bei Änderung oder Entfernung einer Testdatei aufgerufen wird."""
+        self._listeners.append(callback)
+
+    def _store(self, entry):
+        with self._lock:
+            self._files[entry.path] = entry
+
+    def get_for_task(self, task_id, test_file_path, resolve_path):
+        """
+        Liefert den Eintrag zur Testdatei einer Aufgabe.
+
+        Args:
+            task_id (int): ID der Aufgabe
+            test_file_path (str): Aktueller Wert von Task.test_file_path
+            resolve_path (callable): Ermittelt den absoluten Pfad, falls die Aufgabe noch
+                nicht (oder mit anderem Pfad) registriert ist
+
+        Raises:
+            FileNotFoundError: Wenn die Testdatei nicht existiert
+        """
+        self.start_watcher()
+        with self._lock:
+            mapping = self._tasks.get(task_id)
+            if mapping and mapping[0] == test_file_path:
+                entry = self._files.get(mapping[1])
+                if entry is not None:
+                    return entry
+
+        # Erster Zugriff oder geänderter Pfad: einmalig auflösen und registrieren
+        path = resolve_path()
+        with self._lock:
+            entry = self._files.get(path)
+        if entry is None:
+            entry = load_test_file(path)
+            self._store(entry)
+        with self._lock:
+            self._tasks[task_id] = (test_file_path, path)
+        return entry
+
+    def refresh(self):
+        """Lädt geänderte Testdateien neu und entfernt gelöschte."""
+        with self._lock:
+            entries = list(self._files.values())
+        for entry in entries:
+            try:
+                signature = _file_signature(entry.path)
+            except OSError:
+                with self._lock:
+                    self._files.pop(entry.path, None)
+                self._notify(entry.digest)
+                continue
+            if signature == entry.signature:
+                continue
+            try:
+                new_entry = load_test_file(entry.path)
+            except (OSError, SyntaxError):
+                continue
+            self._store(new_entry)
+            if new_entry.digest != entry.digest:
+                self._notify(entry.digest)
+
+    def _notify(self, old_digest):
+        for callback in self._listeners:
+            callback(old_digest)
+
+    def start_watcher(self):
+        """Startet den Hintergrund-Thread, der auf geänderte Dateien prüft (idempotent)."""
+        if self._watcher is not None or not self.refresh_interval:
+            return
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._watcher = threading.Thread(target=self._watch, name='task-test-registry', daemon=True)
+            self._watcher.start()
+
+    def _watch(self):
+        stop = threading.Event()
+        while not stop.wait(self.refresh_interval):
+            self.refresh()
@@ -0,0 +1,148 @@
+import math
+import heapq
+import threading
+from collections import OrderedDict
+
+
+class TestDurationStats:
+    """
+    Gemessene Laufzeiten der einzelnen Tests pro Testdatei-Version (Digest), als gleitender
+    Mittelwert. Grundlage für die Aufteilung einer Testdatei auf mehrere Sandbox-Worker.
+    """
+
+    def __init__(self, alpha=0.3, max_files=512):
+        """
+        Args:
+            alpha (float): Gewicht einer neuen Messung im gleitenden Mittelwert
+            max_files (int): Maximale Anzahl Testdateien (LRU-Verdrängung)
+        """
+        self.alpha = alpha
+        self.max_files = max_files
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, test_digest, test_results):
+        """Übernimmt die Laufzeiten aus einer Testzusammenfassung (siehe run_test_code)."""
+        if not test_results or not test_results.get('tests'):
+            return
+        total = test_results['runs'] + test_results.get('not_run', 0)
+        with self._lock:
+            entry = self._files.get(test_digest)
+            if entry is None:
+                entry = self._files[test_digest] = {'total': total, 'durations': {}}
+                if len(self._files) > self.max_files:
+                    self._files.popitem(last=False)
+            else:
+                self._files.move_to_end(test_digest)
+            durations = entry['durations']
+            for test in test_results['tests']:
+                previous = durations.get(test['name'])
+                durations[test['name']] = test['duration'] if previous is None else (
+                    previous + self.alpha * (test['duration'] - previous)
+                )
+
+    def durations(self, test_digest):
+        """
+        Liefert die Laufzeiten aller Tests einer Testdatei in der Reihenfolge der Testdatei.
+
+        Returns:
+            dict: "Klasse.methode" -> Sekunden, oder None, solange nicht jeder Test der Datei
+                mindestens einmal gelaufen ist (z.B. nach einem failfast-Abbruch)
+        """
+        with self._lock:
+            entry = self._files.get(test_digest)
+            if entry is None or len(entry['durations']) < entry['total']:
+                return None
+            return dict(entry['durations'])
+
+
+def plan_shards(durations, max_shards, min_total_seconds=0.0):
+    """
+    Verteilt Tests nach der LPT-Regel (längste zuerst, jeweils auf den am wenigsten belasteten
+    Shard) auf bis zu max_shards Shards. Es werden nur so viele Shards gebildet, wie nötig sind,
+    damit die Laufzeit nahe an der des längsten Einzeltests liegt.
+
+    Args:
+        durations (dict): "Klasse.methode" -> erwartete Laufzeit in Sekunden
+        max_shards (int): Maximale Anzahl Shards (Sandbox-Worker)
+        min_total_seconds (float): Unterhalb dieser Gesamtlaufzeit lohnt sich keine Aufteilung
+
+    Returns:
+        list: Listen von Testnamen pro Shard, oder None, wenn nicht aufgeteilt werden soll
+    """
+    total = sum(durations.values())
+    if len(durations) < 2 or max_shards < 2 or total < min_total_seconds or total <= 0:
+        return None
+    longest = max(durations.values())
+    shard_count = min(max_shards, len(durations), math.ceil(total / longest))
+    if shard_count < 2:
+        return None
+
+    heap = [(0.0, index, []) for index in range(shard_count)]
+    for name, seconds in sorted(durations.items(), key=lambda item: (-item[1], item[0])):
+        load, index, names = heapq.heappop(heap)
+        names.append(name)
+        heapq.heappush(heap, (load + seconds, index, names))
+    return [names for _, _, names in sorted(heap, key=lambda shard: shard[1])]
+
+
+def _merge_usage(usages):
+    """Ressourcenverbrauch mehrerer Shards: CPU-Zeit und Ausgaben summiert, Speicher als Maximum."""
+    usages = [usage for usage in usages if usage]
+    if not usages:
+        return None
+    merged = dict(usages[0])
+    for key in ('cpu_time', 'stdout_bytes', 'stderr_bytes'):
+        values = [usage.get(key) for usage in usages if usage.get(key) is not None]
+        merged[key] = sum(values) if values else None
+    peaks = [usage['peak_memory_mb'] for usage in usages if usage.get('peak_memory_mb') is not None]
+    merged['peak_memory_mb'] = max(peaks) if peaks else None
+    for key in ('memory_exceeded', 'stdout_truncated', 'stderr_truncated'):
+        merged[key] = any(usage.get(key) for usage in usages)
+    return merged
+
+
+def merge_shard_results(results, test_order):
+    """
+    Führt die Ergebnisse der Shards (jeweils von SecurityExecutor.execute_secure) zusammen.
+
+    Ist ein Shard nicht erfolgreich (z.B. Zeitüberschreitung), wird dessen Ergebnis geliefert.
+    Die Ausgaben stammen aus dem ersten Shard: der Benutzercode läuft in jedem Shard und gibt
+    dort dasselbe aus.
+
+    Args:
+        results (list): Ergebnisse der Shards
+        test_order (list): Testnamen in der Reihenfolge der Testdatei
+
+    Returns:
+        dict: Ein Ergebnis wie von execute_secure, 'test_results' enthält zusätzlich 'shards'
+    """
+    for result in results:
+        if not result["success"] or not result.get("test_results"):
+            return result
+
+    summaries = [result["test_results"] for result in results]
+    position = {name: index for index, name in enumerate(test_order)}
+    tests = sorted(
+        (test for summary in summaries for test in summary["tests"]),
+        key=lambda test: position.get(test['name'], len(position)),
+    )
+    runs = sum(summary["runs"] for summary in summaries)
+    total = summaries[0]["runs"] + summaries[0].get("not_run", 0)
+    test_results = {
+        "runs": runs,
+        "success": all(summary["success"] for summary in summaries),
+        "errors": [error for summary in summaries for error in summary["errors"]],
+        "failures": [failure for summary in summaries for failure in summary["failures"]],
+        "tests": tests,
+        # Die Shards laufen gleichzeitig
+        "duration": max(summary["duration"] for summary in summaries),
+        "not_run": total - runs,
+        "partial": runs < total,
+        "shards": len(summaries),
+    }
+    return {
+        **results[0],
+        "test_results": test_results,
+        "usage": _merge_usage([result.get("usage") for result in results]),
+    }
@@ -0,0 +1,266 @@
+import io
+import types
+import errno
+import builtins
+import itertools
+import posixpath
+
+# Module, die Benutzercode im Dateisystem-Modus importieren darf (nur die aufgeführten Namen)
+SAFE_MODULE_EXPORTS = {
+    'json': ('load', 'loads', 'dump', 'dumps', 'JSONDecodeError'),
+    'csv': ('reader', 'writer', 'DictReader', 'DictWriter', 'Error',
+            'QUOTE_ALL', 'QUOTE_MINIMAL', 'QUOTE_NONE', 'QUOTE_NONNUMERIC'),
+}
+
+# Ausnahmen, die Dateiaufgaben abfangen oder erneut auslösen (z.B. except FileNotFoundError: raise)
+FILE_MODE_EXCEPTIONS = {
+    exception.__name__: exception for exception in (
+        Exception, OSError, FileNotFoundError, FileExistsError, IsADirectoryError, NotADirectoryError,
+        PermissionError, ValueError, TypeError, KeyError, IndexError, UnicodeDecodeError, UnicodeEncodeError,
+    )
+}
+FILE_MODE_EXCEPTIONS['IOError'] = OSError
+
+
+class _VirtualBuffer(io.BytesIO):
+    """Inhalt einer geöffneten Datei; wird beim flush()/close() ins VirtualFileSystem übernommen."""
+
+    def __init__(self, fs, path, content, writable):
+        super().__init__(content)
+        self.name = path
+        self._fs = fs
+        self._path = path
+        self._writable = writable
+
+    def flush(self):
+        super().flush()
+        if self._writable and not self.closed:
+            self._fs._commit(self._path, self.getvalue())
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+        super().close()
+
+
+class VirtualFileSystem:
+    """
+    Dateisystem im Speicher für eine einzelne Ausführung (Dateiaufgaben).
+
+    Benutzercode und Tests sehen statt der echten Dateien nur dieses Dateisystem: open(),
+    tempfile und os werden auf es umgelenkt (siehe builtins_for_tests). Es wird mit dem Job
+    verworfen - keine Festplattenzugriffe, kein Aufräumen temporärer Dateien und keine
+    Überschneidungen zwischen gleichzeitigen Einreichungen.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, cwd='/sandbox'):
+        """
+        Args:
+            max_bytes (int): Maximale Gesamtgröße aller Dateien in Bytes
+            cwd (str): Arbeitsverzeichnis für relative Pfade
+        """
+        self.max_bytes = max_bytes
+        self.cwd = cwd
+        self._files = {}
+        self._dirs = {'/', '/tmp', cwd}
+        self._size = 0
+        self._counter = itertools.count(1)
+
+    def _path(self, path):
+        if isinstance(path, bytes):
+            path = path.decode('utf-8')
+        if not isinstance(path, str):
+            raise TypeError(f"expected str or bytes path, not {type(path).__name__}")
+        return posixpath.normpath(posixpath.join(self.cwd, path))
+
+    def _commit(self, path, content):
+        new_size = self._size - len(self._files.get(path, b'')) + len(content)
+        if new_size > self.max_bytes:
+            raise OSError(errno.ENOSPC, "Speicherplatz des virtuellen Dateisystems erschöpft", path)
+        self._files[path] = content
+        self._size = new_size
+
+    def _require_parent(self, path):
+        if posixpath.dirname(path) not in self._dirs:
+            raise FileNotFoundError(errno.ENOENT, "No such file or directory", path)
+
+    def open(self, file, mode='r', buffering=-1, encoding=None, errors=None, newline=None, closefd=True, opener=None):
+        """Ersatz für open() mit derselben Signatur (Textmodus standardmäßig UTF-8)."""
+        path = self._path(file)
+        kind = set(mode)
+        if path in self._dirs:
+            raise IsADirectoryError(errno.EISDIR, "Is a directory", path)
+        if 'x' in kind and path in self._files:
+            raise FileExistsError(errno.EEXIST, "File exists", path)
+        if 'r' in kind and path not in self._files:
+            raise FileNotFoundError(errno.ENOENT, "No such file or directory", path)
+        if kind & {'w', 'x'} or ('a' in kind and path not in self._files):
+            self._require_parent(path)
+            self._commit(path, b'')
+
+        writable = bool(kind & {'w', 'a', 'x', '+'})
+        buffer = _VirtualBuffer(self, path, self._files[path], writable)
+        if 'a' in kind:
+            buffer.seek(0, io.SEEK_END)
+        if 'b' in kind:
+            return buffer
+        # write_through, damit Schreibzugriffe sofort im Puffer landen (flush ins Dateisystem beim Schließen)
+        text = io.TextIOWrapper(buffer, encoding=encoding or 'utf-8', errors=errors, newline=newline,
+                                write_through=True)
+        text.mode = mode
+        return text
+
+    def exists(self, path):
+        path = self._path(path)
+        return path in self._files or path in self._dirs
+
+    def isfile(self, path):
+        return self._path(path) in self._files
+
+    def isdir(self, path):
+        return self._path(path) in self._dirs
+
+    def getsize(self, path):
+        path = self._path(path)
+        if path not in self._files:
+            raise FileNotFoundError(errno.ENOENT, "No such file or directory", path)
+        return len(self._files[path])
+
+    def remove(self, path):
+        path = self._path(path)
+        if path not in self._files:
+            raise FileNotFoundError(errno.ENOENT, "No such file or directory", path)
+        self._size -= len(self._files.pop(path))
+
+    def mkdir(self, path, mode=0o777, exist_ok=False):
+        path = self._path(path)
+        if path in self._dirs or path in self._files:
+            if exist_ok and path in self._dirs:
+                return
+            raise FileExistsError(errno.EEXIST, "File exists", path)
+        self._require_parent(path)
+        self._dirs.add(path)
+
+    def makedirs(self, path, mode=0o777, exist_ok=False):
+        path = self._path(path)
+        parent = posixpath.dirname(path)
+        if parent not in self._dirs:
+            self.makedirs(parent, exist_ok=True)
+        self.mkdir(path, exist_ok=exist_ok)
+
+    def listdir(self, path='.'):
+        path = self._path(path)
+        if path not in self._dirs:
+            raise FileNotFoundError(errno.ENOENT, "No such file or directory", path)
+        return sorted(
+            posixpath.basename(entry) for entry in itertools.chain(self._files, self._dirs)
+            if entry != path and posixpath.dirname(entry) == path
+        )
+
+    def rmtree(self, path):
+        path = self._path(path)
+        prefix = path.rstrip('/') + '/'
+        for file_path in [p for p in self._files if p.startswith(prefix)]:
+            self.remove(file_path)
+        self._dirs = {d for d in self._dirs if d != path and not d.startswith(prefix)}
+
+    def temp_name(self, suffix='', prefix='tmp', dir=None):
+        directory = self._path(dir) if dir else '/tmp'
+        return posixpath.join(directory, f"{prefix or ''}{next(self._counter):08x}{suffix or ''}")
+
+    def os_module(self):
+        """Minimales os-Modul (Pfade, Dateien löschen, Verzeichnisse) auf diesem Dateisystem."""
+        path_module = types.ModuleType('os.path')
+        for name in ('join', 'basename', 'dirname', 'split', 'splitext', 'normpath', 'sep'):
+            setattr(path_module, name, getattr(posixpath, name))
+        path_module.abspath = self._path
+        path_module.exists = self.exists
+        path_module.isfile = self.isfile
+        path_module.isdir = self.isdir
+        path_module.getsize = self.getsize
+
+        os_module = types.ModuleType('os')
+        os_module.path = path_module
+        os_module.sep = '/'
+        os_module.linesep = '\n'
+        os_module.getcwd = lambda: self.cwd
+        os_module.remove = os_module.unlink = self.remove
+        os_module.mkdir = self.mkdir
+        os_module.makedirs = self.makedirs
+        os_module.listdir = self.listdir
+        return os_module
+
+    def tempfile_module(self):
+        """Minimales tempfile-Modul (NamedTemporaryFile, TemporaryDirectory, mkdtemp) auf diesem Dateisystem."""
+        fs = self
+
+        def NamedTemporaryFile(mode='w+b', buffering=-1, encoding=None, newline=None,
+                               suffix=None, prefix=None, dir=None, delete=True, **kwargs):
+            # delete wird ignoriert: das ganze Dateisystem wird nach der Ausführung verworfen
+            return fs.open(fs.temp_name(suffix, prefix or 'tmp', dir), mode.replace('w', 'x', 1) if 'w' in mode else mode,
+                           encoding=encoding, newline=newline)
+
+        def mkdtemp(suffix=None, prefix=None, dir=None):
+            path = fs.temp_name(suffix, prefix or 'tmp', dir)
+            fs.mkdir(path)
+            return path
+
+        class TemporaryDirectory:
+            def __init__(self, suffix=None, prefix=None, dir=None, **kwargs):
+                self.name = mkdtemp(suffix, prefix, dir)
+
+            def cleanup(self):
+                fs.rmtree(self.name)
+
+            def __enter__(self):
+                return self.name
+
+            def __exit__(self, *exc_info):
+                self.cleanup()
+
+        tempfile_module = types.ModuleType('tempfile')
+        tempfile_module.NamedTemporaryFile = NamedTemporaryFile
+        tempfile_module.TemporaryDirectory = TemporaryDirectory
+        tempfile_module.mkdtemp = mkdtemp
+        tempfile_module.gettempdir = lambda: '/tmp'
+        return tempfile_module
+
+    def builtins_for_user_code(self):
+        """
+        Zusätzliche Builtins für den Benutzercode: open auf dieses Dateisystem, Importe aus
+        SAFE_MODULE_EXPORTS und die Ausnahmen aus FILE_MODE_EXCEPTIONS.
+        """
+        return {**FILE_MODE_EXCEPTIONS, 'open': self.open, '__import__': safe_import}
+
+    def builtins_for_tests(self):
+        """
+        Builtins für das Testmodul: open sowie die Importe von os und tempfile werden auf
+        dieses Dateisystem umgelenkt, alles andere bleibt unverändert.
+        """
+        shims = {'os': self.os_module(), 'tempfile': self.tempfile_module()}
+        real_import = builtins.__import__
+
+        def import_with_shims(name, globals=None, locals=None, fromlist=(), level=0):
+            if level == 0 and name in shims:
+                return shims[name]
+            if level == 0 and name == 'os.path':
+                return shims['os'] if not fromlist else shims['os'].path
+            return real_import(name, globals, locals, fromlist, level)
+
+        return {**builtins.__dict__, 'open': self.open, '__import__': import_with_shims}
+
+
+def _safe_module(name):
+    """Modul-Stellvertreter, der nur die in SAFE_MODULE_EXPORTS erlaubten Namen enthält."""
+    module = __import__(name)
+    proxy = types.ModuleType(name)
+    for attribute in SAFE_MODULE_EXPORTS[name]:
+        setattr(proxy, attribute, getattr(module, attribute))
+    return proxy
+
+
+def safe_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """__import__ für Benutzercode im Dateisystem-Modus: nur die Module aus SAFE_MODULE_EXPORTS."""
+    if level != 0 or name not in SAFE_MODULE_EXPORTS:
+        raise ImportError(f"Import von '{name}' ist in der Sandbox nicht erlaubt")
+    return _safe_module(name)
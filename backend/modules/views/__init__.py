@@ -1,2 +1,3 @@
 from .module_views import *
-from .execute_python_code import *
\ No newline at end of file
+from .execute_python_code import *
+from .submission_views import *
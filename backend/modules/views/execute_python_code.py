@@ -1,219 +1,407 @@
 import json
-import sys
-import io
-import os
-import unittest
-import importlib.util
-from django.http import JsonResponse, HttpResponse
-from django.views import View
-from django.utils.decorators import method_decorator
-from django.views.decorators.csrf import csrf_exempt
-from django.conf import settings # Needed for BASE_DIR potentially, or relative path logic
-from django.utils import timezone # timezone importieren
-from ..models import Task, UserTaskProgress # UserTaskProgress importieren
-from rest_framework.permissions import IsAuthenticated # Importieren
+import queue
+import hashlib
+import threading
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated, BasePermission # Importieren
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
 from rest_framework.views import APIView # Verwende APIView für DRF-Features
-from ..util.security_exe import SecurityExecutor # Import der neuen Sicherheitsschicht
+from ..models import Task, ExecutionJob
+from ..serializers import ExecutionJobSerializer
+from ..execution import (
+    get_task_test_entry, execute_task_code, resolve_test_options, admission, execution_flights,
+    execute_session_cell, close_session, sessions, EXECUTION_SESSIONS, EXECUTION_JOBS,
+)
+from ..util.admission import AdmissionRejected
+from ..util.sandbox_sessions import SessionLimitReached
+from ..util.security_exe import SecurityExecutor
+from ..util.executor_metrics import metrics, PhaseTimings
+
+
+def _prepare_execution(request):
+    """
+    Validiert die Anfragedaten einer Code-Ausführung.
+
+    Returns:
+        tuple: (code, task, test_entry, error_response) - error_response ist None, wenn alles gültig ist
+    """
+    # Verwende request.data statt json.loads(request.body)
+    try:
+        data = request.data
+    except Exception as e:
+        # Sollte mit DRF eigentlich nicht mehr nötig sein, aber sicher ist sicher
+        return None, None, None, JsonResponse({'error': f'Could not parse request data: {e}'}, status=400)
+
+    code = data.get('code', '')
+    task_id = data.get('task_id')
+
+    if not code:
+        return None, None, None, JsonResponse({'error': 'No code provided.'}, status=400)
+    if task_id is None:
+        # For now, let's require task_id for testing
+        return None, None, None, JsonResponse({'error': 'No task_id provided.'}, status=400)
+
+    try:
+        task = Task.objects.get(pk=task_id)
+    except Task.DoesNotExist:
+        return None, None, None, JsonResponse({'error': f'Task with id {task_id} not found.'}, status=404)
+    except ValueError:
+        return None, None, None, JsonResponse({'error': f'Invalid task_id format: {task_id}.'}, status=400)
+
+    if not task.test_file_path:
+        return None, None, None, JsonResponse({'error': f'Task {task_id} has no associated test file.'}, status=400)
+
+    try:
+        test_entry = get_task_test_entry(task)
+    except FileNotFoundError as e:
+        return None, None, None, JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        # Catch other potential path or settings errors
+        return None, None, None, JsonResponse({'error': f"Error setting up test environment: {str(e)}"}, status=500)
+
+    return code, task, test_entry, None
+
+
+def _parse_test_options(request):
+    """
+    Liest die optionalen Testoptionen einer Anfrage: failfast (bool), tests (Liste von Testnamen,
+    "Klasse.methode" oder "methode"), failed_first (bool, zuletzt fehlgeschlagene Tests zuerst) und
+    profile (bool, Laufzeit und Speicher pro Test sowie die rechenintensivsten Funktionen).
+
+    Returns:
+        tuple: (options, error_response) - options passend zu resolve_test_options
+    """
+    tests = request.data.get('tests')
+    if tests is not None and (not isinstance(tests, list) or not all(isinstance(name, str) for name in tests)):
+        return None, JsonResponse({'error': 'tests must be a list of test names.'}, status=400)
+    options = {
+        'failfast': bool(request.data.get('failfast')),
+        'test_names': tests or None,
+        'failed_first': bool(request.data.get('failed_first')),
+        'profile': bool(request.data.get('profile')),
+    }
+    return options, None
+
+
+def _admission_rejected_response(rejection):
+    """503-Antwort, wenn keine Ausführung zugelassen wird (siehe AdmissionController)."""
+    metrics.increment('admission_rejections')
+    if rejection.reason == 'user_limit':
+        message = 'Es laufen bereits zu viele Ausführungen für deinen Account. Bitte warte, bis sie abgeschlossen sind.'
+    else:
+        message = 'Der Server ist gerade ausgelastet. Bitte versuche es in wenigen Sekunden erneut.'
+    response = JsonResponse({'error': message, 'reason': rejection.reason}, status=503)
+    response['Retry-After'] = str(rejection.retry_after)
+    return response
+
+
+class CheckPythonCodeView(APIView):
+    """
+    Prüft Code nur auf Syntax- und Sicherheitsfehler, ohne ihn auszuführen (kein Sandbox-Lauf,
+    keine Admission-Slots). Gedacht für Hinweise im Editor während der Eingabe.
+
+    Optional task_id: bei Dateiaufgaben wird wie bei der Ausführung im Dateisystem-Modus geprüft
+    (open, json, csv sind dann erlaubt).
+
+    Antwort: {"ok": bool, "diagnostics": [{"kind", "message", "line", "column", "end_line", "end_column"}]}
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        code = request.data.get('code', '')
+        if not isinstance(code, str):
+            return JsonResponse({'error': 'code must be a string.'}, status=400)
+
+        virtual_fs = False
+        task_id = request.data.get('task_id')
+        if task_id is not None:
+            try:
+                task = Task.objects.get(pk=task_id)
+            except Task.DoesNotExist:
+                return JsonResponse({'error': f'Task with id {task_id} not found.'}, status=404)
+            except (ValueError, TypeError):
+                return JsonResponse({'error': f'Invalid task_id format: {task_id}.'}, status=400)
+            if task.test_file_path:
+                try:
+                    virtual_fs = get_task_test_entry(task).uses_files
+                except FileNotFoundError:
+                    # Nur Hinweise im Editor - ohne Testdatei gelten die normalen Regeln
+                    pass
+
+        metrics.increment('checks')
+        with PhaseTimings().phase('check'):
+            diagnostics = SecurityExecutor(virtual_fs=virtual_fs).diagnose(code)
+        return JsonResponse({'ok': not diagnostics, 'diagnostics': diagnostics})
+
 
 # Ersetze Django View mit DRF APIView und füge permission_classes hinzu
-# @method_decorator(csrf_exempt, name='dispatch') # Nicht mehr nötig mit APIView und JWT Auth
 class ExecutePythonCodeView(APIView): # Ändere Vererbung zu APIView
+    """
+    Führt den Code gegen die Tests der Aufgabe aus. Optionale Felder: failfast (beim ersten
+    Fehlschlag abbrechen), tests (nur diese Tests), failed_first (zuletzt fehlgeschlagene
+    Tests zuerst) und profile (Profil der Ausführung in 'profile').
+    """
     permission_classes = [IsAuthenticated] # Füge Authentifizierung hinzu
 
     def post(self, request, *args, **kwargs):
-        # Verwende request.data statt json.loads(request.body)
+        timings = PhaseTimings()
+        with timings.phase('prepare'):
+            code, task, test_entry, error_response = _prepare_execution(request)
+            if error_response is None:
+                options, error_response = _parse_test_options(request)
+        if error_response is not None:
+            return error_response
+
+        def run():
+            timings.record('admission_wait', admission.acquire(request.user.pk))
+            try:
+                with timings.phase('total'):
+                    test_options = resolve_test_options(request.user, task, **options)
+                    return execute_task_code(
+                        request.user, task, code, test_entry, timings=timings, test_options=test_options
+                    )
+            finally:
+                admission.release(request.user.pk)
+
+        # Identische gleichzeitige Anfragen (gleicher Benutzer, gleiche Aufgabe, gleicher Code, gleiche
+        # Testoptionen) warten auf die bereits laufende Ausführung, statt eine weitere Sandbox zu belegen
+        flight_key = (request.user.pk, task.pk, test_entry.digest, hashlib.sha256(code.encode('utf-8')).hexdigest(),
+                      json.dumps(options, sort_keys=True))
         try:
-            data = request.data
-        except Exception as e:
-             # Sollte mit DRF eigentlich nicht mehr nötig sein, aber sicher ist sicher
-             return JsonResponse({'error': f'Could not parse request data: {e}'}, status=400)
+            with timings.phase('request'):
+                response_data, shared = execution_flights.do(flight_key, run)
+        except AdmissionRejected as rejection:
+            return _admission_rejected_response(rejection)
+        if shared:
+            metrics.increment('single_flight_shared')
+        response = JsonResponse(response_data)
+        # Phasen-Zeiten für die Browser-Devtools bzw. Auswertung im Frontend
+        response['Server-Timing'] = timings.server_timing()
+        return response
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse("Only POST requests are allowed.", status=405)
 
-        code = data.get('code', '')
-        task_id = data.get('task_id')
 
-        if not code:
-            return JsonResponse({'error': 'No code provided.'}, status=400)
-        if task_id is None:
-            # Fallback to simple execution if no task_id is provided (optional)
-            # For now, let's require task_id for testing
-            return JsonResponse({'error': 'No task_id provided.'}, status=400)
+class ExecutePythonSessionView(APIView):
+    """
+    Interaktiver Modus (REPL): POST führt nur die übergebene Zelle aus, im Zustand der vorherigen
+    Zellen derselben Sitzung (ein warmer Sandbox-Worker pro Benutzer und Aufgabe). Es laufen keine
+    Tests. DELETE (?task_id=) beendet die Sitzung und verwirft ihren Zustand.
+
+    Sitzungen enden nach EXECUTION_SESSIONS['idle_ttl'] Sekunden ohne Zelle, nach 'max_cells' Zellen,
+    bei zu hohem Speicherverbrauch oder Zeitüberschreitung; 'session.ended' nennt dann den Grund.
+
+    Die Sitzungen liegen im Speicher des jeweiligen Web-Prozesses (siehe execution.sessions). Bei
+    mehreren Prozessen (z.B. gunicorn --workers > 1) oder mehreren Servern müssen alle Anfragen
+    eines Benutzers beim selben Prozess landen (Sticky Routing); sonst sieht eine Zelle den Zustand
+    der vorherigen nicht, und die Limits max_sessions und per_user gelten je Prozess.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if not EXECUTION_SESSIONS['enabled']:
+            return JsonResponse({'error': 'Interactive sessions are disabled.'}, status=404)
+
+        timings = PhaseTimings()
+        with timings.phase('prepare'):
+            code, task, test_entry, error_response = _prepare_execution(request)
+        if error_response is not None:
+            return error_response
 
         try:
-            task = Task.objects.get(pk=task_id)
-        except Task.DoesNotExist:
-            return JsonResponse({'error': f'Task with id {task_id} not found.'}, status=404)
-        except ValueError:
-             return JsonResponse({'error': f'Invalid task_id format: {task_id}.'}, status=400)
-
-
-        if not task.test_file_path:
-            return JsonResponse({'error': f'Task {task_id} has no associated test file.'}, status=400)
-
-        # Construct the full path to the test file (relative to modules app)
-        # Assuming 'modules' app directory is settings.BASE_DIR / 'modules'
-        # Or better: Calculate relative to this file's location if settings are not available easily
-        # modules_app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # Path to modules app
-        # For simplicity, let's assume BASE_DIR exists and 'modules' is directly under it.
-        # A more robust solution might involve AppConfig.get_path('modules')
+            timings.record('admission_wait', admission.acquire(request.user.pk))
+        except AdmissionRejected as rejection:
+            return _admission_rejected_response(rejection)
         try:
-            # Simplified path construction - adjust if your structure differs
-            base_path = os.path.join(settings.BASE_DIR, 'modules')
-            test_file_full_path = os.path.abspath(os.path.join(base_path, task.test_file_path))
-
-            if not os.path.isfile(test_file_full_path):
-                 # Try relative to the models.py file's directory structure as fallback
-                 models_dir = os.path.dirname(Task._meta.app_config.path) # Get 'modules' app path
-                 test_file_full_path = os.path.abspath(os.path.join(models_dir, task.test_file_path))
-                 if not os.path.isfile(test_file_full_path):
-                      raise FileNotFoundError(f"Test file not found at derived paths for: {task.test_file_path}")
-
-            # Dynamically load the test module
-            spec = importlib.util.spec_from_file_location("task_test_module", test_file_full_path)
-            if spec is None or spec.loader is None:
-                 raise ImportError(f"Could not create module spec for {test_file_full_path}")
-            test_module = importlib.util.module_from_spec(spec)
-            # sys.modules["task_test_module"] = test_module # Register module? Maybe needed
-
-        except FileNotFoundError as e:
-             return JsonResponse({'error': str(e)}, status=400)
-        except ImportError as e:
-             return JsonResponse({'error': f"Error importing test module: {str(e)}"}, status=500)
-        except Exception as e:
-             # Catch other potential path or settings errors
-             return JsonResponse({'error': f"Error setting up test environment: {str(e)}"}, status=500)
-
-        # Sicherheits-Executor mit 10 Sekunden Timeout erstellen
-        security_executor = SecurityExecutor(timeout=10)
-
-        # Ersetzt die alte unsichere exec-Logik durch die sichere Ausführung
-        execution_error = None
-        test_results = None
-        test_results_obj = None
+            with timings.phase('total'):
+                response_data = execute_session_cell(request.user, task, code, test_entry, timings=timings)
+        except SessionLimitReached as limit:
+            metrics.increment('session_rejections')
+            if limit.reason == 'user_limit':
+                message = 'Du hast bereits eine interaktive Sitzung zu einer anderen Aufgabe. Beende sie zuerst.'
+            else:
+                message = 'Es sind gerade zu viele interaktive Sitzungen aktiv. Bitte versuche es später erneut.'
+            return JsonResponse({'error': message, 'reason': limit.reason}, status=429)
+        finally:
+            admission.release(request.user.pk)
+
+        response = JsonResponse(response_data)
+        response['Server-Timing'] = timings.server_timing()
+        return response
 
+    def delete(self, request, *args, **kwargs):
+        task_id = request.query_params.get('task_id') or request.data.get('task_id')
         try:
-            # 1. Führe den Code des Benutzers sicher aus
-            # Dies ersetzt: exec(code, exec_globals, exec_locals)
-            execution_result = security_executor.execute_secure(code)
-            
-            if not execution_result["success"]:
-                # Keine doppelte Fehlermeldung - error und stderr werden zusammengefasst
-                return JsonResponse({
-                    'error': execution_result["error"],
-                    'stdout': execution_result["stdout"],
-                    'stderr': execution_result["stderr"],
-                    'test_results': None,
-                    'execution_error': None  # Kein execution_error, um Duplikate zu vermeiden
-                })
-            
-            # Hole lokale Variablen aus der sicheren Ausführung
-            exec_locals = execution_result["locals"]
-            
-            # Stelle sicher, dass wir die Ausgabe haben
-            code_output = execution_result["stdout"]
-            
-            # 2. Prepare and run the unit tests
-            # --- Inject executed code's locals into the test module's scope ---
-            for key, value in exec_locals.items():
-                setattr(test_module, key, value)
-            # --- End injection ---
-
-            # Redirect for test execution
-            old_stdout = sys.stdout
-            old_stderr = sys.stderr
-            redirected_output = io.StringIO()
-            redirected_error = io.StringIO()
-            sys.stdout = redirected_output
-            sys.stderr = redirected_error
-            
+            task_id = int(task_id)
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'No valid task_id provided.'}, status=400)
+        return JsonResponse({'closed': close_session(request.user, task_id)})
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse("Only POST and DELETE requests are allowed.", status=405)
+
+
+class _StreamRenderer(BaseRenderer):
+    """Nur für die Content-Negotiation - der Inhalt wird von StreamingHttpResponse geliefert."""
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode(self.charset)
+
+
+class NDJSONRenderer(_StreamRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class EventStreamRenderer(_StreamRenderer):
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+
+class ExecutePythonCodeStreamView(APIView):
+    """
+    Wie ExecutePythonCodeView, liefert Ausgaben und Testergebnisse aber schrittweise,
+    sobald sie in der Sandbox entstehen.
+
+    Format: NDJSON (eine JSON-Zeile pro Ereignis) oder Server-Sent Events, wenn der
+    Client `Accept: text/event-stream` sendet. Ereignisse:
+    - {"type": "stdout", "data": "..."}
+    - {"type": "test", "name": "...", "status": "passed|failed|error|skipped", "duration": ...}
+    - {"type": "result", ...} - abschließend mit denselben Daten wie ExecutePythonCodeView
+
+    Anders als ExecutePythonCodeView ohne Single-Flight: jeder Stream braucht seine eigenen
+    Ereignisse aus der Sandbox.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [NDJSONRenderer, EventStreamRenderer, JSONRenderer]
+
+    def post(self, request, *args, **kwargs):
+        code, task, test_entry, error_response = _prepare_execution(request)
+        if error_response is None:
+            options, error_response = _parse_test_options(request)
+        if error_response is not None:
+            return error_response
+
+        user = request.user
+        try:
+            admission.acquire(user.pk)
+        except AdmissionRejected as rejection:
+            return _admission_rejected_response(rejection)
+
+        events = queue.Queue()
+
+        def run():
             try:
-                # Now execute the test module. Tests should be able to find the user's definitions.
-                spec.loader.exec_module(test_module)
-
-                suite = unittest.TestSuite()
-                loader = unittest.defaultTestLoader
-                # Load all tests from the dynamically loaded module
-                suite.addTest(loader.loadTestsFromModule(test_module))
-
-                # Run tests and capture results
-                # Use a buffer for TextTestRunner
-                runner_buffer = io.StringIO()
-                runner = unittest.TextTestRunner(stream=runner_buffer, verbosity=2) # Keep verbosity for detailed results object
-                test_results_obj = runner.run(suite)
-
-                # Format results (this still contains detailed error/failure info)
-                test_results = {
-                    "runs": test_results_obj.testsRun,
-                    "success": test_results_obj.wasSuccessful(),
-                    "errors": [(str(test), err) for test, err in test_results_obj.errors],
-                    "failures": [(str(test), fail) for test, fail in test_results_obj.failures],
-                }
-            except Exception as e:
-                # Test-Ausführungsfehler - wird in stderr angezeigt, keine doppelte Meldung
-                test_error = f"Fehler bei der Test-Ausführung: {e}"
-                redirected_error.write(test_error)
-                execution_error = None  # Kein execution_error, um Duplikate zu vermeiden
-            finally:
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
-
-            # === NEU: Task als erledigt markieren bei Erfolg ===
-            if test_results_obj and test_results_obj.wasSuccessful():
-                user = request.user # Den aktuellen Benutzer holen
-                progress, created = UserTaskProgress.objects.update_or_create(
-                    user=user,
-                    task=task,
-                    defaults={
-                        'completed': True,
-                        'completed_at': timezone.now()
-                    }
+                test_options = resolve_test_options(user, task, **options)
+                response_data = execute_task_code(
+                    user, task, code, test_entry, on_event=events.put, test_options=test_options
                 )
-                if created:
-                    print(f"[Progress Tracker] Marked Task {task.id} as completed for User {user.id}.")
-                else:
-                     print(f"[Progress Tracker] Updated Task {task.id} status to completed for User {user.id}.")
-            # ======================================================
-
-        except Exception as e:
-            # Allgemeiner Fehler - wird nur in stderr angezeigt, keine Duplizierung
-            stderr_message = f"Fehler bei der Code-Ausführung: {e}"
-            stderr = stderr_message if not 'stderr' in execution_result else execution_result['stderr'] + "\n" + stderr_message
-            execution_error = None  # Kein execution_error, um Duplikate zu vermeiden
-            return JsonResponse({
-                'stdout': execution_result.get('stdout', ''),
-                'stderr': stderr,
-                'execution_error': None,  # Kein execution_error, um Duplikate zu vermeiden
-                'test_results': None,
-            })
-            
-        # Sammle alle Ausgaben
-        test_output = redirected_output.getvalue()
-        all_output = code_output
-        if test_output and not test_output in all_output:
-            if all_output:
-                all_output += "\n" + test_output
-            else:
-                all_output = test_output
-                
-        stderr = execution_result["stderr"] + redirected_error.getvalue() if "stderr" in execution_result else redirected_error.getvalue()
-
-        # Zeige die Benutzerausgabe immer an, wenn vorhanden
-        if all_output.strip():
-            response_data = {
-                'stdout': all_output,
-                'stderr': stderr,  # Enthält alle Fehlermeldungen
-                'execution_error': None,  # Kein execution_error, um Duplikate zu vermeiden
-                'test_results': test_results,
-            }
-        else:
-            # Leere Ausgabe
-            response_data = {
-                'stdout': "",
-                'stderr': stderr,  # Enthält alle Fehlermeldungen
-                'execution_error': None,  # Kein execution_error, um Duplikate zu vermeiden
-                'test_results': test_results,
-            }
-
-        return JsonResponse(response_data)
-    
+                events.put({'type': 'result', **response_data})
+            finally:
+                admission.release(user.pk)
+                events.put(None)
+                # Der Thread hat eine eigene DB-Verbindung (Fortschritt speichern)
+                connection.close()
+
+        threading.Thread(target=run, daemon=True).start()
+
+        use_sse = 'text/event-stream' in request.META.get('HTTP_ACCEPT', '')
+
+        def stream():
+            while True:
+                event = events.get()
+                if event is None:
+                    break
+                payload = json.dumps(event)
+                yield f"data: {payload}\n\n" if use_sse else payload + "\n"
+
+        response = StreamingHttpResponse(
+            stream(), content_type='text/event-stream' if use_sse else 'application/x-ndjson'
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Proxy-Pufferung (nginx) deaktivieren, damit Ereignisse sofort ankommen
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
     def get(self, request, *args, **kwargs):
         return HttpResponse("Only POST requests are allowed.", status=405)
+
+
+class HasMetricsAccess(BasePermission):
+    """
+    Zugriff auf die Metriken für Staff-Benutzer oder Scraper mit dem Token aus
+    settings.EXECUTOR_METRICS_TOKEN (Header `X-Metrics-Token`).
+    """
+
+    def has_permission(self, request, view):
+        token = getattr(settings, 'EXECUTOR_METRICS_TOKEN', None)
+        if token and request.META.get('HTTP_X_METRICS_TOKEN') == token:
+            return True
+        return bool(request.user and request.user.is_staff)
+
+
+class ExecutorMetricsView(APIView):
+    """
+    Zähler (Timeouts, Sicherheitsablehnungen, Cache-Treffer, Wartezeiten auf Worker, ...) und
+    Phasen-Histogramme der Code-Ausführung im Prometheus-Textformat.
+    """
+    permission_classes = [HasMetricsAccess]
+
+    def get(self, request, *args, **kwargs):
+        admission_stats = admission.stats()
+        gauges = {
+            'admission_active': admission_stats['active'],
+            'admission_waiting': admission_stats['waiting'],
+            'admission_slots': admission_stats['slots'],
+            'sessions_active': sessions.stats()['sessions'],
+        }
+        return HttpResponse(
+            metrics.render_prometheus(gauges), content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+class ExecutionJobSubmitView(APIView):
+    """
+    Reiht eine Code-Ausführung asynchron ein und gibt sofort die Job-ID zurück.
+    Die Jobs werden von `manage.py run_executors` abgearbeitet. Hat der Benutzer bereits
+    EXECUTION_JOBS['per_user'] offene Jobs (eingereiht oder laufend), wird mit 429 abgelehnt.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        code, task, _, error_response = _prepare_execution(request)
+        if error_response is not None:
+            return error_response
+
+        open_jobs = ExecutionJob.objects.filter(
+            user=request.user, status__in=[ExecutionJob.Status.QUEUED, ExecutionJob.Status.RUNNING]
+        ).count()
+        if open_jobs >= EXECUTION_JOBS['per_user']:
+            metrics.increment('job_rejections')
+            response = JsonResponse({
+                'error': 'Du hast bereits zu viele offene Ausführungen. Bitte warte, bis sie abgeschlossen sind.',
+                'reason': 'user_limit',
+            }, status=429)
+            response['Retry-After'] = str(EXECUTION_JOBS['retry_after'])
+            return response
+
+        job = ExecutionJob.objects.create(user=request.user, task=task, code=code)
+        return Response(ExecutionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class ExecutionJobStatusView(generics.RetrieveAPIView):
+    """
+    Liefert Status und (sobald fertig) Ergebnis eines eigenen Ausführungs-Jobs.
+    """
+    serializer_class = ExecutionJobSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_field = 'pk'
+
+    def get_queryset(self):
+        return ExecutionJob.objects.filter(user=self.request.user)
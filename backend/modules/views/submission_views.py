@@ -0,0 +1,84 @@
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.shortcuts import get_object_or_404
+from ..models import Task, Submission
+from ..serializers import SubmissionSerializer
+
+# Seitengröße der Einreichungslisten (Standard und Obergrenze für ?limit=)
+SUBMISSION_PAGE_SIZE = 20
+SUBMISSION_MAX_PAGE_SIZE = 100
+
+
+def _parse_positive_int(value, default=None):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number > 0 else default
+
+
+def _keyset_page(request, queryset):
+    """
+    Liefert eine Seite von Einreichungen, neueste zuerst.
+
+    Statt OFFSET wird über die ID paginiert (?before=<id>): die Abfrage nutzt den Index
+    (user, -id) bzw. (task, -id) und bleibt auch bei langen Verläufen gleich schnell.
+
+    Returns:
+        Response: {'results': [...], 'next_before': ID für die nächste Seite oder None}
+    """
+    limit = min(
+        _parse_positive_int(request.query_params.get('limit'), SUBMISSION_PAGE_SIZE),
+        SUBMISSION_MAX_PAGE_SIZE,
+    )
+    before = _parse_positive_int(request.query_params.get('before'))
+    include_code = request.query_params.get('include_code') in ('1', 'true')
+
+    queryset = queryset.select_related('code').order_by('-id')
+    if not include_code:
+        # Der komprimierte Code wird für die Liste nicht gebraucht
+        queryset = queryset.defer('code__compressed_code')
+    if before:
+        queryset = queryset.filter(id__lt=before)
+
+    # Ein Eintrag mehr, um zu erkennen, ob es eine weitere Seite gibt
+    submissions = list(queryset[:limit + 1])
+    has_more = len(submissions) > limit
+    submissions = submissions[:limit]
+
+    serializer = SubmissionSerializer(submissions, many=True, context={'include_code': include_code})
+    return Response({
+        'results': serializer.data,
+        'next_before': submissions[-1].id if has_more else None,
+    })
+
+
+class SubmissionListView(APIView):
+    """
+    Eigene Einreichungen des Benutzers, optional gefiltert nach ?task_id=.
+    Paginierung über ?before=<id>&limit=<n>, Code nur mit ?include_code=1.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        queryset = Submission.objects.filter(user=request.user)
+        task_id = _parse_positive_int(request.query_params.get('task_id'))
+        if task_id:
+            queryset = queryset.filter(task_id=task_id)
+        return _keyset_page(request, queryset)
+
+
+class TaskSubmissionListView(APIView):
+    """
+    Einreichungen zu einer Aufgabe. Staff-Benutzer sehen alle Benutzer (z.B. für Auswertungen
+    oder Neubewertung), alle anderen nur ihre eigenen.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, task_id, *args, **kwargs):
+        task = get_object_or_404(Task, pk=task_id)
+        queryset = Submission.objects.filter(task=task)
+        if not request.user.is_staff:
+            queryset = queryset.filter(user=request.user)
+        return _keyset_page(request, queryset)